@@ -5,9 +5,11 @@ import subprocess
 import threading
 import time
 from datetime import datetime
+from typing import Dict, List, Optional
 import customtkinter as ctk
 from tkinter import messagebox
 import sys
+from SistemGuncelleyici.updater_core import BoundedOutputView, UIEventQueue, cli_tool_requested, parse_cli_args
 
 # ---------- Platform Tespiti ----------
 class PlatformDetector:
@@ -346,10 +348,51 @@ class AdvancedDetailsWindow(ctk.CTkToplevel):
         self.transient(parent)
         self.grab_set()
         
-        self.platform_info = PlatformDetector.get_platform_info()
-        self.package_manager = CrossPlatformPackageManager()
+        # Veriler worker'da toplanır, pencere hemen açılır
+        self.ui_queue = parent.ui_queue
+        self.cancelled = threading.Event()
         
         self.setup_ui()
+        threading.Thread(target=self._load_worker, daemon=True).start()
+    
+    def destroy(self):
+        # Pencere kapanırsa yükleme sonucu atılır
+        self.cancelled.set()
+        super().destroy()
+    
+    def _load_worker(self):
+        """Platform ve paket yöneticisi bilgilerini arka planda topla"""
+        platform_info = PlatformDetector.get_platform_info()
+        if self.cancelled.is_set():
+            return
+        
+        managers = CrossPlatformPackageManager().get_available_managers()
+        if self.cancelled.is_set():
+            return
+        
+        self.ui_queue.call(self._fill_tabs, platform_info, managers)
+    
+    def _fill_tabs(self, platform_info, managers):
+        """Toplanan bilgileri sekmelere yaz (ana döngüde)"""
+        if self.cancelled.is_set():
+            return
+        
+        self.platform_info = platform_info
+        self.fill_system_tab(platform_info)
+        self.fill_packages_tab(managers)
+        self.fill_status_tab(platform_info, managers)
+    
+    def _create_tab_text(self, tab_name):
+        """Yükleniyor iskeletiyle metin kutusu oluştur"""
+        text_widget = ctk.CTkTextbox(self.tabview.tab(tab_name))
+        text_widget.pack(fill="both", expand=True, padx=10, pady=10)
+        text_widget.insert("end", "⏳ Yükleniyor...\n")
+        text_widget.configure(state="disabled")
+        return text_widget
+    
+    def _begin_fill(self, text_widget):
+        text_widget.configure(state="normal")
+        text_widget.delete("1.0", "end")
     
     def setup_ui(self):
         # Sekmeler
@@ -369,20 +412,27 @@ class AdvancedDetailsWindow(ctk.CTkToplevel):
         self.setup_status_tab()
     
     def setup_system_tab(self):
-        text_widget = ctk.CTkTextbox(self.tabview.tab("🖥️ Sistem Bilgileri"))
-        text_widget.pack(fill="both", expand=True, padx=10, pady=10)
+        self.system_text = self._create_tab_text("🖥️ Sistem Bilgileri")
+    
+    def setup_packages_tab(self):
+        self.packages_text = self._create_tab_text("📦 Paket Yöneticileri")
+    
+    def setup_status_tab(self):
+        self.status_text = self._create_tab_text("📊 Güncelleme Durumu")
+    
+    def fill_system_tab(self, platform_info):
+        text_widget = self.system_text
+        self._begin_fill(text_widget)
         
         text_widget.insert("end", "🔧 DETAYLI SİSTEM BİLGİLERİ\n\n")
-        for key, value in self.platform_info.items():
+        for key, value in platform_info.items():
             text_widget.insert("end", f"• {key.replace('_', ' ').title()}: {value}\n")
         
         text_widget.configure(state="disabled")
     
-    def setup_packages_tab(self):
-        text_widget = ctk.CTkTextbox(self.tabview.tab("📦 Paket Yöneticileri"))
-        text_widget.pack(fill="both", expand=True, padx=10, pady=10)
-        
-        managers = self.package_manager.get_available_managers()
+    def fill_packages_tab(self, managers):
+        text_widget = self.packages_text
+        self._begin_fill(text_widget)
         
         text_widget.insert("end", "📦 TESPİT EDİLEN PAKET YÖNETİCİLERİ\n\n")
         
@@ -396,16 +446,15 @@ class AdvancedDetailsWindow(ctk.CTkToplevel):
         
         text_widget.configure(state="disabled")
     
-    def setup_status_tab(self):
-        text_widget = ctk.CTkTextbox(self.tabview.tab("📊 Güncelleme Durumu"))
-        text_widget.pack(fill="both", expand=True, padx=10, pady=10)
+    def fill_status_tab(self, platform_info, managers):
+        text_widget = self.status_text
+        self._begin_fill(text_widget)
         
         text_widget.insert("end", "🔄 GÜNCELLEME DURUMU\n\n")
-        text_widget.insert("end", f"• Platform: {self.platform_info['system'].title()}\n")
-        text_widget.insert("end", f"• Mimari: {self.platform_info['architecture']}\n")
-        text_widget.insert("end", f"• Python: {self.platform_info['python_version']}\n\n")
+        text_widget.insert("end", f"• Platform: {platform_info['system'].title()}\n")
+        text_widget.insert("end", f"• Mimari: {platform_info['architecture']}\n")
+        text_widget.insert("end", f"• Python: {platform_info['python_version']}\n\n")
         
-        managers = self.package_manager.get_available_managers()
         text_widget.insert("end", f"• Tespit Edilen Yöneticiler: {len(managers)}\n")
         
         text_widget.configure(state="disabled")
@@ -432,6 +481,11 @@ class UniversalUpdaterApp(ctk.CTk):
         self.update_manager = UniversalUpdateManager()
         
         self.setup_ui()
+        
+        # Worker thread olaylarını ana döngüde işle
+        self.ui_queue = UIEventQueue(self)
+        self.ui_queue.bind(self._apply_progress, self._append_output)
+        self.ui_queue.start()
     
     def setup_ui(self):
         # Platform bilgisi
@@ -477,10 +531,9 @@ class UniversalUpdaterApp(ctk.CTk):
         self.details_btn.pack(side="left", padx=10)
         
         # Detaylı çıktı alanı
-        self.output_text = ctk.CTkTextbox(self, width=460, height=150)
+        self.output_text = BoundedOutputView(self, width=460, height=150)
         self.output_text.pack(pady=10, fill="x", padx=20)
-        self.output_text.insert("1.0", "Güncelleme detayları burada görünecek...\n")
-        self.output_text.configure(state="disabled")
+        self.output_text.append("Güncelleme detayları burada görünecek...\n")
         
         # Çıkış butonu
         self.quit_btn = ctk.CTkButton(self, text="❌ Çıkış",
@@ -500,10 +553,8 @@ class UniversalUpdaterApp(ctk.CTk):
         self.update_btn.configure(state="disabled")
         
         # Çıktı alanını temizle
-        self.output_text.configure(state="normal")
-        self.output_text.delete("1.0", "end")
-        self.output_text.insert("end", "🔧 Güncelleme başlatıldı...\n")
-        self.output_text.configure(state="disabled")
+        self.output_text.clear()
+        self.output_text.append("🔧 Güncelleme başlatıldı...\n")
         
         # Thread'de çalıştır
         thread = threading.Thread(target=self.run_update_thread)
@@ -514,39 +565,44 @@ class UniversalUpdaterApp(ctk.CTk):
         self.update_manager.run_updates(self.update_progress, self.update_done)
     
     def update_progress(self, percent, detail):
-        """İlerlemeyi güncelle"""
+        """İlerlemeyi güncelle (worker thread'den güvenle çağrılabilir)"""
+        self.ui_queue.post_progress(percent)
+        self.ui_queue.post_text(f"⏳ {detail}\n")
+    
+    def _apply_progress(self, percent):
+        """Birleştirilmiş ilerlemeyi çiz"""
         self.progress.set(percent / 100)
         self.status_label.configure(text=f"Güncelleniyor... %{int(percent)}")
-        
-        self.output_text.configure(state="normal")
-        self.output_text.insert("end", f"⏳ {detail}\n")
-        self.output_text.see("end")
-        self.output_text.configure(state="disabled")
+    
+    def _append_output(self, text):
+        """Karede biriken çıktıyı tek seferde ekle"""
+        self.output_text.append(text)
     
     def update_done(self, message, details):
-        """Güncelleme tamamlandı"""
+        """Güncelleme tamamlandı (worker thread'den güvenle çağrılabilir)"""
+        self.ui_queue.call(self._finish_update, message, details)
+    
+    def _finish_update(self, message, details):
+        """Tamamlanma durumunu ana döngüde çiz"""
         self.progress.set(1.0)
         self.status_label.configure(text="Tamamlandı!")
         self.update_btn.configure(state="normal")
         
-        self.output_text.configure(state="normal")
-        self.output_text.insert("end", f"\n🎉 {message}\n")
-        for detail in details:
-            self.output_text.insert("end", f"• {detail}\n")
-        self.output_text.see("end")
-        self.output_text.configure(state="disabled")
+        self.output_text.append(f"\n🎉 {message}\n" + "".join(f"• {detail}\n" for detail in details))
         
         messagebox.showinfo("Güncelleme Tamamlandı", message)
 
 # ---------- Uygulamayı Başlat ----------
 if __name__ == "__main__":
-    # Çapraz platform uyumluluk
-    if platform.system().lower() not in ['windows', 'darwin', 'linux']:
-        print("⚠️ Desteklenmeyen işletim sistemi")
-        sys.exit(1)
-    
-    app = UniversalUpdaterApp()
-    app.mainloop()
+    cli_args = parse_cli_args()
+    if not cli_tool_requested(cli_args):
+        # Çapraz platform uyumluluk
+        if platform.system().lower() not in ['windows', 'darwin', 'linux']:
+            print("⚠️ Desteklenmeyen işletim sistemi")
+            sys.exit(1)
+        
+        app = UniversalUpdaterApp()
+        app.mainloop()
 
 
 
@@ -561,170 +617,11 @@ import customtkinter as ctk
 from tkinter import messagebox
 import sys
 import json
-import schedule
 from typing import Dict, List, Optional
-
-# ---------- Zamanlama Sistemi ----------
-class ScheduledUpdateManager:
-    def __init__(self, config_file="schedule_config.json"):
-        self.config_file = config_file
-        self.schedule_config = self.load_config()
-        self.scheduler_running = False
-        
-    def load_config(self) -> Dict:
-        """Zamanlama ayarlarını yükle"""
-        default_config = {
-            "enabled": False,
-            "schedule_type": "weekly",  # weekly, daily, monthly
-            "day_of_week": "monday",    # monday, tuesday, etc.
-            "time": "14:00",            # HH:MM format
-            "last_run": None,
-            "next_run": None
-        }
-        
-        try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-        except Exception as e:
-            print(f"Config yükleme hatası: {e}")
-            
-        return default_config
-    
-    def save_config(self):
-        """Zamanlama ayarlarını kaydet"""
-        try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.schedule_config, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"Config kaydetme hatası: {e}")
-    
-    def set_schedule(self, schedule_type: str, day_of_week: str, time_str: str):
-        """Yeni zamanlama ayarla"""
-        self.schedule_config.update({
-            "enabled": True,
-            "schedule_type": schedule_type.lower(),
-            "day_of_week": day_of_week.lower(),
-            "time": time_str,
-            "last_run": None,
-            "next_run": self.calculate_next_run(schedule_type, day_of_week, time_str)
-        })
-        self.save_config()
-        
-    def calculate_next_run(self, schedule_type: str, day_of_week: str, time_str: str) -> str:
-        """Bir sonraki çalışma zamanını hesapla"""
-        now = datetime.now()
-        target_time = datetime.strptime(time_str, "%H:%M").time()
-        
-        if schedule_type == "daily":
-            next_run = datetime.combine(now.date(), target_time)
-            if next_run <= now:
-                next_run += timedelta(days=1)
-                
-        elif schedule_type == "weekly":
-            days = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
-            target_day = days.index(day_of_week.lower())
-            current_day = now.weekday()
-            
-            days_ahead = target_day - current_day
-            if days_ahead <= 0:
-                days_ahead += 7
-                
-            next_run = datetime.combine(now.date() + timedelta(days=days_ahead), target_time)
-            
-        else:  # monthly
-            next_run = datetime.combine(now.date().replace(day=1), target_time)
-            if next_run <= now:
-                next_run = next_run.replace(month=next_run.month + 1)
-        
-        return next_run.isoformat()
-    
-    def get_next_run_info(self) -> str:
-        """Bir sonraki çalışma bilgisini formatla"""
-        if not self.schedule_config["enabled"]:
-            return "Zamanlama kapalı"
-            
-        next_run_str = self.schedule_config.get("next_run")
-        if not next_run_str:
-            return "Zamanlama ayarlanmamış"
-            
-        try:
-            next_run = datetime.fromisoformat(next_run_str)
-            now = datetime.now()
-            
-            if next_run <= now:
-                return "Şimdi çalışacak!"
-            else:
-                delta = next_run - now
-                days = delta.days
-                hours = delta.seconds // 3600
-                minutes = (delta.seconds % 3600) // 60
-                
-                if days > 0:
-                    return f"{days} gün {hours} saat sonra"
-                elif hours > 0:
-                    return f"{hours} saat {minutes} dakika sonra"
-                else:
-                    return f"{minutes} dakika sonra"
-                    
-        except Exception as e:
-            return f"Hesaplama hatası: {e}"
-    
-    def start_scheduler(self, update_callback):
-        """Zamanlayıcıyı başlat"""
-        if not self.schedule_config["enabled"]:
-            return
-            
-        self.scheduler_running = True
-        self.update_callback = update_callback
-        
-        # Schedule kütüphanesi ile zamanlama
-        schedule.clear()
-        
-        if self.schedule_config["schedule_type"] == "daily":
-            schedule.every().day.at(self.schedule_config["time"]).do(
-                self._run_scheduled_update
-            )
-        elif self.schedule_config["schedule_type"] == "weekly":
-            day_method = getattr(schedule.every(), self.schedule_config["day_of_week"])
-            day_method.at(self.schedule_config["time"]).do(
-                self._run_scheduled_update
-            )
-        
-        # Zamanlayıcı thread'ini başlat
-        self.scheduler_thread = threading.Thread(target=self._scheduler_loop, daemon=True)
-        self.scheduler_thread.start()
-        
-        print("⏰ Zamanlayıcı başlatıldı")
-    
-    def _scheduler_loop(self):
-        """Zamanlayıcı döngüsü"""
-        while self.scheduler_running:
-            schedule.run_pending()
-            time.sleep(60)  # Her dakika kontrol et
-    
-    def _run_scheduled_update(self):
-        """Zamanlanmış güncellemeyi çalıştır"""
-        print("🔄 Zamanlanmış güncelleme başlatılıyor...")
-        
-        # Son çalışma zamanını güncelle
-        self.schedule_config["last_run"] = datetime.now().isoformat()
-        self.schedule_config["next_run"] = self.calculate_next_run(
-            self.schedule_config["schedule_type"],
-            self.schedule_config["day_of_week"],
-            self.schedule_config["time"]
-        )
-        self.save_config()
-        
-        # Güncellemeyi başlat
-        if self.update_callback:
-            self.update_callback(scheduled=True)
-    
-    def stop_scheduler(self):
-        """Zamanlayıcıyı durdur"""
-        self.scheduler_running = False
-        schedule.clear()
-        print("⏹️ Zamanlayıcı durduruldu")
+from SistemGuncelleyici.cron_expression import CronExpression, benchmark_cron
+from SistemGuncelleyici.update_schedule import ScheduledUpdateManager, simulate_splay
+from SistemGuncelleyici.updater_core import (BoundedOutputView, TaskScheduler, UIEventQueue, cli_tool_requested,
+                                             parse_cli_args)
 
 # ---------- Platform Tespiti (Önceki koddan) ----------
 class PlatformDetector:
@@ -867,7 +764,7 @@ class ScheduleSettingsWindow(ctk.CTkToplevel):
         self.on_schedule_updated = on_schedule_updated
         
         self.title("⏰ Zamanlanmış Güncelleme Ayarları")
-        self.geometry("500x400")
+        self.geometry("500x450")
         self.transient(parent)
         self.grab_set()
         
@@ -897,7 +794,7 @@ class ScheduleSettingsWindow(ctk.CTkToplevel):
         
         ctk.CTkLabel(type_frame, text="Zamanlama Türü:").pack(side="left", padx=5)
         self.schedule_type = ctk.CTkOptionMenu(type_frame, 
-                                              values=["Günlük", "Haftalık", "Aylık"])
+                                              values=["Günlük", "Haftalık", "Aylık", "Cron"])
         self.schedule_type.pack(side="left", padx=5)
         self.schedule_type.set("Haftalık")
         
@@ -926,6 +823,15 @@ class ScheduleSettingsWindow(ctk.CTkToplevel):
         self.minute_entry = ctk.CTkEntry(time_frame, textvariable=self.minute_var, width=50)
         self.minute_entry.pack(side="left", padx=5)
         
+        # Cron ifadesi (Cron türü için; örn. her ayın ikinci Salısı 02:00 = "0 2 * * 2#2")
+        cron_frame = ctk.CTkFrame(main_frame)
+        cron_frame.pack(fill="x", padx=10, pady=5)
+        
+        ctk.CTkLabel(cron_frame, text="Cron:").pack(side="left", padx=5)
+        self.cron_var = ctk.StringVar(value="0 2 * * 2#2")
+        self.cron_entry = ctk.CTkEntry(cron_frame, textvariable=self.cron_var, width=200)
+        self.cron_entry.pack(side="left", padx=5)
+        
         # Durum bilgisi
         self.status_label = ctk.CTkLabel(main_frame, text="", 
                                         text_color="gray", font=("Arial", 10))
@@ -950,9 +856,14 @@ class ScheduleSettingsWindow(ctk.CTkToplevel):
             self.schedule_type.set("Günlük")
         elif config["schedule_type"] == "weekly":
             self.schedule_type.set("Haftalık")
+        elif config["schedule_type"] == "cron":
+            self.schedule_type.set("Cron")
         else:
             self.schedule_type.set("Aylık")
         
+        if config.get("cron"):
+            self.cron_var.set(config["cron"])
+        
         # Gün mapping
         day_map = {"monday": "Pazartesi", "tuesday": "Salı", "wednesday": "Çarşamba",
                   "thursday": "Perşembe", "friday": "Cuma", "saturday": "Cumartesi",
@@ -970,7 +881,8 @@ class ScheduleSettingsWindow(ctk.CTkToplevel):
     def toggle_settings(self):
         """Ayarları aktif/pasif yap"""
         enabled = self.enable_var.get()
-        widgets = [self.schedule_type, self.day_of_week, self.hour_entry, self.minute_entry]
+        widgets = [self.schedule_type, self.day_of_week, self.hour_entry, self.minute_entry,
+                   self.cron_entry]
         
         for widget in widgets:
             if enabled:
@@ -985,6 +897,10 @@ class ScheduleSettingsWindow(ctk.CTkToplevel):
         
         status_text = f"Sonraki çalışma: {next_run_info}\n"
         
+        offset = self.schedule_manager.start_offset()
+        if offset:
+            status_text += f"Bu host için gecikme: +{int(offset.total_seconds() // 60)} dk\n"
+        
         if config.get("last_run"):
             last_run = datetime.fromisoformat(config["last_run"])
             status_text += f"Son çalışma: {last_run.strftime('%d.%m.%Y %H:%M')}"
@@ -1003,9 +919,18 @@ class ScheduleSettingsWindow(ctk.CTkToplevel):
                 return
             
             # Zamanlama türü mapping
-            type_map = {"Günlük": "daily", "Haftalık": "weekly", "Aylık": "monthly"}
+            type_map = {"Günlük": "daily", "Haftalık": "weekly", "Aylık": "monthly", "Cron": "cron"}
             schedule_type = type_map[self.schedule_type.get()]
             
+            cron = None
+            if schedule_type == "cron":
+                cron = self.cron_var.get().strip()
+                try:
+                    CronExpression(cron)
+                except ValueError as e:
+                    messagebox.showerror("Hata", f"Geçersiz cron ifadesi: {e}")
+                    return
+            
             # Gün mapping
             day_map = {"Pazartesi": "monday", "Salı": "tuesday", "Çarşamba": "wednesday",
                       "Perşembe": "thursday", "Cuma": "friday", "Cumartesi": "saturday",
@@ -1023,7 +948,7 @@ class ScheduleSettingsWindow(ctk.CTkToplevel):
             time_str = f"{hour:02d}:{minute:02d}"
             
             # Ayarları kaydet
-            self.schedule_manager.set_schedule(schedule_type, day_of_week, time_str)
+            self.schedule_manager.set_schedule(schedule_type, day_of_week, time_str, cron)
             self.on_schedule_updated()
             
             messagebox.showinfo("Başarılı", "Zamanlama ayarları kaydedildi!")
@@ -1050,12 +975,20 @@ class UniversalUpdaterApp(ctk.CTk):
         self.title("🚀 Evrensel Sistem Güncelleyici")
         self.geometry("500x450")
         
+        # Worker thread olaylarını ana döngüde işle
+        self.ui_queue = UIEventQueue(self)
+        self.task_scheduler = TaskScheduler(self.ui_queue)
+        self.task_scheduler.start()
+        
         # Yöneticiler
         self.package_manager = CrossPlatformPackageManager()
-        self.schedule_manager = ScheduledUpdateManager()
+        self.schedule_manager = ScheduledUpdateManager(task_scheduler=self.task_scheduler)
         
         self.setup_ui()
         
+        self.ui_queue.bind(self._apply_progress, self._append_output)
+        self.ui_queue.start()
+        
         # Zamanlayıcıyı başlat
         self.schedule_manager.start_scheduler(self.start_scheduled_update)
     
@@ -1112,10 +1045,9 @@ class UniversalUpdaterApp(ctk.CTk):
         self.details_btn.pack(side="left", padx=5)
         
         # Çıktı alanı
-        self.output_text = ctk.CTkTextbox(self, width=460, height=150)
+        self.output_text = BoundedOutputView(self, width=460, height=150)
         self.output_text.pack(pady=10, fill="x", padx=20)
-        self.output_text.insert("1.0", "Güncelleme detayları burada görünecek...\n")
-        self.output_text.configure(state="disabled")
+        self.output_text.append("Güncelleme detayları burada görünecek...\n")
         
         # Çıkış butonu
         self.quit_btn = ctk.CTkButton(self, text="❌ Çıkış",
@@ -1141,7 +1073,7 @@ class UniversalUpdaterApp(ctk.CTk):
         self.update_schedule_status()
     
     def start_scheduled_update(self, scheduled=False):
-        """Zamanlanmış güncellemeyi başlat"""
+        """Zamanlanmış güncellemeyi başlat (zamanlayıcı thread'inden çağrılır)"""
         if scheduled:
             # Bildirim göster (basit versiyon)
             try:
@@ -1150,7 +1082,8 @@ class UniversalUpdaterApp(ctk.CTk):
             except:
                 pass
         
-        self.start_update()
+        # Widget'lara sadece ana döngüden dokunulur
+        self.ui_queue.call(self.start_update, scheduled)
     
     def start_update(self, scheduled=False):
         """Güncellemeyi başlat"""
@@ -1158,15 +1091,12 @@ class UniversalUpdaterApp(ctk.CTk):
         self.status_label.configure(text="Güncelleme başlatılıyor...")
         self.update_btn.configure(state="disabled")
         
-        self.output_text.configure(state="normal")
-        self.output_text.delete("1.0", "end")
+        self.output_text.clear()
         
         if scheduled:
-            self.output_text.insert("end", "⏰ ZAMANLANMIŞ GÜNCELLEME BAŞLATILDI\n")
+            self.output_text.append("⏰ ZAMANLANMIŞ GÜNCELLEME BAŞLATILDI\n")
         else:
-            self.output_text.insert("end", "🔧 Manuel güncelleme başlatıldı...\n")
-            
-        self.output_text.configure(state="disabled")
+            self.output_text.append("🔧 Manuel güncelleme başlatıldı...\n")
         
         thread = threading.Thread(target=self.run_update_thread)
         thread.daemon = True
@@ -1211,25 +1141,25 @@ class UniversalUpdaterApp(ctk.CTk):
         self.update_done(summary, details)
     
     def update_progress(self, percent, detail):
+        self.ui_queue.post_progress(percent)
+        self.ui_queue.post_text(f"⏳ {detail}\n")
+    
+    def _apply_progress(self, percent):
         self.progress.set(percent / 100)
         self.status_label.configure(text=f"Güncelleniyor... %{int(percent)}")
-        
-        self.output_text.configure(state="normal")
-        self.output_text.insert("end", f"⏳ {detail}\n")
-        self.output_text.see("end")
-        self.output_text.configure(state="disabled")
+    
+    def _append_output(self, text):
+        self.output_text.append(text)
     
     def update_done(self, message, details):
+        self.ui_queue.call(self._finish_update, message, details)
+    
+    def _finish_update(self, message, details):
         self.progress.set(1.0)
         self.status_label.configure(text="Tamamlandı!")
         self.update_btn.configure(state="normal")
         
-        self.output_text.configure(state="normal")
-        self.output_text.insert("end", f"\n🎉 {message}\n")
-        for detail in details:
-            self.output_text.insert("end", f"• {detail}\n")
-        self.output_text.see("end")
-        self.output_text.configure(state="disabled")
+        self.output_text.append(f"\n🎉 {message}\n" + "".join(f"• {detail}\n" for detail in details))
         
         # Zamanlama durumunu güncelle
         self.schedule_manager.schedule_config["last_run"] = datetime.now().isoformat()
@@ -1256,20 +1186,24 @@ class UniversalUpdaterApp(ctk.CTk):
     def cleanup_and_exit(self):
         """Temizlik yap ve çık"""
         self.schedule_manager.stop_scheduler()
+        self.task_scheduler.stop()
+        self.ui_queue.stop()
         self.destroy()
 
 # ---------- Uygulamayı Başlat ----------
 if __name__ == "__main__":
-    # Schedule kütüphanesi kontrolü
-    try:
-        import schedule
-    except ImportError:
-        print("❌ 'schedule' kütüphanesi gerekli. Yüklemek için:")
-        print("pip install schedule")
-        sys.exit(1)
-    
-    app = UniversalUpdaterApp()
-    app.mainloop()
+    cli_args = parse_cli_args()
+    if cli_args.benchmark_cron is not None:
+        print(json.dumps(benchmark_cron(cli_args.benchmark_cron, cli_args.seed), indent=2))
+    if cli_args.simulate_splay is not None:
+        print(json.dumps(simulate_splay(cli_args.simulate_splay, cli_args.splay_minutes, cli_args.cohorts),
+                         indent=2))
+    if not cli_tool_requested(cli_args):
+        app = UniversalUpdaterApp()
+        app.mainloop()
+    elif not cli_args.benchmark_dashboard:
+        # Dashboard ölçümü istenmediyse sonraki uygulamalar yüklenmez
+        sys.exit(0)
 
 
 #!/usr/bin/env python3
@@ -1289,7 +1223,6 @@ import customtkinter as ctk
 from tkinter import messagebox
 import sys
 import json
-import schedule
 import logging
 from logging.handlers import RotatingFileHandler
 import csv
@@ -1297,6 +1230,15 @@ import sqlite3
 from typing import Dict, List, Optional, Any
 import gzip
 import hashlib
+import signal
+from SistemGuncelleyici.sample_store import MonitorSampleStore
+from SistemGuncelleyici.updater_core import (BoundedOutputView, MetricsRegistry, PressureStallGate, UIEventQueue,
+                                             cli_tool_requested, parse_cli_args)
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
 
 # ---------- Gelişmiş Loglama Sistemi ----------
 class AdvancedLogger:
@@ -1382,10 +1324,45 @@ class AdvancedLogger:
 
 # ---------- Geçmiş Kaydı Sistemi ----------
 class UpdateHistoryManager:
-    def __init__(self, history_dir="history"):
+    # command_history tablosuna sonradan eklenen sütunlar (süreç ağacı kullanımı, baskı beklemesi)
+    ADDED_COMMAND_COLUMNS = [
+        ('peak_rss_bytes', 'INTEGER'),
+        ('cpu_seconds', 'REAL'),
+        ('read_bytes', 'INTEGER'),
+        ('write_bytes', 'INTEGER'),
+        ('ctx_switches', 'INTEGER'),
+        ('deferred_seconds', 'REAL'),
+        ('deferral_reason', 'TEXT')
+    ]
+    
+    # Yazma süresi histogram kovaları (saniye)
+    DB_WRITE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+    SESSION_BUCKETS = (10, 30, 60, 120, 300, 600, 1200, 1800, 3600)
+    
+    def __init__(self, history_dir="history", metrics: Optional[MetricsRegistry] = None):
         self.history_dir = history_dir
+        self.metrics = metrics
+        if metrics:
+            metrics.histogram('updater_history_db_write_seconds',
+                              'Geçmiş veritabanı yazma süresi', self.DB_WRITE_BUCKETS)
+            metrics.counter('updater_sessions_total', 'Tamamlanan güncelleme oturumları')
+            metrics.histogram('updater_session_duration_seconds',
+                              'Güncelleme oturumu süresi', self.SESSION_BUCKETS)
+        # Her yazımda artan sürüm; okuyucular (ör. dashboard önbelleği) veriyi sorgulamadan karşılaştırır
+        self.version = 0
+        self._version_lock = threading.Lock()
+        self._listeners = []
         self.setup_directories()
         self.setup_database()
+        self.samples = MonitorSampleStore(self.db_path)
+        
+    def add_listener(self, callback):
+        """Oturum tamamlandığında session_id ile çağrılacak fonksiyonu kaydet"""
+        self._listeners.append(callback)
+        
+    def _bump_version(self):
+        with self._version_lock:
+            self.version += 1
         
     def setup_directories(self):
         """Geçmiş dizinlerini oluştur"""
@@ -1442,11 +1419,25 @@ class UpdateHistoryManager:
             )
         ''')
         
+        # Eski veritabanlarına sonradan eklenen sütunları ekle
+        cursor.execute('PRAGMA table_info(command_history)')
+        existing_columns = {row[1] for row in cursor.fetchall()}
+        for column, column_type in self.ADDED_COMMAND_COLUMNS:
+            if column not in existing_columns:
+                cursor.execute(f'ALTER TABLE command_history ADD COLUMN {column} {column_type}')
+        
         conn.commit()
         conn.close()
         
+    def _observe_write(self, operation: str, started: float):
+        """Veritabanı yazma süresini metriklere işle"""
+        if self.metrics:
+            self.metrics.observe('updater_history_db_write_seconds',
+                                 time.perf_counter() - started, operation=operation)
+        
     def start_update_session(self, update_type="manual") -> int:
         """Yeni güncelleme oturumu başlat ve ID döndür"""
+        started = time.perf_counter()
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
@@ -1467,30 +1458,42 @@ class UpdateHistoryManager:
         session_id = cursor.lastrowid
         conn.commit()
         conn.close()
+        self._bump_version()
+        self._observe_write('start_session', started)
         
         return session_id
         
     def log_command_result(self, session_id: int, command_name: str, command_text: str, 
                           status: str, return_code: int, output: str, error: str, 
-                          duration: float):
-        """Komut sonucunu kaydet"""
+                          duration: float, usage: Optional[Dict] = None, deferral: Optional[Dict] = None):
+        """Komut sonucunu (ve varsa süreç ağacı kullanımını, baskı beklemesini) kaydet"""
+        started = time.perf_counter()
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
+        usage = usage or {}
+        deferred_seconds = deferral['deferred_seconds'] if deferral else 0.0
+        deferral_reason = ', '.join(deferral['reasons']) if deferred_seconds else None
         cursor.execute('''
             INSERT INTO command_history 
-            (session_id, command_name, command_text, status, return_code, output, error, duration_seconds, timestamp)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            (session_id, command_name, command_text, status, return_code, output, error, duration_seconds, timestamp,
+             peak_rss_bytes, cpu_seconds, read_bytes, write_bytes, ctx_switches, deferred_seconds, deferral_reason)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         ''', (session_id, command_name, command_text, status, return_code, 
               output[:1000] if output else '', error[:1000] if error else '', 
-              duration, datetime.now().isoformat()))
+              duration, datetime.now().isoformat(),
+              usage.get('peak_rss_bytes'), usage.get('cpu_seconds'), usage.get('read_bytes'),
+              usage.get('write_bytes'), usage.get('ctx_switches'), deferred_seconds, deferral_reason))
         
         conn.commit()
         conn.close()
+        self._bump_version()
+        self._observe_write('log_command', started)
         
     def complete_update_session(self, session_id: int, success_count: int, 
                                total_commands: int, duration: float, status: str = "completed"):
         """Güncelleme oturumunu tamamla"""
+        started = time.perf_counter()
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
@@ -1500,12 +1503,20 @@ class UpdateHistoryManager:
             WHERE id = ?
         ''', (success_count, total_commands, duration, status, session_id))
         
-        # İstatistikleri güncelle
-        self.update_statistics(success_count, total_commands, duration)
-        
         conn.commit()
         conn.close()
         
+        # İstatistikleri güncelle (ayrı bağlantı; oturum yazısı önce işlenmeli, yoksa veritabanı kilitli kalır)
+        self.update_statistics(success_count, total_commands, duration)
+        self._bump_version()
+        self._observe_write('complete_session', started)
+        
+        if self.metrics:
+            self.metrics.inc('updater_sessions_total', status=status)
+            self.metrics.observe('updater_session_duration_seconds', duration, status=status)
+        for listener in self._listeners:
+            listener(session_id)
+        
     def update_statistics(self, success_count: int, total_commands: int, duration: float):
         """Sistem istatistiklerini güncelle"""
         conn = sqlite3.connect(self.db_path)
@@ -1550,22 +1561,43 @@ class UpdateHistoryManager:
             LIMIT ?
         ''', (limit,))
         
-        sessions = []
-        for row in cursor.fetchall():
-            sessions.append({
-                'id': row[0],
-                'timestamp': row[1],
-                'update_type': row[2],
-                'success_count': row[3],
-                'total_commands': row[4],
-                'duration_seconds': row[5],
-                'system_info': json.loads(row[6]),
-                'status': row[7]
-            })
+        sessions = [self._session_from_row(row) for row in cursor.fetchall()]
         
         conn.close()
         return sessions
         
+    def get_sessions_page(self, before_id: Optional[int] = None, limit: int = 20) -> tuple:
+        """Oturumları ID'ye göre azalan sayfalar halinde getir, (oturumlar, sonraki imleç) döndür"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        # İmleç son görülen ID'dir; OFFSET'in aksine yeni oturumlar eklense de sayfalar kaymaz
+        cursor.execute('''
+            SELECT * FROM update_sessions
+            WHERE id < ?
+            ORDER BY id DESC
+            LIMIT ?
+        ''', (before_id if before_id is not None else sys.maxsize, limit + 1))
+        rows = cursor.fetchall()
+        conn.close()
+        
+        sessions = [self._session_from_row(row) for row in rows[:limit]]
+        next_cursor = sessions[-1]['id'] if len(rows) > limit else None
+        return sessions, next_cursor
+        
+    @staticmethod
+    def _session_from_row(row) -> Dict:
+        return {
+            'id': row[0],
+            'timestamp': row[1],
+            'update_type': row[2],
+            'success_count': row[3],
+            'total_commands': row[4],
+            'duration_seconds': row[5],
+            'system_info': json.loads(row[6]),
+            'status': row[7]
+        }
+        
     def get_session_details(self, session_id: int) -> Dict:
         """Oturum detaylarını getir"""
         conn = sqlite3.connect(self.db_path)
@@ -1607,13 +1639,35 @@ class UpdateHistoryManager:
                 'output': row[6],
                 'error': row[7],
                 'duration_seconds': row[8],
-                'timestamp': row[9]
+                'timestamp': row[9],
+                'usage': {
+                    'peak_rss_bytes': row[10],
+                    'cpu_seconds': row[11],
+                    'read_bytes': row[12],
+                    'write_bytes': row[13],
+                    'ctx_switches': row[14]
+                } if row[11] is not None else None,
+                'deferred_seconds': row[15] or 0.0,
+                'deferral_reason': row[16]
             })
         
         session_info['commands'] = commands
+        session_info['deferred_seconds'] = sum(cmd['deferred_seconds'] for cmd in commands)
         conn.close()
         return session_info
         
+    def get_transcript_path(self, session_id: int) -> str:
+        """Oturumun tam çıktı dökümünün yolu"""
+        return os.path.join(self.history_dir, 'transcripts', f'session_{session_id}.log')
+        
+    def append_transcript(self, session_id: int, lines: List[str]):
+        """Çıktı satırlarını oturum dökümüne ekle"""
+        transcript_path = self.get_transcript_path(session_id)
+        os.makedirs(os.path.dirname(transcript_path), exist_ok=True)
+        
+        with open(transcript_path, 'a', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        
     def get_statistics(self, days: int = 30) -> Dict:
         """İstatistikleri getir"""
         conn = sqlite3.connect(self.db_path)
@@ -1645,113 +1699,584 @@ class UpdateHistoryManager:
         }
         
         conn.close()
+        stats['command_costs'] = self.get_command_costs(days)
         return stats
-
-# ---------- Geçmiş Görüntüleme Penceresi ----------
-class HistoryViewerWindow(ctk.CTkToplevel):
-    def __init__(self, parent, history_manager: UpdateHistoryManager):
-        super().__init__(parent)
-        self.history_manager = history_manager
-        
-        self.title("📊 Güncelleme Geçmişi")
-        self.geometry("800x600")
-        self.transient(parent)
-        self.grab_set()
         
-        self.setup_ui()
-        self.load_history()
-        
-    def setup_ui(self):
-        # Sekmeler
-        self.tabview = ctk.CTkTabview(self)
-        self.tabview.pack(fill="both", expand=True, padx=20, pady=20)
-        
-        self.tabview.add("📋 Son Güncellemeler")
-        self.tabview.add("📈 İstatistikler")
-        self.tabview.add("🔍 Detaylı Görünüm")
+    def get_command_costs(self, days: int = 30, limit: int = 10) -> List[Dict]:
+        """Komut başına kaynak maliyeti (çalışma başına ortalama G/Ç'ye göre sıralı)"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
         
-        self.setup_recent_tab()
-        self.setup_stats_tab()
-        self.setup_details_tab()
+        start_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
         
-    def setup_recent_tab(self):
-        # Son güncellemeler listesi
-        frame = self.tabview.tab("📋 Son Güncellemeler")
+        cursor.execute('''
+            SELECT 
+                command_text,
+                COUNT(*) as runs,
+                AVG(duration_seconds) as avg_duration,
+                AVG(cpu_seconds) as avg_cpu_seconds,
+                MAX(peak_rss_bytes) as max_peak_rss,
+                AVG(read_bytes) as avg_read_bytes,
+                AVG(write_bytes) as avg_write_bytes,
+                AVG(ctx_switches) as avg_ctx_switches
+            FROM command_history 
+            WHERE timestamp >= ? AND cpu_seconds IS NOT NULL
+            GROUP BY command_text
+            ORDER BY AVG(read_bytes + write_bytes) DESC
+            LIMIT ?
+        ''', (start_date, limit))
         
-        # Başlık
-        title_label = ctk.CTkLabel(frame, text="Son 10 Güncelleme", 
-                                  font=("Arial", 16, "bold"))
-        title_label.pack(pady=10)
+        costs = []
+        for row in cursor.fetchall():
+            costs.append({
+                'command_text': row[0],
+                'runs': row[1],
+                'avg_duration': row[2] or 0,
+                'avg_cpu_seconds': row[3] or 0,
+                'max_peak_rss': row[4] or 0,
+                'avg_read_bytes': row[5] or 0,
+                'avg_write_bytes': row[6] or 0,
+                'avg_ctx_switches': row[7] or 0
+            })
         
-        # Liste kutusu
-        self.session_listbox = ctk.CTkTextbox(frame, width=700, height=400)
-        self.session_listbox.pack(pady=10, fill="both", expand=True)
-        self.session_listbox.configure(state="disabled")
+        conn.close()
+        return costs
         
-    def setup_stats_tab(self):
-        # İstatistikler
-        frame = self.tabview.tab("📈 İstatistikler")
+    def get_analytics(self, days: int = 30) -> Dict:
+        """Yönetici başına başarı/süre dağılımı ve günlük oturum sayıları"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
         
-        self.stats_text = ctk.CTkTextbox(frame, width=700, height=400)
-        self.stats_text.pack(pady=10, fill="both", expand=True)
-        self.stats_text.configure(state="disabled")
+        start_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
         
-    def setup_details_tab(self):
-        # Detaylı görünüm
-        frame = self.tabview.tab("🔍 Detaylı Görünüm")
+        cursor.execute('''
+            SELECT 
+                command_name,
+                COUNT(*) as runs,
+                SUM(status = 'success') as successes,
+                AVG(duration_seconds) as avg_duration,
+                MAX(duration_seconds) as max_duration,
+                SUM(deferred_seconds) as deferred_seconds
+            FROM command_history 
+            WHERE timestamp >= ?
+            GROUP BY command_name
+            ORDER BY runs DESC
+        ''', (start_date,))
         
-        # Seçim
-        selection_frame = ctk.CTkFrame(frame)
-        selection_frame.pack(fill="x", padx=10, pady=10)
+        managers = []
+        for row in cursor.fetchall():
+            managers.append({
+                'command_name': row[0],
+                'runs': row[1],
+                'successes': row[2] or 0,
+                'success_rate': (row[2] or 0) / row[1] * 100,
+                'avg_duration': row[3] or 0,
+                'max_duration': row[4] or 0,
+                'deferred_seconds': row[5] or 0
+            })
         
-        ctk.CTkLabel(selection_frame, text="Oturum ID:").pack(side="left", padx=5)
-        self.session_id_entry = ctk.CTkEntry(selection_frame, width=100)
-        self.session_id_entry.pack(side="left", padx=5)
+        cursor.execute('''
+            SELECT substr(timestamp, 1, 10) as day, COUNT(*), SUM(status = 'completed')
+            FROM update_sessions 
+            WHERE timestamp >= ?
+            GROUP BY day
+            ORDER BY day
+        ''', (start_date,))
+        daily = [{'date': row[0], 'sessions': row[1], 'completed': row[2] or 0}
+                 for row in cursor.fetchall()]
         
-        ctk.CTkButton(selection_frame, text="Yükle", 
-                     command=self.load_session_details).pack(side="left", padx=10)
+        conn.close()
+        return {'days': days, 'managers': managers, 'daily': daily}
+
+# ---------- Komut Kaynak Takibi ----------
+def format_bytes(size) -> str:
+    """Bayt değerini okunabilir birime çevir"""
+    size = float(size or 0)
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+def format_peak_rss(size) -> str:
+    """Tepe RSS; örnek alınamadıysa bilinmiyor"""
+    return "bilinmiyor" if size is None else format_bytes(size)
+
+class ProcessTreeTracker:
+    """Bir komutun tüm süreç ağacının kaynak kullanımını toplar"""
+    
+    def __init__(self, pid: int):
+        self.pid = pid
+        self.peak_rss = None          # hiç örnek alınamadıysa None kalır
+        self._seen = {}               # (pid, başlangıç zamanı) -> son okunan sayaçlar
+        
+    def sample(self):
+        """Ağaçtaki süreçlerin sayaçlarını oku (psutil yoksa atlanır)"""
+        if psutil is None:
+            return
+        try:
+            root = psutil.Process(self.pid)
+            processes = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return
         
-        # Detaylar
-        self.details_text = ctk.CTkTextbox(frame, width=700, height=350)
-        self.details_text.pack(pady=10, fill="both", expand=True)
-        self.details_text.configure(state="disabled")
+        total_rss = 0
+        for proc in processes:
+            try:
+                with proc.oneshot():
+                    key = (proc.pid, proc.create_time())
+                    counters = self._seen.setdefault(key, {
+                        'cpu_seconds': 0.0, 'read_bytes': 0, 'write_bytes': 0, 'ctx_switches': 0
+                    })
+                    cpu = proc.cpu_times()
+                    ctx = proc.num_ctx_switches()
+                    counters['cpu_seconds'] = cpu.user + cpu.system
+                    counters['ctx_switches'] = ctx.voluntary + ctx.involuntary
+                    total_rss += proc.memory_info().rss
+                    try:
+                        io = proc.io_counters()
+                        counters['read_bytes'] = io.read_bytes
+                        counters['write_bytes'] = io.write_bytes
+                    except (psutil.AccessDenied, AttributeError):
+                        # sudo altındaki süreçlerin G/Ç sayaçları okunamaz, macOS'ta hiç yok
+                        pass
+            except psutil.Error:
+                continue
+        
+        self.peak_rss = max(self.peak_rss or 0, total_rss)
+        
+    def children(self) -> List:
+        """Köke bağlı alt süreçler (sonlandırmak için)"""
+        if psutil is None:
+            return []
+        try:
+            return psutil.Process(self.pid).children(recursive=True)
+        except psutil.Error:
+            return []
         
-    def load_history(self):
-        """Geçmişi yükle"""
-        self.load_recent_sessions()
-        self.load_statistics()
+    def totals(self, rusage=None) -> Dict:
+        """Toplam kullanım; wait4 sonucu varsa örneklerin kaçırdıklarıyla birleştirilir"""
+        usage = {
+            'peak_rss_bytes': self.peak_rss,
+            'cpu_seconds': sum(c['cpu_seconds'] for c in self._seen.values()),
+            'read_bytes': sum(c['read_bytes'] for c in self._seen.values()),
+            'write_bytes': sum(c['write_bytes'] for c in self._seen.values()),
+            'ctx_switches': sum(c['ctx_switches'] for c in self._seen.values())
+        }
         
-    def load_recent_sessions(self):
-        """Son oturumları yükle"""
-        sessions = self.history_manager.get_recent_sessions(10)
+        if rusage is not None:
+            # Beklenmiş tüm alt süreçleri kapsar (örnekler arasında bitenler dahil)
+            # ru_maxrss tek sürecin tepesidir (çoğu zaman fork eden Python'unki), ağaç tepesi yerine kullanılmaz
+            usage['cpu_seconds'] = max(usage['cpu_seconds'], rusage.ru_utime + rusage.ru_stime)
+            usage['read_bytes'] = max(usage['read_bytes'], rusage.ru_inblock * 512)
+            usage['write_bytes'] = max(usage['write_bytes'], rusage.ru_oublock * 512)
+            usage['ctx_switches'] = max(usage['ctx_switches'], rusage.ru_nvcsw + rusage.ru_nivcsw)
         
-        self.session_listbox.configure(state="normal")
-        self.session_listbox.delete("1.0", "end")
+        return usage
+
+# ---------- Güncelleme Motoru ----------
+class UpdateEngine:
+    """Paket yöneticisi komutlarını çalıştırır, sonuçları ve kaynak kullanımını kaydeder"""
+    
+    COMMAND_BUCKETS = (1, 5, 10, 30, 60, 120, 300, 600, 1800)
+    DEFERRAL_BUCKETS = (1, 2, 5, 10, 30, 60, 120, 300, 600)
+    
+    def __init__(self, history_manager: UpdateHistoryManager, command_timeout: float = 300,
+                 sample_interval: float = 0.5, metrics: Optional[MetricsRegistry] = None,
+                 pressure_gate: Optional[PressureStallGate] = None, events=None):
+        self.history_manager = history_manager
+        self.events = events          # publish(tür, veri) sunan yayıncı (ör. SSE)
+        self.command_timeout = command_timeout
+        self.sample_interval = sample_interval
+        self.pressure_gate = pressure_gate or PressureStallGate()
+        self.metrics = metrics
+        if metrics:
+            metrics.counter('updater_pressure_deferrals_total', 'PSI kapısında bekletilen komutlar')
+            metrics.histogram('updater_pressure_deferral_seconds',
+                              'PSI kapısında bekleme süresi', self.DEFERRAL_BUCKETS)
+            metrics.histogram('updater_command_duration_seconds',
+                              'Yönetici başına komut süresi', self.COMMAND_BUCKETS)
+            metrics.counter('updater_commands_total', 'Çalıştırılan komutlar')
+            metrics.counter('updater_command_failures_total', 'Başarısız komutlar')
+            metrics.gauge('updater_commands_running', 'Şu an çalışan komut sayısı')
+            metrics.set('updater_commands_running', 0)
+        
+    def run_command(self, command: List[str], timeout: float = None, on_output=None) -> Dict:
+        """Komutu çalıştır; çıktı, dönüş kodu, süre ve süreç ağacı kullanımını döndür"""
+        timeout = self.command_timeout if timeout is None else timeout
+        start_time = time.time()
         
-        if not sessions:
-            self.session_listbox.insert("end", "Henüz güncelleme geçmişi yok.\n")
-        else:
-            for session in sessions:
-                timestamp = datetime.fromisoformat(session['timestamp'])
-                success_rate = (session['success_count'] / session['total_commands'] * 100) if session['total_commands'] > 0 else 0
-                
-                self.session_listbox.insert("end", 
-                    f"📅 {timestamp.strftime('%d.%m.%Y %H:%M')}\n")
-                self.session_listbox.insert("end",
-                    f"   Type: {session['update_type']} | "
-                    f"Success: {session['success_count']}/{session['total_commands']} "
-                    f"(%{success_rate:.1f}) | "
-                    f"Duration: {session['duration_seconds']:.1f}s\n")
-                self.session_listbox.insert("end", f"   Status: {session['status']}\n\n")
+        # POSIX'te ayrı süreç grubu: zaman aşımında tüm ağaç tek sinyalle sonlandırılır
+        proc = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                                start_new_session=(os.name == 'posix'))
+        tracker = ProcessTreeTracker(proc.pid)
+        
+        # Boru tamponları dolup komut kilitlenmesin diye çıktılar ayrı thread'lerde okunur
+        streams = {}
+        readers = [
+            threading.Thread(target=self._read_stream, args=(proc.stdout, streams, 'stdout', on_output),
+                             daemon=True),
+            threading.Thread(target=self._read_stream, args=(proc.stderr, streams, 'stderr', on_output),
+                             daemon=True)
+        ]
+        for reader in readers:
+            reader.start()
+        
+        rusage = None
+        timed_out = False
+        delay = 0.02
+        # Kısa komutlar ilk wait4'ten önce bitebilir; ağaç tepesi için en az bir örnek alınır
+        tracker.sample()
+        while True:
+            if hasattr(os, 'wait4'):
+                # Süreci kendimiz toplarız ki alt ağacın rusage değerleri yalnız bu komuta ait olsun
+                pid, status, child_usage = os.wait4(proc.pid, os.WNOHANG)
+                if pid:
+                    proc.returncode = self._exit_code(status)
+                    rusage = child_usage
+                    break
+            elif proc.poll() is not None:
+                break
+            
+            tracker.sample()
+            
+            if not timed_out and time.time() - start_time > timeout:
+                timed_out = True
+                self._kill_tree(proc, tracker)
+            
+            time.sleep(delay)
+            delay = min(delay * 2, self.sample_interval)
         
-        self.session_listbox.configure(state="disabled")
+        for reader in readers:
+            reader.join(timeout=5)
         
-    def load_statistics(self):
-        """İstatistikleri yükle"""
-        stats = self.history_manager.get_statistics(30)
+        return {
+            'returncode': proc.returncode,
+            'stdout': streams.get('stdout', ''),
+            'stderr': streams.get('stderr', ''),
+            'duration': time.time() - start_time,
+            'timed_out': timed_out,
+            'usage': tracker.totals(rusage)
+        }
         
-        self.stats_text.configure(state="normal")
-        self.stats_text.delete("1.0", "end")
+    @staticmethod
+    def _exit_code(status: int) -> int:
+        """wait4 durumunu Popen.returncode biçimine çevir (os.waitstatus_to_exitcode 3.9+ gerektirir)"""
+        if os.WIFSIGNALED(status):
+            return -os.WTERMSIG(status)
+        return os.WEXITSTATUS(status)
+        
+    @staticmethod
+    def _kill_tree(proc, tracker: ProcessTreeTracker):
+        """Komutu ve tüm alt süreçlerini sonlandır"""
+        for child in tracker.children():
+            try:
+                child.kill()
+            except psutil.Error:
+                pass
+        if os.name == 'posix':
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+                return
+            except PermissionError:
+                # sudo ile başlayan ağaç root'a ait; sinyal aynı yetki yolundan (parolasız sudo) gönderilir
+                if list(proc.args[:1]) == ['sudo']:
+                    try:
+                        result = subprocess.run(['sudo', '-n', 'kill', '-KILL', '--', f'-{proc.pid}'],
+                                                capture_output=True, timeout=10)
+                        if result.returncode == 0:
+                            return
+                    except (OSError, subprocess.SubprocessError):
+                        pass
+            except OSError:
+                pass
+        try:
+            proc.kill()
+        except OSError:
+            # Yetki yok: komut kendi bitene kadar beklenir, sonuç zaman aşımı olarak kaydedilir
+            pass
+        
+    @staticmethod
+    def _read_stream(stream, streams: Dict, name: str, on_output=None):
+        lines = []
+        try:
+            for line in stream:
+                lines.append(line)
+                if on_output:
+                    on_output(name, line.rstrip('\n'))
+        finally:
+            streams[name] = ''.join(lines)
+            stream.close()
+        
+    def run_session(self, managers: Dict, session_id: int, progress_callback, cancel=None) -> tuple:
+        """Tüm yöneticilerin komutlarını sırayla çalıştır, (başarılı, toplam, detaylar) döndür"""
+        total_commands = sum(len(mgr['commands']) for mgr in managers.values())
+        completed = 0
+        success_count = 0
+        details = []
+        
+        def report(percent, detail):
+            progress_callback(percent, detail)
+            self._publish('progress', session_id=session_id, percent=percent, detail=detail)
+        
+        self._publish('session', session_id=session_id, state='started', total=total_commands,
+                      managers={info['name']: len(info['commands']) for info in managers.values()})
+        
+        for manager_id, manager_info in managers.items():
+            manager_name = manager_info['name']
+            on_output = (lambda stream, line, name=manager_name: self._publish(
+                'output', manager=name, stream=stream, line=line)) if self.events else None
+            
+            for command in manager_info['commands']:
+                # İptal komutlar arasında uygulanır; yarıda kesilen paket yöneticisi kilit bırakabilir
+                if cancel is not None and cancel.is_set():
+                    break
+                completed += 1
+                progress = (completed / total_commands) * 100
+                command_text = ' '.join(command)
+                
+                report(progress, f"{manager_info['name']} - {command[0]}")
+                
+                # Sistem baskı altındaysa komut çekişme geçene kadar bekler
+                deferral = self.pressure_gate.wait(on_defer=lambda reasons: report(
+                    progress, f"⏸️ Sistem baskı altında, bekleniyor: {', '.join(reasons)}"))
+                self._record_deferral_metrics(deferral)
+                
+                if not deferral['proceed']:
+                    error_msg = (f"Baskı {deferral['deferred_seconds']:.0f}s sonra da sürüyor: "
+                                 f"{', '.join(deferral['reasons'])}")
+                    details.append(f"⏸️ {manager_info['name']} - İptal: {error_msg}")
+                    self.history_manager.log_command_result(
+                        session_id, manager_info['name'], ' '.join(command),
+                        "deferred", -1, "", error_msg, 0.0, deferral=deferral
+                    )
+                    self._record_command_metrics(manager_info['name'], "deferred", 0.0)
+                    self._publish('command', session_id=session_id, manager=manager_name,
+                                  command=command_text, state="deferred", duration=0.0)
+                    # Yöneticinin kalan komutları bu komuta bağlı
+                    break
+                
+                command_start_time = time.time()
+                status = "error"
+                # Bu komut sürerken alınan izleme örnekleri komutla etiketlenir
+                self.history_manager.samples.set_context(session_id, command_text)
+                self._publish('command', session_id=session_id, manager=manager_name,
+                              command=command_text, state="running")
+                
+                try:
+                    if self.metrics:
+                        self.metrics.inc('updater_commands_running')
+                    try:
+                        result = self.run_command(command, on_output=on_output)
+                    finally:
+                        if self.metrics:
+                            self.metrics.inc('updater_commands_running', -1)
+                    
+                    if result['timed_out']:
+                        status = "error"
+                        error_msg = f"Zaman aşımı ({self.command_timeout}s)"
+                        details.append(f"⚠️ {manager_info['name']} - Hata: {error_msg}")
+                    elif result['returncode'] == 0:
+                        success_count += 1
+                        status = "success"
+                        details.append(f"✅ {manager_info['name']} - Başarılı")
+                    else:
+                        status = "failed"
+                        error_msg = result['stderr'][:100] if result['stderr'] else "Bilinmeyen hata"
+                        details.append(f"❌ {manager_info['name']} - Hata: {error_msg}")
+                    
+                    # Komut sonucunu ve kaynak kullanımını geçmişe kaydet
+                    self.history_manager.log_command_result(
+                        session_id, manager_info['name'], ' '.join(command),
+                        status, result['returncode'], result['stdout'], result['stderr'],
+                        result['duration'], result['usage'], deferral
+                    )
+                    self._record_command_metrics(manager_info['name'], status, result['duration'])
+                        
+                except Exception as e:
+                    command_duration = time.time() - command_start_time
+                    error_msg = str(e)
+                    details.append(f"⚠️ {manager_info['name']} - Hata: {error_msg}")
+                    
+                    self.history_manager.log_command_result(
+                        session_id, manager_info['name'], ' '.join(command),
+                        "error", -1, "", error_msg, command_duration, deferral=deferral
+                    )
+                    self._record_command_metrics(manager_info['name'], "error", command_duration)
+                finally:
+                    self.history_manager.samples.set_context(session_id)
+                    self._publish('command', session_id=session_id, manager=manager_name,
+                                  command=command_text, state=status,
+                                  duration=time.time() - command_start_time)
+            
+            if cancel is not None and cancel.is_set():
+                details.append("⏹️ Güncelleme iptal edildi")
+                break
+        
+        self.history_manager.samples.set_context()
+        self._publish('session', session_id=session_id, state='finished',
+                      success=success_count, total=total_commands)
+        return success_count, total_commands, details
+        
+    def _publish(self, kind: str, **data):
+        if self.events:
+            self.events.publish(kind, data)
+        
+    def _record_deferral_metrics(self, deferral: Dict):
+        if not self.metrics or not deferral['reasons']:
+            return
+        if not deferral['timed_out']:
+            outcome = "cleared"
+        else:
+            outcome = "proceeded" if deferral['proceed'] else "aborted"
+        self.metrics.inc('updater_pressure_deferrals_total', outcome=outcome)
+        self.metrics.observe('updater_pressure_deferral_seconds', deferral['deferred_seconds'])
+        
+    def _record_command_metrics(self, manager: str, status: str, duration: float):
+        if not self.metrics:
+            return
+        self.metrics.observe('updater_command_duration_seconds', duration, manager=manager)
+        self.metrics.inc('updater_commands_total', manager=manager, status=status)
+        if status != "success":
+            self.metrics.inc('updater_command_failures_total', manager=manager, status=status)
+
+# ---------- Geçmiş Görüntüleme Penceresi ----------
+class HistoryViewerWindow(ctk.CTkToplevel):
+    TIMELINE_HEIGHT = 160
+    
+    def __init__(self, parent, history_manager: UpdateHistoryManager):
+        super().__init__(parent)
+        self.history_manager = history_manager
+        
+        self.title("📊 Güncelleme Geçmişi")
+        self.geometry("800x600")
+        self.transient(parent)
+        self.grab_set()
+        
+        # SQLite sorguları worker'da, sonuçlar ana döngü kuyruğuyla gelir
+        self.ui_queue = parent.ui_queue
+        self.cancelled = threading.Event()
+        
+        self.setup_ui()
+        self.load_history()
+        
+    def destroy(self):
+        # Pencere kapanırsa bekleyen yüklemelerin sonucu atılır
+        self.cancelled.set()
+        super().destroy()
+        
+    def _run_in_background(self, loader, on_loaded, *args):
+        """loader'ı worker'da çalıştır, sonucu ana döngüde on_loaded'a ver"""
+        def worker():
+            try:
+                result = loader(*args)
+            except Exception as e:
+                if not self.cancelled.is_set():
+                    self.ui_queue.call(messagebox.showerror, "Hata", f"Geçmiş yüklenemedi: {e}")
+                return
+            if not self.cancelled.is_set():
+                self.ui_queue.call(self._deliver, on_loaded, result)
+        
+        threading.Thread(target=worker, daemon=True).start()
+        
+    def _deliver(self, on_loaded, result):
+        if not self.cancelled.is_set():
+            on_loaded(result)
+        
+    def setup_ui(self):
+        # Sekmeler
+        self.tabview = ctk.CTkTabview(self)
+        self.tabview.pack(fill="both", expand=True, padx=20, pady=20)
+        
+        self.tabview.add("📋 Son Güncellemeler")
+        self.tabview.add("📈 İstatistikler")
+        self.tabview.add("🔍 Detaylı Görünüm")
+        
+        self.setup_recent_tab()
+        self.setup_stats_tab()
+        self.setup_details_tab()
+        
+    def setup_recent_tab(self):
+        # Son güncellemeler listesi
+        frame = self.tabview.tab("📋 Son Güncellemeler")
+        
+        # Başlık
+        title_label = ctk.CTkLabel(frame, text="Son 10 Güncelleme", 
+                                  font=("Arial", 16, "bold"))
+        title_label.pack(pady=10)
+        
+        # Liste kutusu
+        self.session_listbox = ctk.CTkTextbox(frame, width=700, height=400)
+        self.session_listbox.pack(pady=10, fill="both", expand=True)
+        self.session_listbox.insert("end", "⏳ Yükleniyor...\n")
+        self.session_listbox.configure(state="disabled")
+        
+    def setup_stats_tab(self):
+        # İstatistikler
+        frame = self.tabview.tab("📈 İstatistikler")
+        
+        self.stats_text = ctk.CTkTextbox(frame, width=700, height=400)
+        self.stats_text.pack(pady=10, fill="both", expand=True)
+        self.stats_text.insert("end", "⏳ Yükleniyor...\n")
+        self.stats_text.configure(state="disabled")
+        
+    def setup_details_tab(self):
+        # Detaylı görünüm
+        frame = self.tabview.tab("🔍 Detaylı Görünüm")
+        
+        # Seçim
+        selection_frame = ctk.CTkFrame(frame)
+        selection_frame.pack(fill="x", padx=10, pady=10)
+        
+        ctk.CTkLabel(selection_frame, text="Oturum ID:").pack(side="left", padx=5)
+        self.session_id_entry = ctk.CTkEntry(selection_frame, width=100)
+        self.session_id_entry.pack(side="left", padx=5)
+        
+        ctk.CTkButton(selection_frame, text="Yükle", 
+                     command=self.load_session_details).pack(side="left", padx=10)
+        
+        # Kaynak eğrisi ve komut zaman çizelgesi
+        self.timeline_canvas = ctk.CTkCanvas(frame, height=self.TIMELINE_HEIGHT,
+                                             bg="#1f1f1f", highlightthickness=0)
+        self.timeline_canvas.pack(padx=10, fill="x")
+        
+        # Detaylar
+        self.details_text = ctk.CTkTextbox(frame, width=700, height=350)
+        self.details_text.pack(pady=10, fill="both", expand=True)
+        self.details_text.configure(state="disabled")
+        
+    def load_history(self):
+        """Geçmişi arka planda yükle"""
+        self._run_in_background(self.history_manager.get_recent_sessions, self.load_recent_sessions, 10)
+        self._run_in_background(self.history_manager.get_statistics, self.load_statistics, 30)
+        
+    def load_recent_sessions(self, sessions):
+        """Son oturumları göster"""
+        self.session_listbox.configure(state="normal")
+        self.session_listbox.delete("1.0", "end")
+        
+        if not sessions:
+            self.session_listbox.insert("end", "Henüz güncelleme geçmişi yok.\n")
+        else:
+            for session in sessions:
+                timestamp = datetime.fromisoformat(session['timestamp'])
+                success_rate = (session['success_count'] / session['total_commands'] * 100) if session['total_commands'] > 0 else 0
+                
+                self.session_listbox.insert("end", 
+                    f"📅 {timestamp.strftime('%d.%m.%Y %H:%M')}\n")
+                self.session_listbox.insert("end",
+                    f"   Type: {session['update_type']} | "
+                    f"Success: {session['success_count']}/{session['total_commands']} "
+                    f"(%{success_rate:.1f}) | "
+                    f"Duration: {session['duration_seconds']:.1f}s\n")
+                self.session_listbox.insert("end", f"   Status: {session['status']}\n\n")
+        
+        self.session_listbox.configure(state="disabled")
+        
+    def load_statistics(self, stats):
+        """İstatistikleri göster"""
+        self.stats_text.configure(state="normal")
+        self.stats_text.delete("1.0", "end")
         
         self.stats_text.insert("end", "📊 SON 30 GÜN İSTATİSTİKLERİ\n\n")
         self.stats_text.insert("end", f"• Toplam Güncelleme: {stats['total_updates']}\n")
@@ -1765,18 +2290,48 @@ class HistoryViewerWindow(ctk.CTkToplevel):
         total_hours = stats['total_duration'] / 3600
         self.stats_text.insert("end", f"• Toplam Süre: {total_hours:.2f} saat\n")
         
+        if stats['command_costs']:
+            self.stats_text.insert("end", "\n🔥 EN ÇOK KAYNAK TÜKETEN KOMUTLAR (çalışma başına)\n\n")
+            for cost in stats['command_costs']:
+                self.stats_text.insert("end", f"• {cost['command_text']} ({cost['runs']} kez)\n")
+                self.stats_text.insert("end",
+                    f"   G/Ç: {format_bytes(cost['avg_read_bytes'])} okuma / "
+                    f"{format_bytes(cost['avg_write_bytes'])} yazma | "
+                    f"Tepe RSS: {format_bytes(cost['max_peak_rss'])} | "
+                    f"CPU: {cost['avg_cpu_seconds']:.1f}s | "
+                    f"Süre: {cost['avg_duration']:.1f}s\n")
+        
         self.stats_text.configure(state="disabled")
         
     def load_session_details(self):
-        """Oturum detaylarını yükle"""
+        """Oturum detaylarını arka planda yükle"""
         try:
             session_id = int(self.session_id_entry.get())
-            session_details = self.history_manager.get_session_details(session_id)
-            
+        except ValueError:
+            messagebox.showerror("Hata", "Geçerli bir oturum ID'si girin!")
+            return
+        
+        self.details_text.configure(state="normal")
+        self.details_text.delete("1.0", "end")
+        self.details_text.insert("end", "⏳ Yükleniyor...\n")
+        self.details_text.configure(state="disabled")
+        
+        self._run_in_background(self._fetch_session,
+                                lambda result: self.show_session_details(session_id, *result),
+                                session_id)
+        
+    def _fetch_session(self, session_id):
+        return (self.history_manager.get_session_details(session_id),
+                self.history_manager.samples.get_session_samples(session_id))
+        
+    def show_session_details(self, session_id, session_details, samples=None):
+        """Oturum detaylarını göster"""
+        try:
             if not session_details:
                 messagebox.showerror("Hata", "Oturum bulunamadı!")
                 return
                 
+            self.draw_session_timeline(session_details, samples)
             self.details_text.configure(state="normal")
             self.details_text.delete("1.0", "end")
             
@@ -1784,23 +2339,98 @@ class HistoryViewerWindow(ctk.CTkToplevel):
             self.details_text.insert("end", f"📋 OTOURUM DETAYLARI - ID: {session_id}\n\n")
             self.details_text.insert("end", f"Zaman: {timestamp.strftime('%d.%m.%Y %H:%M:%S')}\n")
             self.details_text.insert("end", f"Tip: {session_details['update_type']}\n")
-            self.details_text.insert("end", f"Durum: {session_details['status']}\n\n")
+            self.details_text.insert("end", f"Durum: {session_details['status']}\n")
+            
+            if session_details['deferred_seconds']:
+                self.details_text.insert("end",
+                    f"Baskı nedeniyle bekleme: {session_details['deferred_seconds']:.1f}s\n")
+            
+            transcript_path = self.history_manager.get_transcript_path(session_id)
+            if os.path.exists(transcript_path):
+                self.details_text.insert("end", f"Eski çıktı dökümü: {transcript_path}\n")
+            self.details_text.insert("end", "\n")
             
             self.details_text.insert("end", "🔧 ÇALIŞTIRILAN KOMUTLAR:\n\n")
             for cmd in session_details['commands']:
                 status_icon = "✅" if cmd['status'] == 'success' else "❌"
                 self.details_text.insert("end", 
                     f"{status_icon} {cmd['command_name']} ({cmd['duration_seconds']:.1f}s)\n")
+                if cmd['deferred_seconds']:
+                    self.details_text.insert("end",
+                        f"   ⏸️ {cmd['deferred_seconds']:.1f}s beklendi ({cmd['deferral_reason']})\n")
+                usage = cmd['usage']
+                if usage:
+                    self.details_text.insert("end",
+                        f"   💾 Tepe RSS: {format_peak_rss(usage['peak_rss_bytes'])} | "
+                        f"CPU: {usage['cpu_seconds']:.1f}s | "
+                        f"G/Ç: {format_bytes(usage['read_bytes'])} okuma / "
+                        f"{format_bytes(usage['write_bytes'])} yazma | "
+                        f"Bağlam değişimi: {usage['ctx_switches']}\n")
                 if cmd['error']:
                     self.details_text.insert("end", f"   Hata: {cmd['error']}\n")
                 self.details_text.insert("end", "\n")
             
             self.details_text.configure(state="disabled")
             
-        except ValueError:
-            messagebox.showerror("Hata", "Geçerli bir oturum ID'si girin!")
         except Exception as e:
             messagebox.showerror("Hata", f"Detaylar yüklenemedi: {e}")
+            
+    def draw_session_timeline(self, session_details, samples):
+        """Komut aralıklarının üzerine oturumun CPU/bellek/disk/ağ eğrilerini çiz"""
+        canvas = self.timeline_canvas
+        canvas.delete("all")
+        width = max(canvas.winfo_width(), 700)
+        height = self.TIMELINE_HEIGHT
+        pad = 8
+        
+        if not samples or not samples['timestamps']:
+            canvas.create_text(width / 2, height / 2, fill="gray",
+                               text="Bu oturum için izleme örneği yok")
+            return
+        
+        # Komut kaydı bitişte yazılır; başlangıç süreden geri hesaplanır
+        spans = []
+        for cmd in session_details['commands']:
+            end = datetime.fromisoformat(cmd['timestamp']).timestamp()
+            spans.append((end - (cmd['duration_seconds'] or 0), end, cmd['command_name']))
+        
+        timestamps = samples['timestamps']
+        start = min([timestamps[0]] + [span[0] for span in spans])
+        end = max([timestamps[-1]] + [span[1] for span in spans])
+        scale_x = (width - 2 * pad) / max(end - start, 1)
+        plot_top, plot_bottom = pad + 14, height - pad
+        
+        def x(t):
+            return pad + (t - start) * scale_x
+        
+        for i, (span_start, span_end, name) in enumerate(spans):
+            canvas.create_rectangle(x(span_start), plot_top, max(x(span_end), x(span_start) + 1),
+                                    plot_bottom, fill=("#2d3a4f", "#3a2d4f")[i % 2], outline="")
+            canvas.create_text(x(span_start) + 2, plot_top + 2, anchor="nw", text=name,
+                               fill="#bbbbbb", font=("Arial", 8))
+        
+        legend = []
+        for name, label, color, fixed_max in (("cpu", "CPU %", "#4ea1ff", 100),
+                                              ("memory", "RAM %", "#6ccf6c", 100),
+                                              ("disk", "Disk", "#ffa94d", None),
+                                              ("net", "Ağ", "#c77dff", None)):
+            values = samples['series'][name]
+            top = fixed_max or max(max(values), 1)
+            points = []
+            for t, value in zip(timestamps, values):
+                points += [x(t), plot_bottom - (plot_bottom - plot_top) * min(value / top, 1.0)]
+            if len(points) >= 4:
+                canvas.create_line(*points, fill=color, width=1.5)
+            legend.append((label if fixed_max else f"{label} (maks {format_bytes(top)}/s)", color))
+        
+        text_x = pad
+        for label, color in legend:
+            item = canvas.create_text(text_x, pad, anchor="nw", text=label, fill=color,
+                                      font=("Arial", 9))
+            text_x = canvas.bbox(item)[2] + 12
+        if samples['downsampled']:
+            canvas.create_text(width - pad, pad, anchor="ne", fill="gray", font=("Arial", 9),
+                               text="özet kova ortalamaları")
 
 # ---------- Güncellenmiş Ana Uygulama ----------
 class UniversalUpdaterApp(ctk.CTk):
@@ -1810,6 +2440,7 @@ class UniversalUpdaterApp(ctk.CTk):
         # Loglama ve geçmiş sistemleri
         self.logger = AdvancedLogger()
         self.history_manager = UpdateHistoryManager()
+        self.update_engine = UpdateEngine(self.history_manager)
         
         # Platform ayarları
         self.platform_info = self.get_platform_info()
@@ -1827,7 +2458,14 @@ class UniversalUpdaterApp(ctk.CTk):
         # Zamanlama yöneticisi (önceki koddan)
         self.schedule_manager = ScheduledUpdateManager()
         
+        self.current_session_id = None
         self.setup_ui()
+        
+        # Worker thread olaylarını ana döngüde işle
+        self.ui_queue = UIEventQueue(self)
+        self.ui_queue.bind(self._apply_progress, self._append_output)
+        self.ui_queue.start()
+        
         self.logger.log_info("Uygulama başlatıldı", "SystemUpdater")
         
     def get_platform_info(self):
@@ -1888,10 +2526,11 @@ class UniversalUpdaterApp(ctk.CTk):
         self.schedule_btn.pack(side="left", padx=5)
         
         # Çıktı alanı
-        self.output_text = ctk.CTkTextbox(self, width=460, height=180)
+        # Tampondan düşen satırlar oturum dökümüne yazılır
+        self.output_text = BoundedOutputView(self, width=460, height=180,
+                                             on_evict=self._persist_evicted_output)
         self.output_text.pack(pady=10, fill="x", padx=20)
-        self.output_text.insert("1.0", "Güncelleme detayları burada görünecek...\n")
-        self.output_text.configure(state="disabled")
+        self.output_text.append("Güncelleme detayları burada görünecek...\n")
         
         # Çıkış butonu
         self.quit_btn = ctk.CTkButton(self, text="❌ Çıkış",
@@ -1916,10 +2555,9 @@ class UniversalUpdaterApp(ctk.CTk):
         self.status_label.configure(text="Güncelleme başlatılıyor...")
         self.update_btn.configure(state="disabled")
         
-        self.output_text.configure(state="normal")
-        self.output_text.delete("1.0", "end")
-        self.output_text.insert("end", f"🔧 Güncelleme başlatıldı... (ID: {session_id})\n")
-        self.output_text.configure(state="disabled")
+        self.current_session_id = session_id
+        self.output_text.clear()
+        self.output_text.append(f"🔧 Güncelleme başlatıldı... (ID: {session_id})\n")
         
         # Thread'de çalıştır
         thread = threading.Thread(target=lambda: self.run_update_thread(session_id, start_time, update_type))
@@ -1937,50 +2575,9 @@ class UniversalUpdaterApp(ctk.CTk):
             self.update_done(error_msg, [], session_id, start_time, update_type)
             return
         
-        total_commands = sum(len(mgr['commands']) for mgr in managers.values())
-        completed = 0
-        success_count = 0
-        details = []
-        
-        for manager_id, manager_info in managers.items():
-            for command in manager_info['commands']:
-                completed += 1
-                progress = (completed / total_commands) * 100
-                command_start_time = time.time()
-                
-                self.update_progress(progress, f"{manager_info['name']} - {command[0]}")
-                
-                try:
-                    result = subprocess.run(command, capture_output=True, text=True, timeout=300)
-                    command_duration = time.time() - command_start_time
-                    
-                    if result.returncode == 0:
-                        success_count += 1
-                        status = "success"
-                        details.append(f"✅ {manager_info['name']} - Başarılı")
-                    else:
-                        status = "failed"
-                        error_msg = result.stderr[:100] if result.stderr else "Bilinmeyen hata"
-                        details.append(f"❌ {manager_info['name']} - Hata: {error_msg}")
-                    
-                    # Komut sonucunu geçmişe kaydet
-                    self.history_manager.log_command_result(
-                        session_id, manager_info['name'], ' '.join(command),
-                        status, result.returncode, result.stdout, result.stderr,
-                        command_duration
-                    )
-                        
-                except Exception as e:
-                    command_duration = time.time() - command_start_time
-                    error_msg = str(e)
-                    details.append(f"⚠️ {manager_info['name']} - Hata: {error_msg}")
-                    
-                    self.history_manager.log_command_result(
-                        session_id, manager_info['name'], ' '.join(command),
-                        "error", -1, "", error_msg, command_duration
-                    )
-                
-                time.sleep(1)
+        success_count, total_commands, details = self.update_engine.run_session(
+            managers, session_id, self.update_progress
+        )
         
         total_duration = time.time() - start_time
         self.history_manager.complete_update_session(
@@ -1992,28 +2589,36 @@ class UniversalUpdaterApp(ctk.CTk):
         self.update_done(summary, details, session_id, start_time, update_type)
     
     def update_progress(self, percent, detail):
+        self.ui_queue.post_progress(percent)
+        self.ui_queue.post_text(f"⏳ {detail}\n")
+    
+    def _apply_progress(self, percent):
         self.progress.set(percent / 100)
         self.status_label.configure(text=f"Güncelleniyor... %{int(percent)}")
-        
-        self.output_text.configure(state="normal")
-        self.output_text.insert("end", f"⏳ {detail}\n")
-        self.output_text.see("end")
-        self.output_text.configure(state="disabled")
+    
+    def _append_output(self, text):
+        self.output_text.append(text)
+    
+    def _persist_evicted_output(self, lines):
+        """Görünümden düşen satırları oturum dökümüne ekle"""
+        if self.current_session_id is not None:
+            self.history_manager.append_transcript(self.current_session_id, lines)
     
     def update_done(self, message, details, session_id, start_time, update_type):
         total_duration = time.time() - start_time
-        
+        self.ui_queue.call(self._finish_update, message, details, total_duration)
+    
+    def _finish_update(self, message, details, total_duration):
         self.progress.set(1.0)
         self.status_label.configure(text="Tamamlandı!")
         self.update_btn.configure(state="normal")
         
-        self.output_text.configure(state="normal")
-        self.output_text.insert("end", f"\n🎉 {message}\n")
-        self.output_text.insert("end", f"⏱️  Toplam süre: {total_duration:.1f}s\n")
-        for detail in details:
-            self.output_text.insert("end", f"• {detail}\n")
-        self.output_text.see("end")
-        self.output_text.configure(state="disabled")
+        self.output_text.append(
+            f"\n🎉 {message}\n⏱️  Toplam süre: {total_duration:.1f}s\n" +
+            "".join(f"• {detail}\n" for detail in details)
+        )
+        # Tamponda kalan son satırlar da oturum dökümüne yazılır
+        self.output_text.flush()
         
         messagebox.showinfo("Güncelleme Tamamlandı", f"{message}\nSüre: {total_duration:.1f}s")
     
@@ -2025,6 +2630,8 @@ class UniversalUpdaterApp(ctk.CTk):
     def cleanup_and_exit(self):
         """Temizlik yap ve çık"""
         self.logger.log_info("Uygulama kapatılıyor", "SystemUpdater")
+        self.output_text.flush()
+        self.update_engine.pressure_gate.close()
         self.destroy()
 
 # ---------- Platform Tespiti (Önceki koddan) ----------
@@ -2061,7 +2668,7 @@ class ScheduledUpdateManager:
         pass
 
 # ---------- Uygulamayı Başlat ----------
-if __name__ == "__main__":
+if __name__ == "__main__" and not cli_tool_requested(parse_cli_args()):
     app = UniversalUpdaterApp()
     app.mainloop()
 
@@ -2082,7 +2689,6 @@ import customtkinter as ctk
 from tkinter import messagebox, Menu
 import sys
 import json
-import schedule
 import logging
 from logging.handlers import RotatingFileHandler
 import sqlite3
@@ -2102,6 +2708,22 @@ import aiohttp
 from concurrent.futures import ThreadPoolExecutor
 import secrets
 import hashlib
+import socket
+import select
+import http.client
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from collections import deque, OrderedDict
+from itertools import count
+from urllib.parse import urlsplit, parse_qs
+import gzip
+import ipaddress
+from typing import Dict, List, Optional
+from SistemGuncelleyici.backup_store import ChunkStore, HardlinkSnapshotter, ParallelZipWriter, scan_files
+from SistemGuncelleyici.sample_store import MonitorSampleStore
+from SistemGuncelleyici.update_jobs import UpdateJobQueue
+from SistemGuncelleyici.update_schedule import ScheduledUpdateManager, host_identity
+from SistemGuncelleyici.updater_core import (BoundedOutputView, IORateTracker, MetricRing, MetricsRegistry,
+                                             ProcSampler, TaskScheduler, UIEventQueue, parse_cli_args)
 
 # ---------- GÜVENLİK SİSTEMİ ----------
 class SecurityManager:
@@ -2144,42 +2766,49 @@ class SecurityManager:
 class AnimatedProgressBar(ctk.CTkProgressBar):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.animation_thread = None
-        self.stop_animation = False
+        self.frame_ms = 16  # ~60 FPS
+        self.animation_id = None
         self.current_value = 0
+        self.start_value = 0
         self.target_value = 0
+        self.start_time = 0.0
+        self.duration = 1.0
         
     def animate_to_value(self, target_value, duration=1.0):
-        """Değere animasyonla git"""
-        if self.animation_thread and self.animation_thread.is_alive():
-            self.stop_animation = True
-            self.animation_thread.join()
-            
-        self.stop_animation = False
+        """Değere animasyonla git (ana döngüden çağrılmalı)"""
+        # Animasyon sürerken yeni hedef gelirse bulunduğu yerden devam eder
+        self.start_value = self.current_value
         self.target_value = target_value
-        self.animation_thread = threading.Thread(
-            target=self._animation_loop, 
-            args=(duration,),
-            daemon=True
-        )
-        self.animation_thread.start()
-        
-    def _animation_loop(self, duration):
-        """Animasyon döngüsü"""
-        start_value = self.current_value
-        start_time = time.time()
+        self.start_time = time.perf_counter()
+        self.duration = max(duration, 0.001)
         
-        while not self.stop_animation:
-            elapsed = time.time() - start_time
-            progress = min(elapsed / duration, 1.0)
+        if self.animation_id is None:
+            self.animation_id = self.after(0, self._animation_step)
             
-            self.current_value = start_value + (self.target_value - start_value) * progress
-            self.set(self.current_value)
+    def stop_animation(self):
+        """Animasyonu bulunduğu değerde durdur"""
+        if self.animation_id is not None:
+            self.after_cancel(self.animation_id)
+            self.animation_id = None
             
-            if progress >= 1.0:
-                break
-                
-            time.sleep(0.016)  # ~60 FPS
+    def _animation_step(self):
+        """Tek animasyon karesi"""
+        # Değer geçen süreden hesaplanır; döngü meşgulse kareler atlanır
+        elapsed = time.perf_counter() - self.start_time
+        progress = min(elapsed / self.duration, 1.0)
+        eased = 1 - (1 - progress) ** 3  # ease-out
+        
+        self.current_value = self.start_value + (self.target_value - self.start_value) * eased
+        self.set(self.current_value)
+        
+        if progress >= 1.0:
+            self.animation_id = None
+        else:
+            self.animation_id = self.after(self.frame_ms, self._animation_step)
+            
+    def destroy(self):
+        self.stop_animation()
+        super().destroy()
 
 # ---------- SYSTEM TRAY ENTEGRASYONU ----------
 class SystemTrayManager:
@@ -2213,7 +2842,10 @@ class SystemTrayManager:
         )
         
     def show_window(self):
-        """Pencereyi göster"""
+        """Pencereyi göster (tepsi menüsünden çağrılır)"""
+        self.app.ui_queue.call(self._show_window)
+        
+    def _show_window(self):
         if self.app.window_exists():
             self.app.deiconify()
             self.app.lift()
@@ -2223,20 +2855,26 @@ class SystemTrayManager:
             
     def quick_update(self):
         """Hızlı güncelleme başlat"""
-        threading.Thread(target=self.app.start_update, daemon=True).start()
+        self.app.ui_queue.call(self.app.start_update)
         
     def show_history(self):
         """Geçmişi göster"""
-        self.app.show_history()
+        self.app.ui_queue.call(self.app.show_history)
         
     def exit_app(self):
         """Uygulamadan çık"""
-        self.app.cleanup_and_exit()
+        self.app.ui_queue.call(self.app.cleanup_and_exit)
         
     def start_tray(self):
         """Sistem tepsisi başlat"""
         if self.tray_icon:
-            threading.Thread(target=self.tray_icon.run, daemon=True).start()
+            # Ayrı bir thread açmadan platformun olay döngüsüne bağlan
+            self.tray_icon.run_detached()
+            
+    def stop_tray(self):
+        """Sistem tepsisini kapat"""
+        if self.tray_icon:
+            self.tray_icon.stop()
 
 # ---------- AĞ ve CLOUD ENTEGRASYONU ----------
 class CloudIntegration:
@@ -2277,92 +2915,224 @@ class CloudIntegration:
         """Ayarları cloud ile senkronize et"""
         # Senkronizasyon implementasyonu
         pass
+    
+    def get_system_id(self) -> str:
+        """Bu makineye özgü sabit kimlik (zamanlama yayması da bunu kullanır)"""
+        return host_identity()
 
 # ---------- PERFORMANS İZLEME ----------
 class PerformanceMonitor:
-    def __init__(self):
-        self.metrics = {
-            'cpu_usage': [],
-            'memory_usage': [],
-            'disk_io': [],
-            'network_io': []
-        }
+    # Metrik başına tutulacak örnek sayısı (5 sn aralıkla 720 örnek = 1 saat)
+    DEFAULT_RETENTION = {
+        'cpu_usage': 720,
+        'memory_usage': 720,
+        'sample_wall_seconds': 720,   # izleyicinin kendi maliyeti
+        'sample_cpu_seconds': 720
+    }
+    
+    def __init__(self, interval: float = 5, retention: Dict[str, int] = None,
+                 io_retention: int = 720, active_interval: float = 1.0,
+                 use_proc_sampler: bool = True, sample_store: Optional[MonitorSampleStore] = None):
+        self.interval = interval                  # boştayken örnekleme aralığı
+        self.active_interval = active_interval    # güncelleme sürerken örnekleme aralığı
+        self.current_interval = interval
+        self.samples_taken = 0
+        self.monitoring = False
+        self.scheduler = None
+        self.retention = dict(self.DEFAULT_RETENTION, **(retention or {}))
+        self.metrics = {key: MetricRing(size) for key, size in self.retention.items()}
+        self.io_rates = IORateTracker(io_retention)
+        self.sampler = self._create_sampler() if use_proc_sampler else None
+        self.sample_store = sample_store          # örnekler çıkıştan sonra da görülebilsin diye
         
-    def start_monitoring(self):
-        """Performans izlemeyi başlat"""
+    @staticmethod
+    def _create_sampler() -> Optional[ProcSampler]:
+        """Linux'ta psutil yerine doğrudan /proc okuyan örnekleyici"""
+        if not ProcSampler.available():
+            return None
+        try:
+            return ProcSampler()
+        except OSError:
+            return None
+        
+    def start_monitoring(self, scheduler: TaskScheduler):
+        """Performans izlemeyi ortak zamanlayıcıda başlat"""
         self.monitoring = True
-        self.monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
-        self.monitor_thread.start()
+        self.scheduler = scheduler
+        
+        # İlk çağrı referans noktası; sonraki ölçümler bloklamadan farkı verir
+        if self.sampler:
+            self.sampler.cpu_percent()
+        else:
+            psutil.cpu_percent(interval=None)
+        self.current_interval = self.interval
+        scheduler.add_job('performance_monitor', self.interval, self._collect_sample)
         
     def stop_monitoring(self):
         """İzlemeyi durdur"""
         self.monitoring = False
+        if self.scheduler:
+            self.scheduler.remove_job('performance_monitor')
+        if self.sample_store:
+            self.sample_store.flush()
+        
+    def _collect_sample(self):
+        """Tek ölçüm turu (izleyicinin kendi maliyeti de ölçülür)"""
+        started_wall = time.perf_counter()
+        started_cpu = time.thread_time()
+        
+        # CPU ve bellek kullanımı (son ölçümden beri)
+        if self.sampler:
+            cpu_percent = self.sampler.cpu_percent()
+            memory_percent = self.sampler.memory_percent()
+        else:
+            cpu_percent = psutil.cpu_percent(interval=None)
+            memory_percent = psutil.virtual_memory().percent
+        self.metrics['cpu_usage'].append(cpu_percent)
+        self.metrics['memory_usage'].append(memory_percent)
+        
+        # Disk ve ağ G/Ç hızları
+        self._collect_io()
+        if self.sample_store:
+            self.sample_store.append(cpu_percent, memory_percent, *self.io_rates.latest_totals())
+        
+        self.metrics['sample_wall_seconds'].append(time.perf_counter() - started_wall)
+        self.metrics['sample_cpu_seconds'].append(time.thread_time() - started_cpu)
+        self.samples_taken += 1
+        
+    def _collect_io(self):
+        """Aygıt ve arayüz başına G/Ç sayaçlarını hız serilerine işle"""
+        if self.sampler:
+            disks, disk_total = self.sampler.read_disks()
+            self.io_rates.update(disks, self.sampler.read_network(), disk_total=disk_total)
+        else:
+            self.io_rates.update(psutil.disk_io_counters(perdisk=True),
+                                 psutil.net_io_counters(pernic=True),
+                                 disk_total=psutil.disk_io_counters())
+        
+    def _set_cadence(self, interval: float):
+        """Örnekleme aralığını değiştir (aynı isimli iş yenisiyle değişir)"""
+        self.current_interval = interval
+        if self.monitoring and self.scheduler:
+            self.scheduler.add_job('performance_monitor', interval, self._collect_sample)
+        
+    def begin_session(self, session_id):
+        """Güncelleme oturumu boyunca G/Ç aktarımını say ve sık örnekle"""
+        self._collect_io()
+        self.io_rates.begin_session(session_id)
+        self._set_cadence(self.active_interval)
+        
+    def end_session(self) -> Optional[Dict]:
+        """Oturumu kapat, boştaki aralığa dön, ortalama disk/ağ aktarımını döndür"""
+        self._set_cadence(self.interval)
+        self._collect_io()
+        return self.io_rates.end_session()
+        
+    def export_metrics(self, registry: MetricsRegistry):
+        """Ana bilgisayar örneklerini kazıma anında göstergelere aktar"""
+        registry.gauge('updater_host_cpu_percent', 'Son CPU kullanımı')
+        registry.gauge('updater_host_memory_percent', 'Son bellek kullanımı')
+        registry.gauge('updater_host_cpu_p95_percent', 'Saklanan pencerede CPU kullanımının 95. yüzdeliği')
+        registry.gauge('updater_host_disk_bytes_per_second', 'Aygıt başına disk aktarım hızı')
+        registry.gauge('updater_host_disk_iops', 'Aygıt başına disk işlem hızı')
+        registry.gauge('updater_host_network_bytes_per_second', 'Arayüz başına ağ aktarım hızı')
+        registry.counter('updater_monitor_samples_total', 'Alınan izleme örnekleri')
+        registry.gauge('updater_monitor_sample_seconds', 'Bir izleme örneğinin ortalama maliyeti')
+        registry.gauge('updater_monitor_interval_seconds', 'Geçerli örnekleme aralığı')
+        registry.add_collector(lambda: self._export_sample(registry))
+        
+    def _export_sample(self, registry: MetricsRegistry):
+        registry.set('updater_host_cpu_percent', self.metrics['cpu_usage'].latest())
+        registry.set('updater_host_memory_percent', self.metrics['memory_usage'].latest())
+        registry.set('updater_host_cpu_p95_percent', self.metrics['cpu_usage'].percentile(95))
+        
+        source = 'proc' if self.sampler else 'psutil'
+        registry.set('updater_monitor_samples_total', self.samples_taken, source=source)
+        registry.set('updater_monitor_sample_seconds', self.metrics['sample_wall_seconds'].mean(),
+                     kind='wall', source=source)
+        registry.set('updater_monitor_sample_seconds', self.metrics['sample_cpu_seconds'].mean(),
+                     kind='cpu', source=source)
+        registry.set('updater_monitor_interval_seconds', self.current_interval)
+        
+        for (kind, name, rate_name), ring in list(self.io_rates.series.items()):
+            direction, unit = rate_name.rsplit('_', 1)
+            if kind == 'net':
+                registry.set('updater_host_network_bytes_per_second', ring.latest(),
+                             interface=name, direction=direction)
+            elif unit == 'bps':
+                registry.set('updater_host_disk_bytes_per_second', ring.latest(),
+                             device=name, direction=direction)
+            else:
+                registry.set('updater_host_disk_iops', ring.latest(), device=name, direction=direction)
         
-    def _monitor_loop(self):
-        """İzleme döngüsü"""
-        while self.monitoring:
-            # CPU kullanımı
-            cpu_percent = psutil.cpu_percent(interval=1)
-            self.metrics['cpu_usage'].append(cpu_percent)
-            
-            # Bellek kullanımı
-            memory = psutil.virtual_memory()
-            self.metrics['memory_usage'].append(memory.percent)
-            
-            # Disk I/O
-            disk_io = psutil.disk_io_counters()
-            if disk_io:
-                self.metrics['disk_io'].append({
-                    'read_bytes': disk_io.read_bytes,
-                    'write_bytes': disk_io.write_bytes
-                })
-                
-            # Ağ I/O
-            net_io = psutil.net_io_counters()
-            if net_io:
-                self.metrics['network_io'].append({
-                    'bytes_sent': net_io.bytes_sent,
-                    'bytes_recv': net_io.bytes_recv
-                })
-                
-            # Son 100 kaydı tut
-            for key in self.metrics:
-                self.metrics[key] = self.metrics[key][-100:]
-                
-            time.sleep(5)
-            
-    def get_performance_report(self):
-        """Performans raporu oluştur"""
+    def current_load(self, window: int = 12) -> Optional[float]:
+        """Son window örneğin ortalama CPU kullanımı; henüz örnek yoksa None (zamanlama ertelemesi için)"""
+        if not len(self.metrics['cpu_usage']):
+            return None
+        return self.metrics['cpu_usage'].mean(window)
+        
+    def get_performance_report(self, window: int = 10):
+        """Performans raporu oluştur (son window örnek üzerinden)"""
+        cpu = self.metrics['cpu_usage'].summary(window)
+        memory = self.metrics['memory_usage'].summary(window)
         report = {
             'timestamp': datetime.now().isoformat(),
-            'cpu_avg': sum(self.metrics['cpu_usage'][-10:]) / 10 if self.metrics['cpu_usage'] else 0,
-            'memory_avg': sum(self.metrics['memory_usage'][-10:]) / 10 if self.metrics['memory_usage'] else 0,
+            'cpu_avg': cpu['mean'],
+            'memory_avg': memory['mean'],
+            'cpu': cpu,
+            'memory': memory,
+            'io': self.io_rates.report(window),
             'system_load': os.getloadavg() if hasattr(os, 'getloadavg') else [0, 0, 0]
         }
         return report
 
 # ---------- BACKUP ve ROLLBACK SİSTEMİ ----------
 class BackupManager:
-    def __init__(self):
-        self.backup_dir = "system_backups"
+    def __init__(self, backup_dir: str = "system_backups", mode: str = "chunked", workers: int = None):
+        self.backup_dir = backup_dir
         os.makedirs(self.backup_dir, exist_ok=True)
-        
-    def create_system_backup(self, backup_name: str = None):
+        # chunked: içerik adresli depo (değişmeyen veri bir kez saklanır), zip: her seferinde tam arşiv,
+        # snapshot: hardlink'li dizin görüntüsü (geri yükleme açma gerektirmeyen düz kopya)
+        self.mode = mode
+        self.workers = workers                # sıkıştırma havuzu (varsayılan: çekirdek sayısı)
+        self.chunk_store = ChunkStore(os.path.join(self.backup_dir, "store"))
+        self.snapshotter = HardlinkSnapshotter(os.path.join(self.backup_dir, "snapshots"))
+        self.last_stats = None
+        
+    def create_system_backup(self, backup_name: str = None, paths: List[str] = None, progress=None):
         """Sistem yedeği oluştur"""
         if not backup_name:
             backup_name = f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        
+        if self.mode == "snapshot":
+            try:
+                sources = [path for path in (paths or self._get_important_files()) if os.path.exists(path)]
+                manifest = self.snapshotter.create(backup_name, sources, progress)
+                self.last_stats = dict(manifest['stats'], stored_bytes=manifest['stats']['copied_bytes'])
+                return self.snapshotter.snapshot_path(backup_name)
+            except Exception as e:
+                logging.error(f"Backup creation error: {e}")
+                return None
+        
+        if self.mode == "chunked":
+            try:
+                sources = [path for path in (paths or self._get_important_files()) if os.path.exists(path)]
+                manifest = self.chunk_store.backup(backup_name, sources, progress, self.workers)
+                self.last_stats = manifest['stats']
+                return self.chunk_store.manifest_path(backup_name)
+            except Exception as e:
+                logging.error(f"Backup creation error: {e}")
+                return None
             
         backup_path = os.path.join(self.backup_dir, f"{backup_name}.zip")
         
         try:
-            with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                # Önemli sistem dosyalarını yedekle
-                important_files = self._get_important_files()
-                
-                for file_path in important_files:
-                    if os.path.exists(file_path):
-                        zipf.write(file_path, os.path.basename(file_path))
-                        
+            # Önemli sistem dosyalarını yedekle (dizinler içerikleriyle, yollar korunarak)
+            sources = [path for path in (paths or self._get_important_files()) if os.path.exists(path)]
+            writer = ParallelZipWriter(backup_path, workers=self.workers, progress=progress)
+            self.last_stats = writer.write(scan_files(sources), sources)
+            logging.info(f"Backup {backup_name}: {self.last_stats['files']} files, "
+                         f"{self.last_stats['throughput_mb_s']:.1f} MB/s")
             return backup_path
             
         except Exception as e:
@@ -2388,11 +3158,38 @@ class BackupManager:
         else:
             return []
             
-    def rollback_system(self, backup_path: str):
-        """Sistemi geri yükle"""
+    def prune_backups(self, prefix: str, keep: int) -> int:
+        """Öneki tutan yedeklerden (geçerli kipte) en yeni keep tanesi kalsın; silinen yedek sayısını döndür"""
+        if self.mode == "snapshot":
+            names = [name for name in self.snapshotter.list_snapshots() if name.startswith(prefix)]
+        else:
+            names = [name for name in self.chunk_store.list_backups() if name.startswith(prefix)]
+        stale = names[:-keep] if keep > 0 else names
+        for name in stale:
+            if self.mode == "snapshot":
+                self.snapshotter.delete(name)
+            else:
+                self.chunk_store.delete_backup(name)
+        if stale and self.mode != "snapshot":
+            self.chunk_store.garbage_collect()
+        return len(stale)
+            
+    def rollback_system(self, backup_path: str, target_root: str = None):
+        """Sistemi geri yükle (zip arşivi, depo manifesti ya da hardlink görüntüsü)"""
         try:
+            if os.path.isdir(backup_path):
+                snapshotter = HardlinkSnapshotter(os.path.dirname(os.path.abspath(backup_path)))
+                snapshotter.restore(os.path.basename(os.path.normpath(backup_path)),
+                                    target_root or tempfile.gettempdir())
+                return True
+            
+            if backup_path.endswith('.json'):
+                name = os.path.basename(backup_path)[:-len('.json')]
+                self.chunk_store.restore(name, target_root or tempfile.gettempdir())
+                return True
+            
             with zipfile.ZipFile(backup_path, 'r') as zipf:
-                zipf.extractall(tempfile.gettempdir())
+                zipf.extractall(target_root or tempfile.gettempdir())
                 
             return True
             
@@ -2491,58 +3288,770 @@ class PluginManager:
         return results
 
 # ---------- WEB DASHBOARD ENTEGRASYONU ----------
+class ProgressBroadcaster:
+    """Güncelleme olaylarını SSE bağlantılarına tek yazıcı thread ile dağıtır; yavaş istemciler düşürülür"""
+    
+    def __init__(self, max_buffer_bytes: int = 256 * 1024, max_subscribers: int = 256,
+                 output_tail: int = 50, keepalive: float = 15.0):
+        self.max_buffer_bytes = max_buffer_bytes      # abone başına gönderilmemiş veri sınırı
+        self.max_subscribers = max_subscribers        # select() dosya tanıtıcı sınırının altında
+        self.keepalive = keepalive
+        self.published = 0
+        self.dropped = 0
+        self._subscribers = {}                        # soket -> gönderilmeyi bekleyen baytlar
+        self._retained = deque(maxlen=1000)           # geç bağlanana tekrar gönderilecek oturum olayları
+        self._output_tail = deque(maxlen=output_tail)
+        self._sequence = count(1)
+        self._lock = threading.Lock()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._thread = None
+        self._running = False
+        
+    def start(self):
+        """Yazıcı thread'i başlat"""
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        
+    def stop(self):
+        """Yazıcıyı durdur ve tüm akışları kapat"""
+        self._running = False
+        self._wake()
+        if self._thread:
+            self._thread.join(timeout=2)
+        with self._lock:
+            for sock in list(self._subscribers):
+                self._drop_locked(sock)
+        
+    def has_capacity(self) -> bool:
+        return len(self._subscribers) < self.max_subscribers
+        
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+        
+    def publish(self, kind: str, data: Dict):
+        """Olayı tüm abonelerin tamponuna ekle (yayıncı soket yazımını hiç beklemez)"""
+        with self._lock:
+            message = (f"id: {next(self._sequence)}\nevent: {kind}\n"
+                       f"data: {json.dumps(data, ensure_ascii=False)}\n\n").encode()
+            if kind == 'session' and data.get('state') == 'started':
+                self._retained.clear()
+                self._output_tail.clear()
+            (self._output_tail if kind == 'output' else self._retained).append(message)
+            self.published += 1
+            
+            for sock, buffer in list(self._subscribers.items()):
+                if len(buffer) + len(message) > self.max_buffer_bytes:
+                    # Tamponu taşan istemci akışı yavaşlatmasın diye düşürülür
+                    self._drop_locked(sock, slow=True)
+                else:
+                    buffer += message
+        self._wake()
+        
+    def subscribe(self, sock: socket.socket):
+        """Başlıkları gönderilmiş bağlantıyı akışa ekle; önce güncel oturumun olayları gönderilir"""
+        sock.setblocking(False)
+        with self._lock:
+            self._subscribers[sock] = bytearray(b''.join(self._retained) + b''.join(self._output_tail))
+        self._wake()
+        
+    def _wake(self):
+        try:
+            self._wake_w.send(b'\0')
+        except (BlockingIOError, OSError):
+            pass
+        
+    def _drop_locked(self, sock: socket.socket, slow: bool = False):
+        self._subscribers.pop(sock, None)
+        if slow:
+            self.dropped += 1
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        sock.close()
+        
+    def _run(self):
+        while self._running:
+            with self._lock:
+                sockets = list(self._subscribers)
+                pending = [sock for sock in sockets if self._subscribers[sock]]
+            try:
+                readable, writable, _ = select.select([self._wake_r] + sockets, pending, [], self.keepalive)
+            except (OSError, ValueError):
+                # Soket bu turda kapandı; liste bir sonraki turda yenilenir
+                continue
+            
+            if not readable and not writable:
+                # Vekil sunucular boştaki akışı kapatmasın diye yorum satırı gönderilir
+                with self._lock:
+                    for buffer in self._subscribers.values():
+                        buffer += b': ping\n\n'
+                continue
+            
+            with self._lock:
+                for sock in readable:
+                    if sock is self._wake_r:
+                        try:
+                            while sock.recv(4096):
+                                pass
+                        except (BlockingIOError, OSError):
+                            pass
+                        continue
+                    # İstemci veri göndermez; okunabilirlik bağlantının kapandığını gösterir
+                    try:
+                        closed = not sock.recv(1024)
+                    except BlockingIOError:
+                        closed = False
+                    except OSError:
+                        closed = True
+                    if closed and sock in self._subscribers:
+                        self._drop_locked(sock)
+                
+                for sock in writable:
+                    buffer = self._subscribers.get(sock)
+                    if not buffer:
+                        continue
+                    try:
+                        sent = sock.send(buffer)
+                    except BlockingIOError:
+                        continue
+                    except OSError:
+                        self._drop_locked(sock)
+                        continue
+                    del buffer[:sent]
+        
+    def export_metrics(self, registry: MetricsRegistry):
+        """Abone ve düşürme sayılarını kazıma anında göstergelere aktar"""
+        registry.gauge('updater_events_subscribers', 'Bağlı SSE istemcileri')
+        registry.counter('updater_events_published_total', 'Yayınlanan ilerleme olayları')
+        registry.counter('updater_events_dropped_total', 'Yavaş olduğu için düşürülen SSE istemcileri')
+        registry.add_collector(lambda: (
+            registry.set('updater_events_subscribers', self.subscriber_count()),
+            registry.set('updater_events_published_total', self.published),
+            registry.set('updater_events_dropped_total', self.dropped)))
+
+class ResponseCache:
+    """Geçmiş sürümüyle etiketli yanıt gövdeleri için küçük LRU önbellek"""
+    
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()     # yol -> {'version', 'body', 'gzip'}
+        self._lock = threading.Lock()
+        
+    def get(self, key: str, version: int) -> Optional[Dict]:
+        """Aynı sürüm için üretilmiş kaydı döndür; eski sürümün kaydı kullanılmaz"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry['version'] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+            return None
+        
+    def put(self, key: str, version: int, body: bytes) -> Dict:
+        entry = {'version': version, 'body': body, 'gzip': None}
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+        
+    def clear(self, *args):
+        with self._lock:
+            self._entries.clear()
+
+class PooledHTTPServer(HTTPServer):
+    """Bağlantıları sınırlı bir thread havuzunda işleyen HTTP/1.1 sunucusu"""
+    
+    allow_reuse_address = True
+    request_queue_size = 128
+    
+    def __init__(self, address, handler_class, max_workers: int = 16, max_waiting: int = 256):
+        super().__init__(address, handler_class)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='dashboard')
+        self.max_connections = max_workers + max_waiting
+        self.stopping = False
+        self.rejected = 0
+        self._waiting = 0             # kabul edilmiş, işçi bekleyen bağlantılar
+        self._active = 0
+        self._connections = set()
+        self._detached = set()        # akış için başka thread'e devredilen bağlantılar
+        self._pending = {}            # işçi bekleyen future -> bağlantı
+        self._cond = threading.Condition()
+        
+    def process_request(self, request, client_address):
+        with self._cond:
+            accepted = not self.stopping and self._waiting + self._active < self.max_connections
+            if accepted:
+                self._waiting += 1
+                self._connections.add(request)
+        if not accepted:
+            # Havuz ve bekleme kuyruğu dolu: bağlantı bekletilmeden reddedilir
+            self.rejected += 1
+            try:
+                request.sendall(b'HTTP/1.1 503 Service Unavailable\r\nRetry-After: 1\r\n'
+                                b'Content-Length: 0\r\nConnection: close\r\n\r\n')
+            except OSError:
+                pass
+            self.shutdown_request(request)
+            return
+        future = self.executor.submit(self._process, request, client_address)
+        with self._cond:
+            self._pending[future] = request
+        future.add_done_callback(self._forget)
+        
+    def _forget(self, future):
+        with self._cond:
+            self._pending.pop(future, None)
+        
+    def _process(self, request, client_address):
+        with self._cond:
+            self._waiting -= 1
+            self._active += 1
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            with self._cond:
+                detached = request in self._detached
+                self._detached.discard(request)
+            if not detached:
+                self.shutdown_request(request)
+            with self._cond:
+                self._active -= 1
+                self._connections.discard(request)
+                self._cond.notify_all()
+                
+    def detach(self, request):
+        """Bağlantıyı istek bitince kapatma; artık başka bir yazıcıya ait"""
+        with self._cond:
+            self._detached.add(request)
+                
+    def connection_counts(self) -> tuple:
+        """(işlenen, bekleyen) bağlantı sayısı"""
+        return self._active, self._waiting
+        
+    def should_release(self) -> bool:
+        """Sırada bağlantı varken keep-alive bağlantı yanıttan sonra bırakılır"""
+        return self._waiting > 0 or self.stopping
+        
+    def graceful_shutdown(self, timeout: float = 5.0) -> bool:
+        """Yeni bağlantı almayı kes, süren yanıtların bitmesini en fazla timeout saniye bekle"""
+        with self._cond:
+            self.stopping = True
+            connections = list(self._connections)
+        self.shutdown()
+        self.server_close()
+        
+        # Boşta okuma bekleyen bağlantılar EOF alır; yazılmakta olan yanıtlar tamamlanır
+        for connection in connections:
+            try:
+                connection.shutdown(socket.SHUT_RD)
+            except OSError:
+                pass
+        
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._active + self._waiting:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            drained = not (self._active + self._waiting)
+            pending = list(self._pending.items())
+        # Başlamamış işler iptal edilir ve bağlantıları kapatılır (cancel_futures 3.9+ gerektirir)
+        for future, request in pending:
+            if future.cancel():
+                with self._cond:
+                    self._waiting -= 1
+                    self._connections.discard(request)
+                self.shutdown_request(request)
+        self.executor.shutdown(wait=False)
+        return drained
+
+class DashboardRequestHandler(BaseHTTPRequestHandler):
+    """WebDashboard istekleri (keep-alive destekli)"""
+    
+    protocol_version = 'HTTP/1.1'
+    timeout = 10                  # boştaki keep-alive ve yavaş istemciler için soket zaman aşımı
+    # Başlık ve gövde ayrı yazılır; Nagle istemcinin gecikmeli ACK'ini beklemesin
+    disable_nagle_algorithm = True
+    
+    PAGE = """<!DOCTYPE html>
+    <html>
+    <head>
+    <meta charset="utf-8">
+    <title>System Updater Dashboard</title>
+    <style>
+        body { font-family: sans-serif; margin: 2em; background: #1e1e1e; color: #ddd; }
+        .bar { background: #333; height: 12px; border-radius: 6px; overflow: hidden; }
+        .fill { background: #4ea1ff; height: 100%; width: 0; transition: width 0.3s; }
+        .manager { margin: 1.5em 0; }
+        .command { margin: 0.3em 0; font-size: 14px; }
+        pre { background: #111; padding: 0.5em; max-height: 12em; overflow: auto; font-size: 12px; }
+    </style>
+    </head>
+    <body>
+        <h1>🚀 System Updater Dashboard</h1>
+        <div id="status">Loading...</div>
+        <div class="bar"><div class="fill" id="overall"></div></div>
+        <div id="managers"></div>
+    <script>
+    const TAIL_LINES = 20;
+    const statusLine = document.getElementById('status');
+    const overall = document.getElementById('overall');
+    const container = document.getElementById('managers');
+    let managers = {};
+
+    function manager(name) {
+        if (!managers[name]) {
+            const el = document.createElement('div');
+            el.className = 'manager';
+            el.innerHTML = '<h3></h3><div class="bar"><div class="fill"></div></div>' +
+                           '<div class="command"></div><pre></pre>';
+            container.appendChild(el);
+            managers[name] = {name: name, el: el, total: 0, done: 0, lines: []};
+        }
+        return managers[name];
+    }
+
+    function render(m) {
+        m.el.querySelector('h3').textContent = `${m.name} (${m.done}/${m.total})`;
+        m.el.querySelector('.fill').style.width = (m.total ? 100 * m.done / m.total : 0) + '%';
+    }
+
+    const source = new EventSource('/api/events');
+    source.addEventListener('session', e => {
+        const d = JSON.parse(e.data);
+        if (d.state === 'started') {
+            managers = {};
+            container.innerHTML = '';
+            overall.style.width = '0';
+            for (const [name, total] of Object.entries(d.managers)) {
+                const m = manager(name);
+                m.total = total;
+                render(m);
+            }
+            statusLine.textContent = `Session #${d.session_id} running`;
+        } else {
+            overall.style.width = '100%';
+            statusLine.textContent = `Session #${d.session_id} finished: ${d.success}/${d.total} succeeded`;
+        }
+    });
+    source.addEventListener('progress', e => {
+        const d = JSON.parse(e.data);
+        overall.style.width = d.percent + '%';
+        statusLine.textContent = d.detail;
+    });
+    source.addEventListener('command', e => {
+        const d = JSON.parse(e.data);
+        const m = manager(d.manager);
+        const icons = {running: '⏳', success: '✅', deferred: '⏸️'};
+        if (d.state !== 'running') m.done += 1;
+        m.el.querySelector('.command').textContent = `${icons[d.state] || '❌'} ${d.command}`;
+        render(m);
+    });
+    source.addEventListener('output', e => {
+        const d = JSON.parse(e.data);
+        const m = manager(d.manager);
+        m.lines.push(d.line);
+        if (m.lines.length > TAIL_LINES) m.lines.shift();
+        const pre = m.el.querySelector('pre');
+        pre.textContent = m.lines.join('\\n');
+        pre.scrollTop = pre.scrollHeight;
+    });
+    source.onerror = () => { statusLine.textContent = 'Connection lost, reconnecting...'; };
+    </script>
+    </body>
+    </html>
+    """
+    
+    # Sıkıştırmanın kazandırmadığı küçük gövdeler olduğu gibi gönderilir
+    GZIP_MIN_BYTES = 512
+    MAX_BODY_BYTES = 64 * 1024
+    
+    def do_GET(self):
+        dashboard = self.server.dashboard
+        route = urlsplit(self.path).path.rstrip('/')
+        if route == '/api/status':
+            self._send_json({'status': 'running'})
+        elif route == '/api/events' and dashboard.events:
+            self._start_event_stream(dashboard.events)
+        elif route.split('/')[:3] in (['', 'api', 'sessions'], ['', 'api', 'statistics'],
+                                      ['', 'api', 'analytics']) and dashboard.history_manager:
+            self._send_history()
+        elif route == '/api/runs' and dashboard.job_queue:
+            self._send_json({'jobs': dashboard.job_queue.list_jobs()})
+        elif route.startswith('/api/runs/') and dashboard.job_queue:
+            job = self._job_from_path(route)
+            if job is not None:
+                self._send_json(job)
+        elif route == '/metrics' and dashboard.metrics:
+            # Bellekteki toplamlardan üretilir; kazıma SQLite'a dokunmaz
+            self._send(200, dashboard.metrics.render().encode(),
+                       'text/plain; version=0.0.4; charset=utf-8')
+        else:
+            self._send(200, self.PAGE.encode(), 'text/html; charset=utf-8')
+            
+    def do_POST(self):
+        """POST /api/runs: güncelleme işi ekle {"managers": [...], "dry_run": false}"""
+        job_queue = self.server.dashboard.job_queue
+        try:
+            payload = self._read_json()
+        except ValueError as e:
+            self._send_json({'error': str(e)}, 400)
+            return
+        if urlsplit(self.path).path.rstrip('/') != '/api/runs' or not job_queue:
+            self._send_json({'error': 'not found'}, 404)
+            return
+        if not self._authorized():
+            self._send_json({'error': 'forbidden'}, 403)
+            return
+        
+        managers = payload.get('managers')
+        dry_run = payload.get('dry_run', False)
+        if managers is not None and (not isinstance(managers, list) or
+                                     not all(isinstance(name, str) and name for name in managers)):
+            self._send_json({'error': 'managers bir metin listesi olmalı'}, 400)
+            return
+        if not isinstance(dry_run, bool):
+            self._send_json({'error': 'dry_run true/false olmalı'}, 400)
+            return
+        
+        job, collapsed = job_queue.submit(managers, dry_run, source='api')
+        job['collapsed'] = collapsed
+        # Birleştirilen istek yeni iş oluşturmaz; mevcut iş 200 ile döner
+        self._send_json(job, 200 if collapsed else 202, {'Location': f"/api/runs/{job['id']}"})
+        
+    def do_DELETE(self):
+        """DELETE /api/runs/{id}: sıradaki işi iptal et ya da çalışanı durdur"""
+        route = urlsplit(self.path).path.rstrip('/')
+        job_queue = self.server.dashboard.job_queue
+        if not route.startswith('/api/runs/') or not job_queue:
+            self._send_json({'error': 'not found'}, 404)
+            return
+        if not self._authorized():
+            self._send_json({'error': 'forbidden'}, 403)
+            return
+        job = self._job_from_path(route)
+        if job is None:
+            return
+        
+        status = job_queue.cancel(job['id'])
+        if status == 'cancelled':
+            self._send_json({'id': job['id'], 'status': status})
+        elif status == 'cancelling':
+            # Çalışan komut bitince kalan komutlar atlanır
+            self._send_json({'id': job['id'], 'status': status}, 202)
+        else:
+            self._send_json({'id': job['id'], 'status': status, 'error': 'iş zaten bitti'}, 409)
+        
+    def _job_from_path(self, route: str) -> Optional[Dict]:
+        """/api/runs/{id} yolundaki işi getir; yoksa hata yanıtını gönder"""
+        job_id = route.rsplit('/', 1)[1]
+        job = self.server.dashboard.job_queue.get_job(int(job_id)) if job_id.isdigit() else None
+        if job is None:
+            self._send_json({'error': 'not found'}, 404)
+        return job
+        
+    def _read_json(self) -> Dict:
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > self.MAX_BODY_BYTES:
+            # Okunmayan gövde bağlantıda kalır; bağlantı bu yanıttan sonra kapanır
+            self.close_connection = True
+            raise ValueError('istek gövdesi çok büyük')
+        body = self.rfile.read(length) if length else b''
+        if not body:
+            return {}
+        try:
+            payload = json.loads(body)
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            raise ValueError('geçersiz JSON')
+        if not isinstance(payload, dict):
+            raise ValueError('JSON nesnesi bekleniyor')
+        return payload
+        
+    def _authorized(self) -> bool:
+        """Değişiklik yapan istekler: belirteç tanımlıysa Bearer belirteç, değilse yalnız yerel istemci"""
+        token = self.server.dashboard.api_token
+        if token:
+            return secrets.compare_digest(self.headers.get('Authorization', ''), f"Bearer {token}")
+        return ipaddress.ip_address(self.client_address[0]).is_loopback
+        
+    def _send_json(self, data, status: int = 200, headers: Dict = None):
+        self._send(status, json.dumps(data).encode(), 'application/json', headers)
+        
+    def _send_history(self):
+        """Geçmiş uç noktaları: ETag eşleşirse 304, değilse önbellekten ya da SQLite'tan yanıt"""
+        dashboard = self.server.dashboard
+        use_gzip = self._accepts_gzip()
+        
+        # ETag yalnız bellekteki sürümden hesaplanır; eşleşen istek veritabanına hiç gitmez
+        etag = '"{}{}"'.format(dashboard.history_etag(self.path), '-gz' if use_gzip else '')
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache', 'Vary': 'Accept-Encoding'}
+        if etag in [tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')]:
+            dashboard.count_cache('not_modified')
+            self._send(304, b'', 'application/json', headers)
+            return
+        
+        try:
+            entry = dashboard.history_response(self.path)
+        except ValueError as e:
+            self._send_json({'error': str(e)}, 400)
+            return
+        if entry is None:
+            self._send_json({'error': 'not found'}, 404)
+            return
+        
+        body = entry['body']
+        if use_gzip and len(body) >= self.GZIP_MIN_BYTES:
+            if entry['gzip'] is None:
+                entry['gzip'] = gzip.compress(body, compresslevel=6, mtime=0)
+            body = entry['gzip']
+            headers['Content-Encoding'] = 'gzip'
+        self._send(200, body, 'application/json; charset=utf-8', headers)
+        
+    def _accepts_gzip(self) -> bool:
+        for coding in self.headers.get('Accept-Encoding', '').split(','):
+            name, _, params = coding.strip().partition(';')
+            if name.strip() in ('gzip', '*'):
+                return params.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000')
+        return False
+        
+    def _start_event_stream(self, events: ProgressBroadcaster):
+        """SSE başlıklarını gönder ve bağlantıyı yayıncıya devret; havuz işçisi hemen serbest kalır"""
+        if not events.has_capacity():
+            self._send_json({'error': 'too many event subscribers'}, 503)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('X-Accel-Buffering', 'no')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.server.detach(self.connection)
+        events.subscribe(self.connection)
+        
+    def _send(self, status: int, body: bytes, content_type: str, headers: Dict = None):
+        self.send_response(status)
+        if status == 304:
+            # 304 yanıtında gövde ve gövde başlıkları olmaz
+            body = b''
+        else:
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if self.server.should_release():
+            # Connection: close başlığı close_connection'ı da ayarlar
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+        
+        metrics = self.server.dashboard.metrics
+        if metrics:
+            metrics.inc('updater_dashboard_requests_total', code=str(status))
+            
+    def log_message(self, format, *args):
+        # Erişim kayıtları stderr yerine loglama sistemine gider
+        logging.debug("dashboard %s - %s", self.address_string(), format % args)
+
 class WebDashboard:
-    def __init__(self, host='localhost', port=8080):
+    def __init__(self, host='localhost', port=8080, metrics: MetricsRegistry = None,
+                 max_workers: int = 16, shutdown_timeout: float = 5.0,
+                 events: ProgressBroadcaster = None, history_manager: UpdateHistoryManager = None,
+                 job_queue: UpdateJobQueue = None, api_token: str = None):
         self.host = host
         self.port = port
+        self.metrics = metrics
+        self.events = events
+        self.history_manager = history_manager
+        self.job_queue = job_queue
+        self.api_token = api_token
+        self.history_cache = ResponseCache()
+        # Yeniden başlatmada sürüm sayacı sıfırlanır; eski ETag'ler bu önekle geçersiz kalır
+        self.etag_epoch = f"{int(time.time()):x}"
+        if history_manager:
+            history_manager.add_listener(self.history_cache.clear)
+        self.max_workers = max_workers
+        self.shutdown_timeout = shutdown_timeout
+        self.server = None
         self.server_thread = None
+        if metrics:
+            metrics.counter('updater_dashboard_requests_total', 'Dashboard yanıtları')
+            metrics.gauge('updater_dashboard_connections', 'Dashboard bağlantıları')
+            metrics.counter('updater_dashboard_rejected_total', 'Havuz dolu olduğu için reddedilen bağlantılar')
+            metrics.counter('updater_dashboard_history_cache_total', 'Geçmiş API önbellek sonuçları')
+            metrics.add_collector(self._export_connections)
         
     def start_dashboard(self):
         """Web dashboard'ı başlat"""
-        self.server_thread = threading.Thread(target=self._run_server, daemon=True)
+        try:
+            self.server = PooledHTTPServer((self.host, self.port), DashboardRequestHandler,
+                                           max_workers=self.max_workers)
+        except OSError as e:
+            logging.error(f"Dashboard başlatılamadı ({self.host}:{self.port}): {e}")
+            return
+        self.server.dashboard = self
+        self.server_thread = threading.Thread(target=self.server.serve_forever, daemon=True)
         self.server_thread.start()
         
-    def _run_server(self):
-        """Basit HTTP server"""
-        from http.server import HTTPServer, BaseHTTPRequestHandler
-        import json
+    def stop_dashboard(self) -> bool:
+        """Yeni istekleri kes, süren yanıtları bitir ve sunucuyu kapat"""
+        if not self.server:
+            return True
+        server, self.server = self.server, None
+        drained = server.graceful_shutdown(self.shutdown_timeout)
+        self.server_thread.join(self.shutdown_timeout)
+        return drained
+        
+    def history_etag(self, path: str) -> str:
+        """Yol ve geçmiş sürümünden güçlü ETag (tırnaksız)"""
+        path_hash = hashlib.sha1(path.encode()).hexdigest()[:12]
+        return f"{self.etag_epoch}-{self.history_manager.version}-{path_hash}"
+        
+    def history_response(self, path: str) -> Optional[Dict]:
+        """Geçmiş uç noktasının önbellek kaydı; aynı sürümde SQLite yalnız bir kez sorgulanır"""
+        version = self.history_manager.version
+        entry = self.history_cache.get(path, version)
+        if entry:
+            self.count_cache('hit')
+            return entry
+        
+        self.count_cache('miss')
+        data = self._query_history(path)
+        if data is None:
+            return None
+        body = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode()
+        # Sorgudan önce okunan sürümle saklanır; arada yazım olduysa kayıt hemen eskir
+        return self.history_cache.put(path, version, body)
         
-        class DashboardHandler(BaseHTTPRequestHandler):
-            def do_GET(self):
-                if self.path == '/api/status':
-                    self._send_json_response({'status': 'running'})
-                else:
-                    self._send_html_response()
-                    
-            def _send_json_response(self, data):
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps(data).encode())
-                
-            def _send_html_response(self):
-                self.send_response(200)
-                self.send_header('Content-type', 'text/html')
-                self.end_headers()
-                
-                html = """
-                <html>
-                <head><title>System Updater Dashboard</title></head>
-                <body>
-                    <h1>🚀 System Updater Dashboard</h1>
-                    <div id="status">Loading...</div>
-                </body>
-                </html>
-                """
-                self.wfile.write(html.encode())
-                
-        server = HTTPServer((self.host, self.port), DashboardHandler)
-        server.serve_forever()
+    def _query_history(self, path: str) -> Optional[Dict]:
+        url = urlsplit(path)
+        parts = url.path.strip('/').split('/')
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        
+        def int_param(name, default, low, high):
+            try:
+                value = int(params.get(name, default))
+            except ValueError:
+                raise ValueError(f"{name} tam sayı olmalı")
+            if not low <= value <= high:
+                raise ValueError(f"{name} {low}-{high} aralığında olmalı")
+            return value
+        
+        history = self.history_manager
+        if parts == ['api', 'sessions']:
+            cursor = params.get('cursor')
+            before_id = int_param('cursor', 0, 1, sys.maxsize) if cursor is not None else None
+            sessions, next_cursor = history.get_sessions_page(before_id, int_param('limit', 20, 1, 100))
+            return {'sessions': sessions, 'next_cursor': next_cursor}
+        if len(parts) == 3 and parts[:2] == ['api', 'sessions']:
+            if not parts[2].isdigit():
+                raise ValueError("oturum ID'si tam sayı olmalı")
+            return history.get_session_details(int(parts[2]))
+        if parts == ['api', 'statistics']:
+            return history.get_statistics(int_param('days', 30, 1, 3650))
+        if parts == ['api', 'analytics']:
+            return history.get_analytics(int_param('days', 30, 1, 3650))
+        return None
+        
+    def count_cache(self, result: str):
+        if self.metrics:
+            self.metrics.inc('updater_dashboard_history_cache_total', result=result)
+        
+    def _export_connections(self):
+        server = self.server
+        if not server:
+            return
+        active, waiting = server.connection_counts()
+        self.metrics.set('updater_dashboard_connections', active, state='active')
+        self.metrics.set('updater_dashboard_connections', waiting, state='waiting')
+        self.metrics.set('updater_dashboard_rejected_total', server.rejected)
         
     def open_dashboard(self):
         """Dashboard'ı tarayıcıda aç"""
         webbrowser.open(f'http://{self.host}:{self.port}')
 
+def benchmark_dashboard(host: str = 'localhost', port: int = 8080, clients: int = 100,
+                        requests_per_client: int = 50, path: str = '/api/status') -> Dict:
+    """Eşzamanlı keep-alive istemcilerle dashboard'ı yükle; istek/sn ve gecikme yüzdeliklerini döndür"""
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(clients + 1)
+    
+    def client():
+        conn = http.client.HTTPConnection(host, port, timeout=30)
+        local, failed = [], 0
+        barrier.wait()
+        for _ in range(requests_per_client):
+            started = time.perf_counter()
+            try:
+                # Sunucu Connection: close derse http.client sonraki istekte yeniden bağlanır
+                conn.request('GET', path)
+                response = conn.getresponse()
+                response.read()
+                if response.status != 200:
+                    failed += 1
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                conn.close()
+            local.append(time.perf_counter() - started)
+        conn.close()
+        with lock:
+            latencies.extend(local)
+            errors.append(failed)
+    
+    threads = [threading.Thread(target=client, daemon=True) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    
+    ring = MetricRing(max(len(latencies), 1))
+    for latency in latencies:
+        ring.append(latency * 1000)
+    summary = ring.summary()
+    return {
+        'clients': clients,
+        'requests': len(latencies),
+        'errors': sum(errors),
+        'elapsed_seconds': elapsed,
+        'requests_per_second': len(latencies) / elapsed if elapsed else 0.0,
+        'latency_p50_ms': summary['p50'],
+        'latency_p99_ms': summary['p99'],
+        'latency_max_ms': summary['max']
+    }
+
+def benchmark_local_dashboard(clients: int = 100, requests_per_client: int = 50,
+                              path: str = '/api/status') -> Dict:
+    """Geçici geçmiş veritabanıyla süreç içinde dashboard başlatıp benchmark_dashboard ile yükle"""
+    with tempfile.TemporaryDirectory() as history_dir:
+        metrics = MetricsRegistry()
+        dashboard = WebDashboard('127.0.0.1', 0, metrics=metrics,
+                                 history_manager=UpdateHistoryManager(history_dir, metrics=metrics))
+        dashboard.start_dashboard()
+        if not dashboard.server:
+            raise OSError("Dashboard başlatılamadı")
+        try:
+            return benchmark_dashboard('127.0.0.1', dashboard.server.server_address[1], clients,
+                                       requests_per_client, path)
+        finally:
+            dashboard.stop_dashboard()
+
 # ---------- GELİŞMİŞ HATA YÖNETİMİ ----------
 class ErrorHandler:
     def __init__(self):
@@ -2584,16 +4093,39 @@ class ErrorHandler:
 
 # ---------- GÜNCELLENMİŞ ANA UYGULAMA ----------
 class UniversalUpdaterApp(ctk.CTk):
+    # Güncelleme öncesi yedekler bu önekle alınır, en yenileri saklanır
+    PRE_UPDATE_PREFIX = "pre_update_"
+    PRE_UPDATE_KEEP = 10
+    
     def __init__(self):
         super().__init__()
         
+        # Ana döngü kuyruğu ve tüm periyodik işler için ortak zamanlayıcı
+        self.ui_queue = UIEventQueue(self)
+        self.task_scheduler = TaskScheduler(self.ui_queue)
+        
+        # Prometheus metrikleri (/metrics) bellekteki bu kayıttan sunulur
+        self.metrics = MetricsRegistry()
+        
         # Tüm manager'ları başlat
         self.security_manager = SecurityManager()
-        self.performance_monitor = PerformanceMonitor()
+        self.history_manager = UpdateHistoryManager(metrics=self.metrics)
+        self.performance_monitor = PerformanceMonitor(sample_store=self.history_manager.samples)
+        # Motorun ilerleme olayları dashboard'daki SSE akışına dağıtılır
+        self.events = ProgressBroadcaster()
+        self.update_engine = UpdateEngine(self.history_manager, metrics=self.metrics, events=self.events)
+        self.package_manager = CrossPlatformPackageManager()
+        # GUI ve API istekleri aynı kuyruktan geçer; makinede aynı anda tek güncelleme çalışır
+        self.job_queue = UpdateJobQueue(self.history_manager.db_path, self._run_job, metrics=self.metrics)
+        # Zamanlanmış çalışmalar da kuyruğa girer; host meşguliyeti izleyicinin CPU ortalamasıyla ölçülür
+        self.schedule_manager = ScheduledUpdateManager(task_scheduler=self.task_scheduler,
+                                                       load_probe=self.performance_monitor.current_load)
         self.backup_manager = BackupManager()
         self.container_manager = ContainerManager()
         self.plugin_manager = PluginManager()
-        self.web_dashboard = WebDashboard()
+        self.web_dashboard = WebDashboard(metrics=self.metrics, events=self.events,
+                                          history_manager=self.history_manager,
+                                          job_queue=self.job_queue)
         self.error_handler = ErrorHandler()
         self.cloud_integration = CloudIntegration()
         
@@ -2603,9 +4135,21 @@ class UniversalUpdaterApp(ctk.CTk):
         # GUI ayarları
         self.setup_gui()
         
+        # Worker ilerlemesi ana döngüde işlenir
+        self.ui_queue.bind(self._apply_progress, self._append_log)
+        self.setup_metrics()
+        
         # Sistemleri başlat
         self.start_systems()
         
+    def setup_metrics(self):
+        """Uygulama düzeyindeki metrikleri kaydet"""
+        self.metrics.gauge('updater_ui_queue_depth', 'Ana döngüde bekleyen olay sayısı')
+        self.metrics.add_collector(
+            lambda: self.metrics.set('updater_ui_queue_depth', self.ui_queue.pending()))
+        self.performance_monitor.export_metrics(self.metrics)
+        self.events.export_metrics(self.metrics)
+        
     def setup_gui(self):
         """GUI'yi kur"""
         self.title("🚀 PROFESYONEL SİSTEM GÜNCELLEYİCİ")
@@ -2667,6 +4211,11 @@ class UniversalUpdaterApp(ctk.CTk):
             for text, command in buttons[i:i+3]:
                 btn = ctk.CTkButton(row_frame, text=text, command=command, width=120)
                 btn.pack(side='left', padx=5)
+        
+        # İşaretlenirse komutlar çalıştırılmaz, yalnız plan gösterilir (varsayılan gerçek güncelleme)
+        self.dry_run_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(button_frame, text="Deneme modu (komutları çalıştırmadan planı göster)",
+                        variable=self.dry_run_var).pack(pady=5)
                 
     def setup_system_info_panel(self):
         """Sistem bilgi panelini kur"""
@@ -2683,10 +4232,9 @@ class UniversalUpdaterApp(ctk.CTk):
         log_frame = ctk.CTkFrame(self)
         log_frame.pack(pady=10, fill='both', expand=True, padx=20)
         
-        self.log_text = ctk.CTkTextbox(log_frame)
+        self.log_text = BoundedOutputView(log_frame)
         self.log_text.pack(pady=5, fill='both', expand=True, padx=10)
-        self.log_text.insert('1.0', "Sistem başlatıldı...\n")
-        self.log_text.configure(state='disabled')
+        self.log_text.append("Sistem başlatıldı...\n")
         
     def get_system_info(self):
         """Sistem bilgilerini getir"""
@@ -2700,11 +4248,17 @@ Bellek: {psutil.virtual_memory().total // (1024**3)} GB
         
     def start_systems(self):
         """Tüm sistemleri başlat"""
+        self.ui_queue.start()
+        self.task_scheduler.start()
+        
         # Performans izlemeyi başlat
-        self.performance_monitor.start_monitoring()
+        self.performance_monitor.start_monitoring(self.task_scheduler)
         
-        # Web dashboard'ı başlat
+        # Web dashboard'ı, canlı olay akışını ve güncelleme kuyruğunu başlat
+        self.events.start()
         self.web_dashboard.start_dashboard()
+        self.job_queue.start()
+        self.schedule_manager.start_scheduler(self.submit_scheduled_update)
         
         # System tray'i başlat
         self.tray_manager.start_tray()
@@ -2717,24 +4271,22 @@ Bellek: {psutil.virtual_memory().total // (1024**3)} GB
         
     def start_status_updater(self):
         """Durum güncelleyiciyi başlat"""
-        def update_loop():
-            while True:
-                try:
-                    # Performans metriklerini güncelle
-                    report = self.performance_monitor.get_performance_report()
-                    
-                    self.cpu_label.configure(text=f"CPU: {report['cpu_avg']:.1f}%")
-                    self.memory_label.configure(text=f"RAM: {report['memory_avg']:.1f}%")
-                    
-                    # Log ekranını güncelle
-                    self.update_log_display()
-                    
-                except Exception as e:
-                    self.error_handler.handle_error(e)
-                    
-                time.sleep(2)
-                
-        threading.Thread(target=update_loop, daemon=True).start()
+        self.task_scheduler.add_job('status_updater', 2, self.refresh_status, on_main_loop=True)
+        
+    def refresh_status(self):
+        """Durum göstergelerini yenile (ana döngüde çalışır)"""
+        try:
+            # Performans metriklerini güncelle
+            report = self.performance_monitor.get_performance_report()
+            
+            self.cpu_label.configure(text=f"CPU: {report['cpu_avg']:.1f}%")
+            self.memory_label.configure(text=f"RAM: {report['memory_avg']:.1f}%")
+            
+            # Log ekranını güncelle
+            self.update_log_display()
+            
+        except Exception as e:
+            self.error_handler.handle_error(e)
         
     def update_log_display(self):
         """Log ekranını güncelle"""
@@ -2752,23 +4304,89 @@ Bellek: {psutil.virtual_memory().total // (1024**3)} GB
             return
             
         # Animasyonlu progress bar
-        self.progress.animate_to_value(1.0, duration=2.0)
+        self.progress.animate_to_value(0.0, duration=0.3)
+        
+        # Güncelleme kuyruğa alınır; çalışan ya da bekleyen aynı istek varsa ona katılır
+        job, collapsed = self.job_queue.submit(dry_run=self.dry_run_var.get(), source='gui')
+        if collapsed:
+            self.log_text.append(f"⏳ Aynı güncelleme zaten sırada (iş #{job['id']})\n")
+        else:
+            self.log_text.append(f"⏳ Güncelleme kuyruğa alındı (iş #{job['id']}, önünde {job['position']} iş)\n")
         
-        # Güncelleme işlemi
-        threading.Thread(target=self._update_process, daemon=True).start()
+    def submit_scheduled_update(self, scheduled: bool = True):
+        """Zamanlanmış güncellemeyi kuyruğa al (zamanlayıcı thread'inde)"""
+        job, collapsed = self.job_queue.submit(source='schedule')
+        if not collapsed:
+            self.ui_queue.post_text(f"⏰ Zamanlanmış güncelleme kuyruğa alındı (iş #{job['id']})\n")
         
-    def _update_process(self):
-        """Güncelleme işlemi"""
+    def _run_job(self, job: Dict, cancel: threading.Event) -> Dict:
+        """Kuyruktaki işi çalıştır (iş kuyruğu thread'inde)"""
+        managers = self.package_manager.get_available_managers()
+        if job['managers']:
+            wanted = set(job['managers'])
+            managers = {manager_id: info for manager_id, info in managers.items()
+                        if manager_id.lower() in wanted or info['name'].lower() in wanted}
+        if not managers:
+            self.ui_queue.post_text("❌ Paket yöneticisi bulunamadı\n")
+            return {'status': 'failed', 'error': 'Eşleşen paket yöneticisi yok'}
+        
+        if job['dry_run']:
+            # Deneme: hiçbir komut çalışmaz, çalışacak olanlar raporlanır
+            plan = {info['name']: [' '.join(command) for command in info['commands']]
+                    for info in managers.values()}
+            self.ui_queue.post_text("".join(f"🧪 {name}: {command}\n"
+                                            for name, commands in plan.items() for command in commands))
+            return {'status': 'completed', 'dry_run': True, 'commands': plan}
+        
+        update_type = "manual" if job['source'] == 'gui' else job['source']
+        start_time = time.time()
+        session_id = self.history_manager.start_update_session(update_type)
+        self._snapshot_before_update(session_id)
+        self.performance_monitor.begin_session(session_id)
         try:
-            # Gerçek güncelleme işlemleri burada
-            time.sleep(3)  # Simülasyon
+            success_count, total_commands, details = self.update_engine.run_session(
+                managers, session_id, self.update_progress, cancel
+            )
+            status = "cancelled" if cancel.is_set() else "completed"
+            
+            self.history_manager.complete_update_session(
+                session_id, success_count, total_commands, time.time() - start_time, status
+            )
+            self.ui_queue.post_text("".join(f"{detail}\n" for detail in details))
             
             # Plugin hook'u
-            self.plugin_manager.execute_plugin_hook('after_update', success=True)
+            success = total_commands > 0 and success_count == total_commands
+            self.plugin_manager.execute_plugin_hook('after_update', success=success)
+            return {'status': status, 'session_id': session_id,
+                    'success_count': success_count, 'total_commands': total_commands}
             
         except Exception as e:
             self.error_handler.handle_error(e)
             self.plugin_manager.execute_plugin_hook('after_update', success=False)
+            return {'status': 'failed', 'session_id': session_id, 'error': str(e)}
+        finally:
+            self.performance_monitor.end_session()
+            
+    def _snapshot_before_update(self, session_id: int):
+        """Güncelleme öncesi yedek; depoda yalnız değişen dosyalar okunur ve yazılır"""
+        if not self.backup_manager.create_system_backup(f"{self.PRE_UPDATE_PREFIX}{session_id}"):
+            self.ui_queue.post_text("⚠️ Güncelleme öncesi yedek alınamadı\n")
+            return
+        stats = self.backup_manager.last_stats or {}
+        self.ui_queue.post_text(f"📦 Güncelleme öncesi yedek: {stats.get('files', 0)} dosya, "
+                                f"{format_bytes(stats.get('stored_bytes', 0))} yeni veri\n")
+        self.backup_manager.prune_backups(self.PRE_UPDATE_PREFIX, self.PRE_UPDATE_KEEP)
+            
+    def update_progress(self, percent, detail):
+        """İlerlemeyi güncelle (worker thread'den güvenle çağrılabilir)"""
+        self.ui_queue.post_progress(percent)
+        self.ui_queue.post_text(f"⏳ {detail}\n")
+        
+    def _apply_progress(self, percent):
+        self.progress.animate_to_value(percent / 100, duration=0.5)
+        
+    def _append_log(self, text):
+        self.log_text.append(text)
             
     def create_backup(self):
         """Yedek oluştur"""
@@ -2800,11 +4418,25 @@ Bellek: {psutil.virtual_memory().total // (1024**3)} GB
     def cleanup_and_exit(self):
         """Temizlik ve çıkış"""
         self.performance_monitor.stop_monitoring()
+        self.schedule_manager.stop_scheduler()
+        self.job_queue.stop()
+        self.web_dashboard.stop_dashboard()
+        self.events.stop()
+        self.task_scheduler.stop()
+        self.update_engine.pressure_gate.close()
+        self.tray_manager.stop_tray()
         self.plugin_manager.execute_plugin_hook('on_shutdown')
+        self.ui_queue.stop()
         self.destroy()
 
 # ---------- UYGULAMAYI BAŞLAT ----------
 if __name__ == "__main__":
+    cli_args = parse_cli_args()
+    if cli_args.benchmark_dashboard:
+        print(json.dumps(benchmark_local_dashboard(cli_args.clients, cli_args.requests, cli_args.path),
+                         indent=2))
+        sys.exit(0)
+    
     # Gerekli kütüphaneleri kontrol et
     try:
         import pystray
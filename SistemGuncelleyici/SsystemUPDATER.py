@@ -20,6 +20,11 @@ from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import base64
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from backup_store import HardlinkSnapshotter
+from updater_core import (BoundedOutputView, IORateTracker, MetricRing, PressureStallGate, PressureStallReader,
+                          ProcSampler, TaskScheduler, UIEventQueue)
 
 # =========== GELİŞMİŞ GÜVENLİK SİSTEMİ ===========
 
@@ -422,6 +427,7 @@ class ThemeManager:
             }
         }
         self.auto_switch_enabled = False
+        self.scheduler = None
         
     def switch_theme(self, theme_name: str):
         """Tema değiştir"""
@@ -449,60 +455,304 @@ class ThemeManager:
         except Exception:
             pass
     
-    def enable_auto_switch(self):
+    def enable_auto_switch(self, scheduler):
         """Otomatik tema değiştirmeyi aktif et"""
         self.auto_switch_enabled = True
-        self.auto_switch_thread = threading.Thread(target=self._auto_switch_loop, daemon=True)
-        self.auto_switch_thread.start()
+        self.scheduler = scheduler
+        # Tema GUI'ye dokunduğu için ana döngüde, 5 dakikada bir kontrol et
+        scheduler.add_job('theme_auto_switch', 300, self._auto_switch_check,
+                          on_main_loop=True, initial_delay=0)
     
-    def _auto_switch_loop(self):
-        """Otomatik tema değiştirme döngüsü"""
-        while self.auto_switch_enabled:
-            try:
-                now = datetime.now()
-                current_hour = now.hour
-                
-                # 06:00 - 18:00 arası light theme, diğer zamanlarda dark theme
-                if 6 <= current_hour < 18:
-                    self.switch_theme("light")
-                else:
-                    self.switch_theme("dark")
-                    
-                time.sleep(300)  # 5 dakikada bir kontrol et
-            except Exception:
-                time.sleep(300)
+    def disable_auto_switch(self):
+        """Otomatik tema değiştirmeyi kapat"""
+        self.auto_switch_enabled = False
+        if self.scheduler:
+            self.scheduler.remove_job('theme_auto_switch')
+    
+    def _auto_switch_check(self):
+        """Saate göre temayı seç"""
+        try:
+            now = datetime.now()
+            current_hour = now.hour
+            
+            # 06:00 - 18:00 arası light theme, diğer zamanlarda dark theme
+            if 6 <= current_hour < 18:
+                self.switch_theme("light")
+            else:
+                self.switch_theme("dark")
+        except Exception:
+            pass
 
 # =========== KURTARMA SİSTEMİ ===========
 
+class RecoveryCatalog:
+    """Kurtarma noktalarının kalıcı dizini; ada ve zamana göre indeksli SQLite tablosu"""
+    
+    COLUMNS = ('name', 'created', 'expires', 'size', 'point_file', 'config_backup', 'data_backup', 'snapshot')
+    
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.setup_database()
+    
+    def setup_database(self):
+        """Katalog tablosunu kur"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS recovery_points (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                created TEXT NOT NULL,
+                expires TEXT,
+                size INTEGER NOT NULL DEFAULT 0,
+                point_file TEXT NOT NULL UNIQUE,
+                config_backup TEXT,
+                data_backup TEXT,
+                snapshot TEXT
+            )
+        ''')
+        # ISO zaman damgaları sözlük sırasıyla kronolojiktir; aramalar B-ağacı üzerinde O(log n)
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_recovery_points_name ON recovery_points (name, created)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_recovery_points_created ON recovery_points (created)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_recovery_points_expires ON recovery_points (expires)')
+        conn.commit()
+        conn.close()
+    
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+    
+    def _query(self, sql: str, params: tuple = ()) -> List[Dict]:
+        conn = self._connect()
+        try:
+            return [dict(row) for row in conn.execute(sql, params).fetchall()]
+        finally:
+            conn.close()
+    
+    def _execute(self, sql: str, params: tuple = ()) -> int:
+        conn = self._connect()
+        try:
+            cursor = conn.execute(sql, params)
+            conn.commit()
+            return cursor.lastrowid
+        finally:
+            conn.close()
+    
+    def add(self, point: Dict) -> int:
+        """Noktayı kataloğa ekle (aynı dosya ikinci kez eklenmez)"""
+        return self._execute(
+            f"INSERT OR IGNORE INTO recovery_points ({', '.join(self.COLUMNS)}) "
+            f"VALUES ({', '.join('?' for _ in self.COLUMNS)})",
+            tuple(point.get(column) for column in self.COLUMNS))
+    
+    def find(self, name: str = None, at: str = None) -> Optional[Dict]:
+        """name (verilirse) taşıyan, at anında (verilirse) ya da öncesindeki en yeni nokta"""
+        clauses, params = [], []
+        if name:
+            clauses.append("name = ?")
+            params.append(name)
+        if at:
+            clauses.append("created <= ?")
+            params.append(at)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._query(f"SELECT * FROM recovery_points {where} ORDER BY created DESC LIMIT 1", tuple(params))
+        return rows[0] if rows else None
+    
+    def list_points(self, limit: int = 50, before: str = None) -> List[Dict]:
+        """En yeniden eskiye sayfa; sonraki sayfa için son noktanın created değeri before olarak verilir"""
+        if before:
+            return self._query("SELECT * FROM recovery_points WHERE created < ? ORDER BY created DESC LIMIT ?",
+                               (before, limit))
+        return self._query("SELECT * FROM recovery_points ORDER BY created DESC LIMIT ?", (limit,))
+    
+    def has_point_file(self, point_file: str) -> bool:
+        return bool(self._query("SELECT 1 FROM recovery_points WHERE point_file = ?", (point_file,)))
+    
+    def expired(self, now: str) -> List[Dict]:
+        return self._query("SELECT * FROM recovery_points WHERE expires IS NOT NULL AND expires <= ? "
+                           "ORDER BY expires", (now,))
+    
+    def blob_in_use(self, path: str) -> bool:
+        """Paylaşılan içerik dosyasına başka nokta başvuruyor mu"""
+        return bool(self._query("SELECT 1 FROM recovery_points WHERE config_backup = ? OR data_backup = ? LIMIT 1",
+                                (path, path)))
+    
+    def remove(self, point_id: int):
+        self._execute("DELETE FROM recovery_points WHERE id = ?", (point_id,))
+
 class DisasterRecovery:
-    def __init__(self):
-        self.recovery_points = []
-        self.backup_dir = "system_backups"
-        os.makedirs(self.backup_dir, exist_ok=True)
+    # Noktalar bu kadar gün saklanır; en yeni KEEP_MIN nokta süresi dolsa da silinmez
+    RETENTION_DAYS = 30
+    KEEP_MIN = 5
+    # Son açılış noktası bundan yeniyse açılışta yenisi alınmaz
+    INITIAL_POINT_INTERVAL = timedelta(days=1)
+    
+    def __init__(self, mode: str = "snapshot", tracked_paths: List[str] = None,
+                 backup_dir: str = "system_backups", retention_days: int = None):
+        # Açılışta disk işi yapılmaz: dizinler, katalog ve ilk nokta ilk kullanımda ya da arka planda hazırlanır
+        self.backup_dir = backup_dir
+        # snapshot: her kurtarma noktası takip edilen dosyaların hardlink'li görüntüsünü de alır
+        self.mode = mode
+        self.tracked_paths = tracked_paths if tracked_paths is not None else self.default_tracked_paths()
+        self.retention_days = retention_days or self.RETENTION_DAYS
+        self._catalog = None
+        self._snapshotter = None
+        self._init_lock = threading.Lock()
+        # Oluşturma ve süre dolumu sıralanır: temizlik, kataloğa henüz yazılmamış paylaşılan dosyayı silmesin
+        # (oluşturma sonunda süre dolumu da çağrıldığı için yeniden girilebilir kilit)
+        self._point_lock = threading.RLock()
         self.setup_recovery_system()
     
+    @property
+    def catalog(self) -> RecoveryCatalog:
+        with self._init_lock:
+            if self._catalog is None:
+                os.makedirs(self.backup_dir, exist_ok=True)
+                self._catalog = RecoveryCatalog(os.path.join(self.backup_dir, "recovery_catalog.db"))
+            return self._catalog
+    
+    @property
+    def snapshotter(self) -> HardlinkSnapshotter:
+        with self._init_lock:
+            if self._snapshotter is None:
+                self._snapshotter = HardlinkSnapshotter(os.path.join(self.backup_dir, "snapshots"))
+            return self._snapshotter
+    
+    @property
+    def recovery_points(self) -> List[Dict]:
+        """Katalogdaki en yeni noktalar (içerikleri yüklenmez)"""
+        return self.catalog.list_points()
+    
+    @staticmethod
+    def default_tracked_paths() -> List[str]:
+        """Uygulama verisi ve sık değişmeyen sistem yapılandırmaları"""
+        paths = ["security_updates.db"]
+        system = platform.system().lower()
+        if system == 'linux':
+            paths += ['/etc/hosts', '/etc/fstab', os.path.expanduser('~/.bashrc'),
+                      os.path.expanduser('~/.ssh/config')]
+        elif system == 'darwin':
+            paths += ['/etc/hosts', os.path.expanduser('~/.zshrc'), os.path.expanduser('~/.ssh/config')]
+        elif system == 'windows':
+            paths += [os.path.join(os.environ.get('SystemRoot', r'C:\Windows'), 'System32', 'drivers', 'etc', 'hosts')]
+        return paths
+    
     def setup_recovery_system(self):
-        """Kurtarma sistemini kur"""
-        # İlk kurtarma noktasını oluştur
-        self.create_recovery_point("initial_setup")
+        """Kurtarma sistemini arka planda kur (açılışı bekletmez)"""
+        self.setup_thread = threading.Thread(target=self._initialize, name="RecoverySetup", daemon=True)
+        self.setup_thread.start()
+    
+    def _initialize(self):
+        """Eski nokta dosyalarını kataloğa al, süresi dolanları temizle, gerekirse ilk noktayı oluştur"""
+        try:
+            self.import_legacy_points()
+            self.expire_points()
+            latest = self.catalog.find("initial_setup")
+            if not latest or datetime.fromisoformat(latest['created']) < datetime.now() - self.INITIAL_POINT_INTERVAL:
+                self.create_recovery_point("initial_setup")
+        except Exception as e:
+            print(f"Recovery setup failed: {e}")
     
     def create_recovery_point(self, name: str):
         """Kurtarma noktası oluştur"""
+        with self._point_lock:
+            return self._create_recovery_point(name)
+    
+    def _create_recovery_point(self, name: str) -> bool:
         try:
+            created = datetime.now()
             recovery_point = {
                 'name': name,
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': created.isoformat(),
                 'system_state': self.capture_system_state(),
                 'config_backup': self.backup_configuration(),
                 'data_backup': self.backup_essential_data()
             }
+            if self.mode == "snapshot":
+                recovery_point['snapshot'] = self.backup_tracked_files(name)
             
-            self.recovery_points.append(recovery_point)
-            self.save_recovery_point(recovery_point)
+            point_file = self.save_recovery_point(recovery_point)
+            self.catalog.add({
+                'name': name,
+                'created': recovery_point['timestamp'],
+                'expires': (created + timedelta(days=self.retention_days)).isoformat(),
+                'size': self._point_size(point_file, recovery_point),
+                'point_file': point_file,
+                'config_backup': recovery_point['config_backup'],
+                'data_backup': recovery_point['data_backup'],
+                'snapshot': recovery_point.get('snapshot')
+            })
+            self.expire_points()
             return True
-        except Exception:
+        except Exception as e:
+            print(f"Recovery point '{name}' failed: {e}")
             return False
     
+    def _point_size(self, point_file: str, recovery_point: Dict) -> int:
+        """Noktanın diskte kapladığı yer (görüntüde yalnız kopyalanan dosyalar sayılır)"""
+        size = 0
+        for path in (point_file, recovery_point.get('config_backup'), recovery_point.get('data_backup')):
+            if path and os.path.exists(path):
+                size += os.path.getsize(path)
+        if recovery_point.get('snapshot'):
+            manifest = self.snapshotter.load_manifest(recovery_point['snapshot'])
+            if manifest:
+                size += manifest['stats']['copied_bytes']
+        return size
+    
+    def import_legacy_points(self) -> int:
+        """Katalogdan önceki sürümlerin yazdığı recovery_*.json dosyalarını kataloğa ekle"""
+        if not os.path.isdir(self.backup_dir):
+            return 0
+        imported = 0
+        for entry in os.scandir(self.backup_dir):
+            if not (entry.name.startswith("recovery_") and entry.name.endswith(".json")):
+                continue
+            if self.catalog.has_point_file(entry.path):
+                continue
+            try:
+                with open(entry.path, 'r', encoding='utf-8') as f:
+                    recovery_point = json.load(f)
+                self.catalog.add({
+                    'name': recovery_point['name'],
+                    'created': recovery_point['timestamp'],
+                    'expires': (datetime.fromisoformat(recovery_point['timestamp'])
+                                + timedelta(days=self.retention_days)).isoformat(),
+                    'size': self._point_size(entry.path, recovery_point),
+                    'point_file': entry.path,
+                    'config_backup': recovery_point.get('config_backup'),
+                    'data_backup': recovery_point.get('data_backup'),
+                    'snapshot': recovery_point.get('snapshot')
+                })
+                imported += 1
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Skipping unreadable recovery point {entry.path}: {e}")
+        return imported
+    
+    def expire_points(self, now: datetime = None) -> int:
+        """Süresi dolan noktaları ve artık kimsenin kullanmadığı dosyalarını sil"""
+        with self._point_lock:
+            return self._expire_points(now or datetime.now())
+    
+    def _expire_points(self, now: datetime) -> int:
+        keep = {point['id'] for point in self.catalog.list_points(limit=self.KEEP_MIN)}
+        removed = 0
+        for point in self.catalog.expired(now.isoformat()):
+            if point['id'] in keep:
+                continue
+            self.catalog.remove(point['id'])
+            if os.path.exists(point['point_file']):
+                os.remove(point['point_file'])
+            # İçerik adresli dosyalar başka noktalarla paylaşılıyor olabilir
+            for blob in {point['config_backup'], point['data_backup']}:
+                if blob and os.path.exists(blob) and not self.catalog.blob_in_use(blob):
+                    os.remove(blob)
+            if point['snapshot']:
+                self.snapshotter.delete(point['snapshot'])
+            removed += 1
+        return removed
+    
     def capture_system_state(self) -> Dict:
         """Sistem durumunu yakala"""
         return {
@@ -520,11 +770,7 @@ class DisasterRecovery:
             'schedule_config': {}
         }
         
-        backup_file = os.path.join(self.backup_dir, f"config_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
-        with open(backup_file, 'w', encoding='utf-8') as f:
-            json.dump(config_data, f, indent=2)
-        
-        return backup_file
+        return self.store_blob(config_data)
     
     def backup_essential_data(self) -> str:
         """Önemli verileri yedekle"""
@@ -535,148 +781,356 @@ class DisasterRecovery:
             'system_info': PlatformDetector.get_platform_info()
         }
         
-        backup_file = os.path.join(self.backup_dir, f"data_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
-        with open(backup_file, 'w', encoding='utf-8') as f:
-            json.dump(essential_data, f, indent=2)
-        
-        return backup_file
+        return self.store_blob(essential_data)
+    
+    def backup_tracked_files(self, name: str) -> str:
+        """Takip edilen dosyaların hardlink'li görüntüsünü al, görüntü adını döndür"""
+        snapshot_name = f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+        sources = [path for path in self.tracked_paths if os.path.exists(path)]
+        manifest = self.snapshotter.create(snapshot_name, sources)
+        if manifest['stats']['errors']:
+            # Okunamayan dosyalar (ör. yalnız root'a açık) atlanır, görüntünün geri kalanı alınır
+            print(f"Snapshot {snapshot_name}: skipped {manifest['stats']['errors']} unreadable files")
+        return snapshot_name
+    
+    def store_blob(self, data: Dict) -> str:
+        """JSON içeriğini sha256 adıyla bir kez sakla; aynı içerik yeni dosya üretmez"""
+        payload = json.dumps(data, indent=2, sort_keys=True).encode('utf-8')
+        digest = hashlib.sha256(payload).hexdigest()
+        blob_dir = os.path.join(self.backup_dir, "blobs", digest[:2])
+        blob_file = os.path.join(blob_dir, f"{digest}.json")
+        if not os.path.exists(blob_file):
+            os.makedirs(blob_dir, exist_ok=True)
+            temp_file = f"{blob_file}.{os.getpid()}.tmp"
+            with open(temp_file, 'wb') as f:
+                f.write(payload)
+            os.replace(temp_file, blob_file)
+        return blob_file
     
-    def save_recovery_point(self, recovery_point: Dict):
-        """Kurtarma noktasını kaydet"""
-        recovery_file = os.path.join(self.backup_dir, f"recovery_{recovery_point['name']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    def save_recovery_point(self, recovery_point: Dict) -> str:
+        """Kurtarma noktasını kaydet, dosya yolunu döndür"""
+        recovery_file = os.path.join(self.backup_dir, f"recovery_{recovery_point['name']}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.json")
         with open(recovery_file, 'w', encoding='utf-8') as f:
             json.dump(recovery_point, f, indent=2)
+        return recovery_file
     
-    def restore_system(self, recovery_point_name: str) -> bool:
-        """Sistemi kurtarma noktasından geri yükle"""
-        recovery_point = self.find_recovery_point(recovery_point_name)
+    def load_recovery_point(self, point: Dict) -> Optional[Dict]:
+        """Katalog kaydının tam içeriği (sistem durumu vb.) yalnız istendiğinde okunur"""
+        try:
+            with open(point['point_file'], 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def list_recovery_points(self, limit: int = 50, before: str = None) -> List[Dict]:
+        return self.catalog.list_points(limit, before)
+    
+    def restore_system(self, recovery_point_name: str = None, at: str = None) -> bool:
+        """Sistemi kurtarma noktasından geri yükle (ad ve/veya zaman ile; ikisi de yoksa en yeni nokta)"""
+        recovery_point = self.find_recovery_point(recovery_point_name, at)
         if not recovery_point:
             return False
         
         try:
             # Config'leri geri yükle
-            if os.path.exists(recovery_point['config_backup']):
+            if recovery_point['config_backup'] and os.path.exists(recovery_point['config_backup']):
                 with open(recovery_point['config_backup'], 'r', encoding='utf-8') as f:
                     config_data = json.load(f)
                 # Config'leri uygula
                 print(f"Config restored from: {recovery_point['config_backup']}")
             
             # Verileri geri yükle
-            if os.path.exists(recovery_point['data_backup']):
+            if recovery_point['data_backup'] and os.path.exists(recovery_point['data_backup']):
                 with open(recovery_point['data_backup'], 'r', encoding='utf-8') as f:
                     data = json.load(f)
                 # Verileri uygula
-                print(f"Data restored from: {recovery_point['data_backup']")
+                print(f"Data restored from: {recovery_point['data_backup']}")
+            
+            # Dosyalar düz kopyayla yerine döner; değişmemiş olanlara dokunulmaz
+            if recovery_point.get('snapshot'):
+                result = self.snapshotter.restore(recovery_point['snapshot'])
+                print(f"Files restored from snapshot {recovery_point['snapshot']}: "
+                      f"{result['restored']} restored, {result['unchanged']} unchanged")
             
             return True
         except Exception as e:
             print(f"Restore failed: {e}")
             return False
     
-    def find_recovery_point(self, name: str) -> Optional[Dict]:
-        """Kurtarma noktasını bul"""
-        for point in self.recovery_points:
-            if point['name'] == name:
-                return point
-        return None
+    def find_recovery_point(self, name: str = None, at: str = None) -> Optional[Dict]:
+        """Adı taşıyan (verilirse), at anında ya da öncesindeki en yeni noktayı katalogdan bul"""
+        return self.catalog.find(name, at)
+
+# =========== EŞZAMANLILIK KONTROLÜ ===========
+
+class AdmissionController:
+    """CPU, bellek ve PSI sinyallerine göre eşzamanlı güncelleme sınırını AIMD ile ayarlar"""
+    
+    def __init__(self, policies: Dict, min_limit: int = 1, max_limit: int = 5,
+                 decrease_factor: float = 0.5, increase_interval: float = 30.0):
+        self.policies = policies          # PerformanceMonitor.scaling_policies ile ortak
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.increase_interval = increase_interval
+        self.pressure = PressureStallReader()
+        self.active = 0
+        self.decisions = deque(maxlen=100)
+        self._last_change = time.monotonic()
+        self._cond = threading.Condition()
+    
+    @property
+    def limit(self) -> int:
+        return self.policies['max_concurrent_updates']
+    
+    def __enter__(self):
+        """Sınır altına düşene kadar bekle, sonra bir yer ayır"""
+        with self._cond:
+            while self.active >= self.limit:
+                self._cond.wait()
+            self.active += 1
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        with self._cond:
+            self.active -= 1
+            self._cond.notify_all()
+        return False
+    
+    def evaluate(self, cpu: float, memory: float):
+        """Son ölçümlere göre sınırı azalt (çarpımsal) ya da artır (toplamsal)"""
+        psi = self.pressure.some_avg10()
+        psi_threshold = self.policies['psi_threshold']
+        
+        reasons = []
+        if cpu > self.policies['cpu_threshold']:
+            reasons.append(f"cpu {cpu:.0f}% > {self.policies['cpu_threshold']:.0f}%")
+        if memory > self.policies['memory_threshold']:
+            reasons.append(f"memory {memory:.0f}% > {self.policies['memory_threshold']:.0f}%")
+        for resource, value in psi.items():
+            if value > psi_threshold:
+                reasons.append(f"psi {resource} some avg10 {value:.1f} > {psi_threshold:.1f}")
+        
+        if reasons:
+            self.scale_down(", ".join(reasons))
+        elif (cpu < self.policies['idle_cpu_threshold']
+              and memory < self.policies['memory_threshold'] - 10
+              and all(value < psi_threshold / 2 for value in psi.values())
+              and time.monotonic() - self._last_change >= self.increase_interval):
+            psi_text = "".join(f", psi {resource} {value:.1f}" for resource, value in psi.items())
+            self.scale_up(f"idle: cpu {cpu:.0f}%, memory {memory:.0f}%{psi_text}")
+    
+    def scale_down(self, reason: str):
+        """Baskı altında sınırı çarpımsal azalt"""
+        self._set_limit(max(self.min_limit, int(self.limit * self.decrease_factor)), reason)
+    
+    def scale_up(self, reason: str):
+        """Boşta sınırı bir artır"""
+        self._set_limit(min(self.max_limit, self.limit + 1), reason)
+    
+    def _set_limit(self, new_limit: int, reason: str):
+        with self._cond:
+            old_limit = self.limit
+            if new_limit == old_limit:
+                return
+            self.policies['max_concurrent_updates'] = new_limit
+            self._last_change = time.monotonic()
+            self.decisions.append({
+                'timestamp': datetime.now().isoformat(),
+                'old_limit': old_limit,
+                'new_limit': new_limit,
+                'active': self.active,
+                'reason': reason
+            })
+            # Artışta bekleyenler hemen başlayabilir
+            self._cond.notify_all()
+        
+        direction = "up" if new_limit > old_limit else "down"
+        print(f"Scaling {direction}: max_concurrent_updates {old_limit} -> {new_limit} ({reason})")
+    
+    def close(self):
+        """PSI dosyalarını kapat"""
+        self.pressure.close()
 
 # =========== PERFORMANS İZLEME ===========
 
 class PerformanceMonitor:
-    def __init__(self):
-        self.metrics = {
-            'cpu_usage': [],
-            'memory_usage': [],
-            'disk_io': [],
-            'network_io': [],
-            'execution_times': []
-        }
+    # Metrik başına tutulacak örnek sayısı (5 sn aralıkla 720 örnek = 1 saat)
+    DEFAULT_RETENTION = {
+        'cpu_usage': 720,
+        'memory_usage': 720,
+        'sample_wall_seconds': 720,   # izleyicinin kendi maliyeti
+        'sample_cpu_seconds': 720,
+        'execution_times': 500
+    }
+    
+    def __init__(self, interval: float = 5, retention: Dict[str, int] = None,
+                 io_retention: int = 720, active_interval: float = 1.0,
+                 use_proc_sampler: bool = True):
+        self.interval = interval                  # boştayken örnekleme aralığı
+        self.active_interval = active_interval    # güncelleme sürerken örnekleme aralığı
+        self.current_interval = interval
+        self.samples_taken = 0
+        self.scheduler = None
+        self.retention = dict(self.DEFAULT_RETENTION, **(retention or {}))
+        self.metrics = {key: MetricRing(size) for key, size in self.retention.items()}
+        self.io_rates = IORateTracker(io_retention)
+        self.sampler = self._create_sampler() if use_proc_sampler else None
         self.scaling_policies = {
             'cpu_threshold': 80.0,
             'memory_threshold': 85.0,
+            'psi_threshold': 10.0,        # PSI 'some' avg10 yüzdesi
+            'idle_cpu_threshold': 20.0,
             'max_concurrent_updates': 3
         }
+        self.admission = AdmissionController(self.scaling_policies)
         self.monitoring = False
     
-    def start_monitoring(self):
-        """Performans izlemeyi başlat"""
+    @staticmethod
+    def _create_sampler() -> Optional[ProcSampler]:
+        """Linux'ta psutil yerine doğrudan /proc okuyan örnekleyici"""
+        if not ProcSampler.available():
+            return None
+        try:
+            return ProcSampler()
+        except OSError:
+            return None
+    
+    def start_monitoring(self, scheduler):
+        """Performans izlemeyi ortak zamanlayıcıda başlat"""
         self.monitoring = True
-        self.monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
-        self.monitor_thread.start()
+        self.scheduler = scheduler
+        
+        # İlk çağrı referans noktası; sonraki ölçümler bloklamadan farkı verir
+        if self.sampler:
+            self.sampler.cpu_percent()
+        else:
+            psutil.cpu_percent(interval=None)
+        self.current_interval = self.interval
+        scheduler.add_job('performance_monitor', self.interval, self._collect_sample)
     
     def stop_monitoring(self):
         """İzlemeyi durdur"""
         self.monitoring = False
+        if self.scheduler:
+            self.scheduler.remove_job('performance_monitor')
     
-    def _monitor_loop(self):
-        """İzleme döngüsü"""
-        while self.monitoring:
-            try:
-                # CPU kullanımı
-                cpu_percent = psutil.cpu_percent(interval=1)
-                self.metrics['cpu_usage'].append(cpu_percent)
-                
-                # Bellek kullanımı
-                memory = psutil.virtual_memory()
-                self.metrics['memory_usage'].append(memory.percent)
-                
-                # Disk I/O
-                disk_io = psutil.disk_io_counters()
-                if disk_io:
-                    self.metrics['disk_io'].append({
-                        'read_bytes': disk_io.read_bytes,
-                        'write_bytes': disk_io.write_bytes
-                    })
-                
-                # Son 100 kaydı tut
-                for key in ['cpu_usage', 'memory_usage']:
-                    self.metrics[key] = self.metrics[key][-100:]
-                
-                # Auto-scale kontrolü
-                self.auto_scale()
-                
-            except Exception as e:
-                print(f"Monitoring error: {e}")
+    def close(self):
+        """İzlemeyi durdur ve açık /proc dosyalarını kapat"""
+        self.stop_monitoring()
+        self.admission.close()
+        sampler, self.sampler = self.sampler, None
+        if sampler:
+            sampler.close()
+    
+    def _collect_sample(self):
+        """Tek ölçüm turu (izleyicinin kendi maliyeti de ölçülür)"""
+        try:
+            started_wall = time.perf_counter()
+            started_cpu = time.thread_time()
+            
+            # CPU ve bellek kullanımı (son ölçümden beri)
+            if self.sampler:
+                cpu_percent = self.sampler.cpu_percent()
+                memory_percent = self.sampler.memory_percent()
+            else:
+                cpu_percent = psutil.cpu_percent(interval=None)
+                memory_percent = psutil.virtual_memory().percent
+            self.metrics['cpu_usage'].append(cpu_percent)
+            self.metrics['memory_usage'].append(memory_percent)
+            
+            # Disk ve ağ G/Ç hızları
+            self._collect_io()
             
-            time.sleep(5)
+            self.metrics['sample_wall_seconds'].append(time.perf_counter() - started_wall)
+            self.metrics['sample_cpu_seconds'].append(time.thread_time() - started_cpu)
+            self.samples_taken += 1
+            
+            # Auto-scale kontrolü
+            self.auto_scale()
+            
+        except Exception as e:
+            print(f"Monitoring error: {e}")
+    
+    def _collect_io(self):
+        """Aygıt ve arayüz başına G/Ç sayaçlarını hız serilerine işle"""
+        if self.sampler:
+            disks, disk_total = self.sampler.read_disks()
+            self.io_rates.update(disks, self.sampler.read_network(), disk_total=disk_total)
+        else:
+            self.io_rates.update(psutil.disk_io_counters(perdisk=True),
+                                 psutil.net_io_counters(pernic=True),
+                                 disk_total=psutil.disk_io_counters())
+    
+    def _set_cadence(self, interval: float):
+        """Örnekleme aralığını değiştir (aynı isimli iş yenisiyle değişir)"""
+        self.current_interval = interval
+        if self.monitoring and self.scheduler:
+            self.scheduler.add_job('performance_monitor', interval, self._collect_sample)
+    
+    def begin_session(self, session_id):
+        """Güncelleme oturumu boyunca G/Ç aktarımını say ve sık örnekle"""
+        self._collect_io()
+        self.io_rates.begin_session(session_id)
+        self._set_cadence(self.active_interval)
+    
+    def end_session(self) -> Optional[Dict]:
+        """Oturumu kapat, boştaki aralığa dön, ortalama disk/ağ aktarımını döndür"""
+        self._set_cadence(self.interval)
+        self._collect_io()
+        return self.io_rates.end_session()
     
     def auto_scale(self):
         """Otomatik ölçeklendirme"""
         if len(self.metrics['cpu_usage']) < 5:
             return
         
-        avg_cpu = sum(self.metrics['cpu_usage'][-5:]) / 5
-        avg_memory = sum(self.metrics['memory_usage'][-5:]) / 5
+        avg_cpu = self.metrics['cpu_usage'].mean(5)
+        avg_memory = self.metrics['memory_usage'].mean(5)
         
-        # CPU threshold'ları
-        if avg_cpu > self.scaling_policies['cpu_threshold']:
-            self.scale_down_operations()
-        elif avg_cpu < 20:
-            self.scale_up_operations()
+        # Kabul denetleyicisi CPU, bellek ve PSI'ye göre sınırı ayarlar
+        self.admission.evaluate(avg_cpu, avg_memory)
     
-    def scale_down_operations(self):
+    def scale_down_operations(self, reason: str = "manual"):
         """Operasyonları ölçeklendir (aşağı)"""
-        # Daha az eşzamanlı güncelleme
-        self.scaling_policies['max_concurrent_updates'] = max(1, self.scaling_policies['max_concurrent_updates'] - 1)
-        print(f"Scaling down: max_concurrent_updates = {self.scaling_policies['max_concurrent_updates']}")
+        self.admission.scale_down(reason)
     
-    def scale_up_operations(self):
+    def scale_up_operations(self, reason: str = "manual"):
         """Operasyonları ölçeklendir (yukarı)"""
-        # Daha fazla eşzamanlı güncelleme
-        self.scaling_policies['max_concurrent_updates'] = min(5, self.scaling_policies['max_concurrent_updates'] + 1)
-        print(f"Scaling up: max_concurrent_updates = {self.scaling_policies['max_concurrent_updates']}")
+        self.admission.scale_up(reason)
     
-    def get_performance_report(self) -> Dict:
-        """Performans raporu oluştur"""
-        cpu_avg = sum(self.metrics['cpu_usage'][-10:]) / len(self.metrics['cpu_usage'][-10:]) if self.metrics['cpu_usage'] else 0
-        memory_avg = sum(self.metrics['memory_usage'][-10:]) / len(self.metrics['memory_usage'][-10:]) if self.metrics['memory_usage'] else 0
+    def record_execution_time(self, seconds: float):
+        """Komut çalışma süresini kaydet"""
+        self.metrics['execution_times'].append(seconds)
+    
+    def get_performance_report(self, window: int = 10) -> Dict:
+        """Performans raporu oluştur (son window örnek üzerinden)"""
+        cpu = self.metrics['cpu_usage'].summary(window)
+        memory = self.metrics['memory_usage'].summary(window)
         
         return {
             'timestamp': datetime.now().isoformat(),
-            'cpu_usage': cpu_avg,
-            'memory_usage': memory_avg,
+            'cpu_usage': cpu['mean'],
+            'memory_usage': memory['mean'],
+            'cpu': cpu,
+            'memory': memory,
+            'execution_times': self.metrics['execution_times'].summary(),
+            'io': self.io_rates.report(window),
+            'sampler': {
+                'source': 'proc' if self.sampler else 'psutil',
+                'interval': self.current_interval,
+                'samples': self.samples_taken,
+                'wall_seconds': self.metrics['sample_wall_seconds'].summary(window),
+                'cpu_seconds': self.metrics['sample_cpu_seconds'].summary(window)
+            },
             'system_load': os.getloadavg() if hasattr(os, 'getloadavg') else [0, 0, 0],
-            'scaling_policy': self.scaling_policies
+            'scaling_policy': self.scaling_policies,
+            'admission': {
+                'active': self.admission.active,
+                'limit': self.admission.limit,
+                'psi': self.admission.pressure.some_avg10(),
+                'last_decision': self.admission.decisions[-1] if self.admission.decisions else None
+            }
         }
 
 # =========== GÜNCELLENMİŞ ANA UYGULAMA ===========
@@ -693,6 +1147,7 @@ class AdvancedUniversalUpdaterApp(ctk.CTk):
         self.theme_manager = ThemeManager()
         self.disaster_recovery = DisasterRecovery()
         self.performance_monitor = PerformanceMonitor()
+        self.pressure_gate = PressureStallGate(reader=self.performance_monitor.admission.pressure)
         
         # Orijinal manager'lar
         self.platform_info = PlatformDetector.get_platform_info()
@@ -702,6 +1157,18 @@ class AdvancedUniversalUpdaterApp(ctk.CTk):
         # GUI ayarları
         self.setup_advanced_gui()
         
+        # Worker thread olaylarını ana döngüde işle
+        self.ui_queue = UIEventQueue(self)
+        self.ui_queue.bind(self._apply_progress, self._append_output)
+        self.ui_queue.start()
+        
+        # Tüm periyodik işler için ortak zamanlayıcı
+        self.task_scheduler = TaskScheduler(self.ui_queue)
+        self.task_scheduler.start()
+        
+        # Pencere kapatılınca açık dosyalar ve zamanlayıcı temizlenir
+        self.protocol("WM_DELETE_WINDOW", self.cleanup_and_exit)
+        
         # Sistemleri başlat
         self.start_advanced_systems()
     
@@ -868,49 +1335,47 @@ class AdvancedUniversalUpdaterApp(ctk.CTk):
         self.update_btn.pack(pady=10)
         
         # Çıktı alanı
-        self.output_text = ctk.CTkTextbox(parent, width=560, height=150)
+        self.output_text = BoundedOutputView(parent, width=560, height=150)
         self.output_text.pack(pady=10, fill="x", padx=20)
-        self.output_text.insert("1.0", "Güvenli güncelleme detayları burada görünecek...\n")
-        self.output_text.configure(state="disabled")
+        self.output_text.append("Güvenli güncelleme detayları burada görünecek...\n")
     
     def start_advanced_systems(self):
         """Gelişmiş sistemleri başlat"""
         # Performans izlemeyi başlat
-        self.performance_monitor.start_monitoring()
+        self.performance_monitor.start_monitoring(self.task_scheduler)
         
         # Durum güncelleme döngüsünü başlat
         self.start_advanced_status_updater()
         
-        # Güvenlik taraması
-        threading.Thread(target=self.initial_security_scan, daemon=True).start()
+        # Güvenlik taraması (uygulama başladıktan 5 sn sonra)
+        self.task_scheduler.call_later('initial_security_scan', 5, self.initial_security_scan)
     
     def start_advanced_status_updater(self):
         """Gelişmiş durum güncelleyici"""
-        def update_loop():
-            while True:
-                try:
-                    # Performans metriklerini güncelle
-                    report = self.performance_monitor.get_performance_report()
-                    
-                    self.cpu_label.configure(text=f"CPU: {report['cpu_usage']:.1f}%")
-                    self.memory_label.configure(text=f"RAM: {report['memory_usage']:.1f}%")
-                    
-                    # Performans durumu
-                    if report['cpu_usage'] > 80:
-                        status = "⚠️ Yüksek Yük"
-                    elif report['cpu_usage'] > 60:
-                        status = "🔶 Orta Yük"
-                    else:
-                        status = "✅ Normal"
-                    
-                    self.performance_label.configure(text=f"Performans: {status}")
-                    
-                except Exception as e:
-                    print(f"Status update error: {e}")
-                
-                time.sleep(3)
-        
-        threading.Thread(target=update_loop, daemon=True).start()
+        self.task_scheduler.add_job('advanced_status_updater', 3, self.refresh_advanced_status,
+                                    on_main_loop=True)
+    
+    def refresh_advanced_status(self):
+        """Durum göstergelerini yenile (ana döngüde çalışır)"""
+        try:
+            # Performans metriklerini güncelle
+            report = self.performance_monitor.get_performance_report()
+            
+            self.cpu_label.configure(text=f"CPU: {report['cpu_usage']:.1f}%")
+            self.memory_label.configure(text=f"RAM: {report['memory_usage']:.1f}%")
+            
+            # Performans durumu
+            if report['cpu_usage'] > 80:
+                status = "⚠️ Yüksek Yük"
+            elif report['cpu_usage'] > 60:
+                status = "🔶 Orta Yük"
+            else:
+                status = "✅ Normal"
+            
+            self.performance_label.configure(text=f"Performans: {status}")
+            
+        except Exception as e:
+            print(f"Status update error: {e}")
     
     def start_secure_update(self):
         """Güvenli güncelleme başlat"""
@@ -927,12 +1392,10 @@ class AdvancedUniversalUpdaterApp(ctk.CTk):
         self.status_label.configure(text="Güvenli güncelleme başlatılıyor...")
         self.update_btn.configure(state="disabled")
         
-        self.output_text.configure(state="normal")
-        self.output_text.delete("1.0", "end")
-        self.output_text.insert("end", "🔒 GÜVENLİ GÜNCELLEME BAŞLATILDI\n")
-        self.output_text.insert("end", "• Komut güvenlik kontrolü: ✅\n")
-        self.output_text.insert("end", "• Sistem izolasyonu: ✅\n")
-        self.output_text.configure(state="disabled")
+        self.output_text.clear()
+        self.output_text.append("🔒 GÜVENLİ GÜNCELLEME BAŞLATILDI\n"
+                                "• Komut güvenlik kontrolü: ✅\n"
+                                "• Sistem izolasyonu: ✅\n")
         
         # Bildirim gönder
         self.notification_manager.send_notification(
@@ -952,37 +1415,75 @@ class AdvancedUniversalUpdaterApp(ctk.CTk):
         
         if not managers:
             error_msg = "❌ Paket yöneticisi bulunamadı"
-            self.notification_manager.send_notification("Güncelleme Hatası", error_msg, "critical")
+            self.notify_from_worker("Güncelleme Hatası", error_msg, "critical")
             self.update_done(error_msg, [])
             return
         
         total_commands = sum(len(mgr['commands']) for mgr in managers.values())
-        completed = 0
-        success_count = 0
+        admission = self.performance_monitor.admission
+        state = {'completed': 0, 'success': 0}
+        state_lock = threading.Lock()
         details = []
         
-        for manager_id, manager_info in managers.items():
-            for command in manager_info['commands']:
-                completed += 1
-                progress = (completed / total_commands) * 100
-                
-                self.update_progress(progress, f"{manager_info['name']} - {command[0]}")
-                
-                # Güvenli komut çalıştırma
-                result = self.security_hardening.secure_command_execution(command)
-                
-                if result['success']:
-                    success_count += 1
-                    details.append(f"✅ {manager_info['name']} - Başarılı")
-                else:
-                    details.append(f"❌ {manager_info['name']} - Hata: {result['error']}")
-                
-                time.sleep(1)
+        def run_manager(manager_info):
+            # Her yönetici kabul denetiminden geçerek başlar; kendi komutları sırayla çalışır
+            with admission:
+                for command in manager_info['commands']:
+                    with state_lock:
+                        state['completed'] += 1
+                        progress = (state['completed'] / total_commands) * 100
+                    
+                    self.update_progress(progress, f"{manager_info['name']} - {command[0]}")
+                    
+                    # Sistem baskı altındaysa komut çekişme geçene kadar bekler
+                    deferral = self.pressure_gate.wait(on_defer=lambda reasons: self.update_progress(
+                        progress, f"⏸️ Sistem baskı altında, bekleniyor: {', '.join(reasons)}"))
+                    # Beklemeler oturum özetine nedeniyle birlikte yazılır
+                    if deferral['deferred_seconds']:
+                        details.append(f"⏸️ {manager_info['name']} - {deferral['deferred_seconds']:.0f}s beklendi "
+                                       f"({', '.join(deferral['reasons'])})")
+                    if not deferral['proceed']:
+                        details.append(f"⏸️ {manager_info['name']} - İptal: baskı sürüyor "
+                                       f"({', '.join(deferral['reasons'])})")
+                        break
+                    
+                    # Güvenli komut çalıştırma
+                    started = time.monotonic()
+                    result = self.security_hardening.secure_command_execution(command)
+                    self.performance_monitor.record_execution_time(time.monotonic() - started)
+                    
+                    if result['success']:
+                        with state_lock:
+                            state['success'] += 1
+                        details.append(f"✅ {manager_info['name']} - Başarılı")
+                    else:
+                        details.append(f"❌ {manager_info['name']} - Hata: {result['error']}")
+        
+        self.performance_monitor.begin_session(datetime.now().isoformat())
+        
+        # Eşzamanlılığı havuz değil kabul denetleyicisinin o anki sınırı belirler
+        with ThreadPoolExecutor(max_workers=admission.max_limit) as executor:
+            for future in [executor.submit(run_manager, info) for info in managers.values()]:
+                try:
+                    future.result()
+                except Exception as e:
+                    details.append(f"⚠️ Hata: {e}")
+        
+        success_count = state['success']
+        
+        # Oturum boyunca disk mi ağ mı baskındı
+        throughput = self.performance_monitor.end_session()
+        if throughput:
+            details.append(
+                f"📶 Disk: {self._format_rate(throughput['disk_read_bytes_per_s'])} okuma, "
+                f"{self._format_rate(throughput['disk_write_bytes_per_s'])} yazma | "
+                f"Ağ: {self._format_rate(throughput['net_bytes_recv_per_s'])} indirme"
+            )
         
         summary = f"🎉 Güvenli güncelleme tamamlandı! {success_count}/{total_commands} başarılı"
         
         # Bildirim gönder
-        self.notification_manager.send_notification(
+        self.notify_from_worker(
             "Güncelleme Tamamlandı",
             f"{success_count}/{total_commands} işlem başarılı",
             "normal" if success_count == total_commands else "warning"
@@ -990,31 +1491,38 @@ class AdvancedUniversalUpdaterApp(ctk.CTk):
         
         self.update_done(summary, details)
     
+    def notify_from_worker(self, title: str, message: str, priority: str = "normal"):
+        """Worker thread'den bildirim; messagebox ana döngüde açılır"""
+        self.ui_queue.call(self.notification_manager.send_notification, title, message, priority)
+    
     def update_progress(self, percent, detail):
-        """İlerlemeyi güncelle"""
+        """İlerlemeyi güncelle (worker thread'den güvenle çağrılabilir)"""
+        self.ui_queue.post_progress(percent)
+        self.ui_queue.post_text(f"⏳ {detail}\n")
+    
+    def _apply_progress(self, percent):
+        """Birleştirilmiş ilerlemeyi çiz"""
         self.progress.set(percent / 100)
         self.status_label.configure(text=f"Güvenli güncelleme... %{int(percent)}")
-        
-        self.output_text.configure(state="normal")
-        self.output_text.insert("end", f"⏳ {detail}\n")
-        self.output_text.see("end")
-        self.output_text.configure(state="disabled")
+    
+    def _append_output(self, text):
+        """Karede biriken çıktıyı tek seferde ekle"""
+        self.output_text.append(text)
     
     def update_done(self, message, details):
-        """Güncelleme tamamlandı"""
+        """Güncelleme tamamlandı (worker thread'den çağrılır)"""
+        self.ui_queue.call(self._finish_update, message, details)
+        
+        # Kurtarma noktası oluştur
+        self.disaster_recovery.create_recovery_point("post_update")
+    
+    def _finish_update(self, message, details):
+        """Tamamlanma durumunu ana döngüde çiz"""
         self.progress.set(1.0)
         self.status_label.configure(text="Güvenli güncelleme tamamlandı!")
         self.update_btn.configure(state="normal")
         
-        self.output_text.configure(state="normal")
-        self.output_text.insert("end", f"\n🎉 {message}\n")
-        for detail in details:
-            self.output_text.insert("end", f"• {detail}\n")
-        self.output_text.see("end")
-        self.output_text.configure(state="disabled")
-        
-        # Kurtarma noktası oluştur
-        self.disaster_recovery.create_recovery_point("post_update")
+        self.output_text.append(f"\n🎉 {message}\n" + "".join(f"• {detail}\n" for detail in details))
     
     # Gelişmiş metodlar
     def start_security_scan(self):
@@ -1030,13 +1538,13 @@ class AdvancedUniversalUpdaterApp(ctk.CTk):
             
             if vulnerabilities:
                 message = f"{len(vulnerabilities)} güvenlik açığı bulundu"
-                self.notification_manager.send_notification(
+                self.notify_from_worker(
                     "Güvenlik Uyarısı",
                     message,
                     "critical"
                 )
             else:
-                self.notification_manager.send_notification(
+                self.notify_from_worker(
                     "Güvenlik Taraması",
                     "Güvenlik taraması temiz",
                     "normal"
@@ -1075,16 +1583,41 @@ class AdvancedUniversalUpdaterApp(ctk.CTk):
                 "warning"
             )
     
+    def restore_system(self):
+        """En yeni kurtarma noktasına geri dön"""
+        point = self.disaster_recovery.find_recovery_point()
+        if not point:
+            messagebox.showinfo("Sistemi Geri Yükle", "Henüz kurtarma noktası yok")
+            return
+        created = datetime.fromisoformat(point['created']).strftime('%d.%m.%Y %H:%M')
+        if not messagebox.askyesno("Sistemi Geri Yükle", f"'{point['name']}' ({created}) noktasına geri dönülsün mü?"):
+            return
+        
+        def worker():
+            if self.disaster_recovery.restore_system(point['name'], at=point['created']):
+                self.notify_from_worker("Geri Yükleme", f"Sistem {created} tarihli noktaya geri yüklendi", "normal")
+            else:
+                self.notify_from_worker("Geri Yükleme Hatası", "Sistem geri yüklenemedi", "warning")
+        
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def show_recovery_history(self):
+        """Son kurtarma noktalarını listele (nokta içerikleri okunmaz)"""
+        lines = []
+        for point in self.disaster_recovery.list_recovery_points(limit=20):
+            created = datetime.fromisoformat(point['created']).strftime('%d.%m.%Y %H:%M')
+            lines.append(f"{created}  {point['name']}  ({point['size'] / 1024:.0f} KB)")
+        messagebox.showinfo("Kurtarma Geçmişi", "\n".join(lines) or "Henüz kurtarma noktası yok")
+    
     def toggle_auto_theme(self):
         """Otomatik tema değiştirmeyi aç/kapat"""
         if self.auto_theme_var.get():
-            self.theme_manager.enable_auto_switch()
+            self.theme_manager.enable_auto_switch(self.task_scheduler)
         else:
-            self.theme_manager.auto_switch_enabled = False
+            self.theme_manager.disable_auto_switch()
     
     def initial_security_scan(self):
         """İlk güvenlik taraması"""
-        time.sleep(5)  # Uygulama başladıktan sonra
         self.security_manager.vulnerability_scan()
     
     def quick_security_scan(self):
@@ -1098,16 +1631,64 @@ class AdvancedUniversalUpdaterApp(ctk.CTk):
     def show_performance(self):
         """Performans bilgilerini göster"""
         report = self.performance_monitor.get_performance_report()
+        disk = report['io']['disk'].get('total', {})
+        net = report['io']['net'].get('total', {})
+        
+        io_lines = ""
+        if disk:
+            io_lines += (f"Disk: {self._format_rate(disk['read_bps']['mean'])} okuma, "
+                         f"{self._format_rate(disk['write_bps']['mean'])} yazma "
+                         f"({disk['read_iops']['mean'] + disk['write_iops']['mean']:.0f} IOPS)\n")
+        if net:
+            io_lines += (f"Ağ: {self._format_rate(net['recv_bps']['mean'])} indirme, "
+                         f"{self._format_rate(net['sent_bps']['mean'])} gönderme "
+                         f"(p95 indirme: {self._format_rate(net['recv_bps']['p95'])})\n")
+        
+        last_session = report['io']['last_session']
+        if last_session:
+            session_disk = last_session['disk_read_bytes_per_s'] + last_session['disk_write_bytes_per_s']
+            io_lines += (f"Son güncelleme: disk {self._format_rate(session_disk)}, "
+                         f"ağ {self._format_rate(last_session['net_bytes_recv_per_s'])}\n")
+        
         messagebox.showinfo(
             "Sistem Performansı",
             f"CPU: {report['cpu_usage']:.1f}%\n"
             f"RAM: {report['memory_usage']:.1f}%\n"
-            f"Eşzamanlı Güncelleme: {report['scaling_policy']['max_concurrent_updates']}"
+            f"CPU p95 / maks: {report['cpu']['p95']:.1f}% / {report['cpu']['max']:.1f}%\n"
+            f"{io_lines}"
+            f"İzleme maliyeti: {report['sampler']['wall_seconds']['mean'] * 1000:.2f} ms/örnek "
+            f"({report['sampler']['source']}, {report['sampler']['interval']:g} sn aralık)\n"
+            f"Eşzamanlı Güncelleme: {report['admission']['active']}/{report['admission']['limit']}\n"
+            f"Son ayar: {self._format_decision(report['admission']['last_decision'])}"
         )
     
+    @staticmethod
+    def _format_decision(decision: Optional[Dict]) -> str:
+        """Son eşzamanlılık kararını tek satır olarak göster"""
+        if not decision:
+            return "yok"
+        timestamp = datetime.fromisoformat(decision['timestamp']).strftime('%H:%M:%S')
+        return f"{timestamp} {decision['old_limit']} → {decision['new_limit']} ({decision['reason']})"
+    
+    @staticmethod
+    def _format_rate(bytes_per_second: float) -> str:
+        """Bayt/s değerini okunabilir birime çevir"""
+        for unit in ('B/s', 'KB/s', 'MB/s'):
+            if bytes_per_second < 1024:
+                return f"{bytes_per_second:.1f} {unit}"
+            bytes_per_second /= 1024
+        return f"{bytes_per_second:.1f} GB/s"
+    
     def show_system_details(self):
         """Sistem detaylarını göster"""
         PlatformSpecificUI.show_details(self)
+    
+    def cleanup_and_exit(self):
+        """Temizlik ve çıkış"""
+        self.performance_monitor.close()
+        self.task_scheduler.stop()
+        self.ui_queue.stop()
+        self.destroy()
 
 # =========== UYGULAMAYI BAŞLAT ===========
 
@@ -7,6 +7,7 @@ import time
 from datetime import datetime
 import customtkinter as ctk
 from tkinter import messagebox
+from updater_core import UIEventQueue
 
 # ---------- Ayarlar ----------
 ctk.set_appearance_mode("system")
@@ -156,6 +157,11 @@ class UpdaterApp(ctk.CTk):
                                      font=("Arial", 12))
         self.quit_btn.pack(pady=10)
 
+        # Worker thread olayları ana döngüde işlenir; karedeki ilerlemeler birleştirilir
+        self.ui_queue = UIEventQueue(self)
+        self.ui_queue.bind(self.apply_progress)
+        self.ui_queue.start()
+
     def start_update(self):
         self.progress.set(0)
         self.status_label.configure(text="Güncelleme başlatılıyor...")
@@ -170,11 +176,17 @@ class UpdaterApp(ctk.CTk):
         run_updates(self.update_progress, self.update_done)
 
     def update_progress(self, percent, detail):
+        self.ui_queue.post_progress(percent, detail)
+
+    def apply_progress(self, percent, detail):
         self.progress.set(percent / 100)
         self.status_label.configure(text=f"Güncelleniyor... %{int(percent)}")
         self.detail_label.configure(text=detail)
 
     def update_done(self, result):
+        self.ui_queue.call(self.finish_update, result)
+
+    def finish_update(self, result):
         self.progress.set(1.0)
         self.status_label.configure(text="Güncelleme tamamlandı!")
         self.update_btn.configure(state="normal")
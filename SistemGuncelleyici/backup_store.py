@@ -0,0 +1,564 @@
+"""
+Yedek depolama
+Dosya tarama, paralel zip yazıcı, içerik adresli parça deposu ve hardlink anlık görüntüleri; yalnız standart kütüphaneye dayanır
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# ---------- Yedek Dosya Tarama ----------
+def scan_files(paths: List[str]):
+    """Dosya ve dizinleri os.scandir ile özyinelemeli gez; (mutlak yol, stat) üret. Sıra sabittir, sembolik bağlar izlenmez"""
+    for path in paths:
+        path = os.path.abspath(path)
+        if os.path.islink(path):
+            continue
+        if os.path.isfile(path):
+            try:
+                yield path, os.stat(path)
+            except OSError as e:
+                logging.warning(f"Backup skipped {path}: {e}")
+            continue
+        
+        stack = [path] if os.path.isdir(path) else []
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as iterator:
+                    entries = sorted(iterator, key=lambda entry: entry.name)
+            except OSError as e:
+                logging.warning(f"Backup skipped {directory}: {e}")
+                continue
+            subdirectories = []
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirectories.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        # Windows'ta stat dizin listesinden gelir, ek sistem çağrısı yapılmaz
+                        yield entry.path, entry.stat(follow_symlinks=False)
+                except OSError as e:
+                    logging.warning(f"Backup skipped {entry.path}: {e}")
+            stack.extend(reversed(subdirectories))
+
+def archive_name(path: str) -> str:
+    """Mutlak yolu çakışmayan arşiv adına çevir (/etc/hosts -> etc/hosts, C:\\Users\\a -> C/Users/a)"""
+    drive, tail = os.path.splitdrive(os.path.abspath(path))
+    parts = [drive.strip(':\\/')] if drive else []
+    parts.extend(part for part in tail.replace('\\', '/').split('/') if part)
+    return '/'.join(parts)
+
+# ---------- Hardlink Anlık Görüntüleri ----------
+class HardlinkSnapshotter:
+    """rsync --link-dest gibi: değişmeyen dosyalar önceki görüntüden hardlink'lenir, yalnız değişenler kopyalanır"""
+    
+    MANIFEST_NAME = ".snapshot.json"
+    
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.Lock()
+        
+    def snapshot_path(self, name: str) -> str:
+        return os.path.join(self.root, name)
+        
+    def load_manifest(self, name: str) -> Optional[Dict]:
+        try:
+            with open(os.path.join(self.snapshot_path(name), self.MANIFEST_NAME), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+    def list_snapshots(self) -> List[str]:
+        """Tamamlanmış görüntüler (eskiden yeniye); yarım kalanların manifesti yoktur"""
+        snapshots = []
+        for entry in os.scandir(self.root):
+            if entry.is_dir() and os.path.exists(os.path.join(entry.path, self.MANIFEST_NAME)):
+                snapshots.append((os.path.getmtime(os.path.join(entry.path, self.MANIFEST_NAME)), entry.name))
+        return [name for _, name in sorted(snapshots)]
+        
+    @staticmethod
+    def _link(source: str, destination: str) -> bool:
+        # Farklı disk, hardlink desteklemeyen dosya sistemi ya da bağ sınırı: kopyaya düşülür
+        try:
+            os.link(source, destination)
+            return True
+        except OSError:
+            return False
+        
+    def create(self, name: str, paths: List[str], progress=None) -> Dict:
+        """Yeni görüntü al; süre ve disk kullanımı yalnız değişen dosyalarla orantılıdır"""
+        started = time.perf_counter()
+        with self._lock:
+            snapshots = self.list_snapshots()
+            previous_name = snapshots[-1] if snapshots else None
+            previous = self.load_manifest(previous_name) if previous_name else None
+            previous_files = previous['files'] if previous else {}
+            
+            target = self.snapshot_path(name)
+            partial = target + ".partial"
+            if os.path.exists(partial):
+                shutil.rmtree(partial)
+            os.makedirs(partial)
+            
+            stats = {'files': 0, 'bytes': 0, 'linked': 0, 'copied': 0, 'copied_bytes': 0, 'errors': 0}
+            files = {}
+            for path, st in scan_files(paths):
+                relative = archive_name(path)
+                destination = os.path.join(partial, *relative.split('/'))
+                old = previous_files.get(relative)
+                try:
+                    os.makedirs(os.path.dirname(destination), exist_ok=True)
+                    if (old and old['size'] == st.st_size and old['mtime_ns'] == st.st_mtime_ns
+                            and self._link(os.path.join(self.snapshot_path(previous_name), *relative.split('/')),
+                                           destination)):
+                        stats['linked'] += 1
+                    else:
+                        shutil.copy2(path, destination)
+                        stats['copied'] += 1
+                        stats['copied_bytes'] += st.st_size
+                except OSError as e:
+                    logging.warning(f"Snapshot skipped {path}: {e}")
+                    stats['errors'] += 1
+                    continue
+                files[relative] = {'path': path, 'size': st.st_size, 'mtime_ns': st.st_mtime_ns,
+                                   'mode': st.st_mode & 0o7777}
+                stats['files'] += 1
+                stats['bytes'] += st.st_size
+                if progress:
+                    progress(stats)
+            
+            stats['elapsed_seconds'] = time.perf_counter() - started
+            manifest = {
+                'name': name,
+                'created': datetime.now().isoformat(),
+                'previous': previous_name,
+                'sources': [os.path.abspath(path) for path in paths],
+                'files': files,
+                'stats': stats
+            }
+            with open(os.path.join(partial, self.MANIFEST_NAME), 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False)
+            # Görüntü ancak tamamlandığında asıl adını alır
+            if os.path.exists(target):
+                shutil.rmtree(target)
+            os.rename(partial, target)
+        return manifest
+        
+    def restore(self, name: str, target_root: str = None) -> Dict:
+        """Görüntüyü düz kopyayla geri yükle; hedefte aynı boyut ve mtime'lı dosyalara dokunulmaz"""
+        manifest = self.load_manifest(name)
+        if manifest is None:
+            raise FileNotFoundError(f"Anlık görüntü bulunamadı: {name}")
+        
+        result = {'restored': 0, 'unchanged': 0}
+        for relative, entry in manifest['files'].items():
+            source = os.path.join(self.snapshot_path(name), *relative.split('/'))
+            destination = os.path.join(target_root, *relative.split('/')) if target_root else entry['path']
+            try:
+                current = os.stat(destination)
+                if current.st_size == entry['size'] and current.st_mtime_ns == entry['mtime_ns']:
+                    result['unchanged'] += 1
+                    continue
+            except OSError:
+                pass
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            # Hardlink'i değil içeriği kopyala: geri yüklenen dosya düzenlenince görüntü bozulmasın
+            temp_path = destination + ".restore.tmp"
+            shutil.copy2(source, temp_path)
+            os.replace(temp_path, destination)
+            result['restored'] += 1
+        return result
+        
+    def delete(self, name: str) -> bool:
+        """Görüntüyü sil; diğer görüntülerin paylaştığı inode'lar bağ sayısı sayesinde kalır"""
+        path = self.snapshot_path(name)
+        if not os.path.isdir(path):
+            return False
+        shutil.rmtree(path)
+        return True
+
+# ---------- PARALEL ARŞİV YAZICI ----------
+class ParallelZipWriter:
+    """Dosyaları bloklar hâlinde iş parçacığı havuzunda sıkıştırıp zip'e sırayla yazar.
+    
+    zlib sıkıştırırken GIL'i bırakır; her blok önceki bloğun son 32 KB'ı sözlük yapılarak
+    (pigz gibi) ayrı deflate akışı olarak sıkıştırılır ve akışlar uç uca eklenir.
+    CRC ve sha256 yazıcı tarafında sırayla hesaplanır.
+    """
+    
+    BLOCK_SIZE = 1024 * 1024
+    DICTIONARY_SIZE = 32 * 1024
+    MANIFEST_NAME = "backup_manifest.json"
+    
+    def __init__(self, archive_path: str, workers: int = None, level: int = 6,
+                 progress=None, progress_interval: float = 0.5):
+        self.archive_path = archive_path
+        self.workers = workers or os.cpu_count() or 2
+        self.level = level
+        self.progress = progress                  # progress(istatistik sözlüğü)
+        self.progress_interval = progress_interval
+        self.stats = {}
+        
+    @staticmethod
+    def _compress_block(data: bytes, dictionary: bytes, level: int, last: bool) -> bytes:
+        options = {'zdict': dictionary} if dictionary else {}
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15, **options)
+        # Ara bloklar bayt sınırında biter (Z_SYNC_FLUSH), yalnız son blok akışı kapatır
+        return compressor.compress(data) + compressor.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+        
+    def write(self, files, sources: List[str] = None) -> Dict:
+        """(yol, stat) dizisini arşive yaz; istatistikleri döndür"""
+        started = time.perf_counter()
+        self.stats = stats = {'files': 0, 'bytes_in': 0, 'bytes_out': 0, 'errors': 0,
+                              'elapsed_seconds': 0.0, 'throughput_mb_s': 0.0}
+        manifest = {}
+        pending = deque()                         # sıralı (dosya durumu, future, ham blok, son mu)
+        max_pending = self.workers * 4
+        last_report = started
+        
+        def report(force=False):
+            nonlocal last_report
+            now = time.perf_counter()
+            stats['elapsed_seconds'] = now - started
+            stats['throughput_mb_s'] = stats['bytes_in'] / (now - started) / 1e6 if now > started else 0.0
+            if self.progress and (force or now - last_report >= self.progress_interval):
+                last_report = now
+                self.progress(dict(stats))
+        
+        def drain(limit):
+            while len(pending) > limit:
+                state, future, block, last = pending.popleft()
+                self._write_block(zipf, state, future.result(), block, last, manifest)
+                report()
+        
+        with zipfile.ZipFile(self.archive_path, 'w', zipfile.ZIP_DEFLATED, allowZip64=True) as zipf, \
+                ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='backup') as pool:
+            for path, st in files:
+                try:
+                    f = open(path, 'rb')
+                except OSError as e:
+                    logging.warning(f"Backup skipped {path}: {e}")
+                    stats['errors'] += 1
+                    continue
+                
+                state = {'path': path, 'stat': st, 'zinfo': None, 'crc': 0,
+                         'sha256': hashlib.sha256(), 'size': 0, 'compressed': 0}
+                with f:
+                    # Okuma sırasında büyüyen dosya stat anındaki boyutta kesilir
+                    remaining = st.st_size
+                    dictionary = b''
+                    try:
+                        while True:
+                            block = f.read(min(self.BLOCK_SIZE, remaining)) if remaining > 0 else b''
+                            remaining -= len(block)
+                            last = not block or remaining <= 0
+                            future = pool.submit(self._compress_block, block, dictionary, self.level, last)
+                            pending.append((state, future, block, last))
+                            drain(max_pending)
+                            if last:
+                                break
+                            dictionary = block[-self.DICTIONARY_SIZE:]
+                    except OSError as e:
+                        # Okunamayan dosya atlanır: yazılmış blokları arşivden geri alınır
+                        drain(0)
+                        self._discard(zipf, state)
+                        logging.warning(f"Backup skipped {path}: {e}")
+                        stats['errors'] += 1
+            drain(0)
+            
+            zipf.writestr(self.MANIFEST_NAME, json.dumps({
+                'created': datetime.now().isoformat(),
+                'sources': sources or [],
+                'files': manifest
+            }, ensure_ascii=False, indent=1))
+        
+        report(force=True)
+        return dict(stats)
+        
+    def _write_block(self, zipf, state: Dict, compressed: bytes, block: bytes, last: bool, manifest: Dict):
+        """Sıkıştırılmış bloğu arşive ekle; dosyanın ilk bloğunda başlık yazılır, sonunda düzeltilir"""
+        fp = zipf.fp
+        if state['zinfo'] is None:
+            st = state['stat']
+            date_time = time.localtime(st.st_mtime)[:6]
+            if date_time[0] < 1980:
+                date_time = (1980, 1, 1, 0, 0, 0)
+            zinfo = zipfile.ZipInfo(archive_name(state['path']), date_time)
+            zinfo.compress_type = zipfile.ZIP_DEFLATED
+            zinfo.external_attr = (st.st_mode & 0xFFFF) << 16
+            zinfo.file_size = st.st_size
+            zinfo.compress_size = 0
+            zinfo.CRC = 0
+            zinfo.header_offset = fp.tell()
+            # zipfile'ın kendi kuralı: boyut sınıra yakınsa başlık zip64 yazılır
+            state['zip64'] = st.st_size * 1.05 > zipfile.ZIP64_LIMIT
+            fp.write(zinfo.FileHeader(state['zip64']))
+            state['zinfo'] = zinfo
+        
+        fp.write(compressed)
+        state['crc'] = zlib.crc32(block, state['crc'])
+        state['sha256'].update(block)
+        state['size'] += len(block)
+        state['compressed'] += len(compressed)
+        self.stats['bytes_in'] += len(block)
+        self.stats['bytes_out'] += len(compressed)
+        if not last:
+            return
+        
+        # Boyut ve CRC artık belli: yerel başlığı yerinde yeniden yaz
+        zinfo = state['zinfo']
+        zinfo.CRC = state['crc']
+        zinfo.file_size = state['size']
+        zinfo.compress_size = state['compressed']
+        end = fp.tell()
+        fp.seek(zinfo.header_offset)
+        fp.write(zinfo.FileHeader(state['zip64']))
+        fp.seek(end)
+        zipf.filelist.append(zinfo)
+        zipf.NameToInfo[zinfo.filename] = zinfo
+        zipf.start_dir = end
+        
+        manifest[zinfo.filename] = {'path': state['path'], 'size': state['size'],
+                                    'mtime_ns': state['stat'].st_mtime_ns,
+                                    'sha256': state['sha256'].hexdigest()}
+        self.stats['files'] += 1
+        
+    def _discard(self, zipf, state: Dict):
+        """Yarım kalan dosyanın başlığını ve bloklarını kes; sonraki dosya onun yerinden başlar"""
+        self.stats['bytes_in'] -= state['size']
+        self.stats['bytes_out'] -= state['compressed']
+        zinfo = state['zinfo']
+        if zinfo is None:
+            return
+        zipf.fp.seek(zinfo.header_offset)
+        zipf.fp.truncate()
+        zipf.start_dir = zinfo.header_offset
+
+# ---------- İÇERİK ADRESLİ YEDEK DEPOSU ----------
+class ChunkStore:
+    """Dosyaları sabit boyutlu parçalara bölüp sha256 ile bir kez saklayan, her yedeği bir manifestle tutan depo"""
+    
+    CHUNK_SIZE = 1024 * 1024
+    COMPRESS_LEVEL = 6
+    
+    def __init__(self, root: str):
+        self.root = root
+        self.chunk_dir = os.path.join(root, "chunks")
+        self.manifest_dir = os.path.join(root, "manifests")
+        self.db_path = os.path.join(root, "index.db")
+        os.makedirs(self.chunk_dir, exist_ok=True)
+        os.makedirs(self.manifest_dir, exist_ok=True)
+        self._lock = threading.Lock()         # aynı depoya eşzamanlı yedek ve temizlik yazmasın
+        self.setup_database()
+        
+    def setup_database(self):
+        """Dosya önbelleği: boyut+mtime+inode değişmediyse dosya yeniden okunmaz"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS file_cache (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                chunks TEXT NOT NULL
+            )
+        ''')
+        conn.commit()
+        conn.close()
+        
+    def chunk_path(self, digest: str) -> str:
+        # İlk iki hex karakter alt dizin: tek dizinde yüz binlerce dosya birikmez
+        return os.path.join(self.chunk_dir, digest[:2], digest)
+        
+    def manifest_path(self, name: str) -> str:
+        return os.path.join(self.manifest_dir, f"{name}.json")
+        
+    def _put_chunk(self, data: bytes) -> tuple:
+        """Parçayı yoksa sıkıştırıp yaz; (özet, diske yazılan bayt) döndür"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.chunk_path(digest)
+        if os.path.exists(path):
+            return digest, 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        compressed = zlib.compress(data, self.COMPRESS_LEVEL)
+        # Yarım yazılmış parça görünmesin: geçici dosya + atomik yeniden adlandırma
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(compressed)
+        os.replace(temp_path, path)
+        return digest, len(compressed)
+        
+    def read_chunk(self, digest: str) -> bytes:
+        with open(self.chunk_path(digest), 'rb') as f:
+            data = zlib.decompress(f.read())
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Bozuk yedek parçası: {digest}")
+        return data
+        
+    def backup(self, name: str, paths: List[str], progress=None, workers: int = None) -> Dict:
+        """Yedek al; değişmeyen dosya ve parçalar tekrar yazılmaz. Manifest özetini döndür"""
+        started = time.perf_counter()
+        stats = {'files': 0, 'bytes': 0, 'cached_files': 0, 'new_chunks': 0,
+                 'reused_chunks': 0, 'stored_bytes': 0, 'errors': 0}
+        entries = []
+        # Önbellekte olmayan dosyalar havuzda okunur, özetlenir ve sıkıştırılır; sonuçlar sırayla işlenir
+        pending = deque()
+        workers = workers or os.cpu_count() or 2
+        
+        with self._lock:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='chunk') as pool:
+                    for file_path, st in scan_files(paths):
+                        chunks = self._cached_chunks(conn, file_path, st)
+                        future = pool.submit(self._store_file, file_path) if chunks is None else None
+                        pending.append((file_path, st, future, chunks))
+                        while len(pending) > workers * 2 or (pending and pending[0][2] is None):
+                            self._finish_file(conn, pending.popleft(), entries, stats, progress)
+                    while pending:
+                        self._finish_file(conn, pending.popleft(), entries, stats, progress)
+                conn.commit()
+            finally:
+                conn.close()
+            
+            stats['elapsed_seconds'] = time.perf_counter() - started
+            manifest = {
+                'name': name,
+                'created': datetime.now().isoformat(),
+                'chunk_size': self.CHUNK_SIZE,
+                'sources': [os.path.abspath(path) for path in paths],
+                'files': entries,
+                'stats': stats
+            }
+            temp_path = self.manifest_path(name) + ".tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False)
+            os.replace(temp_path, self.manifest_path(name))
+        return manifest
+        
+    def _cached_chunks(self, conn, file_path: str, st) -> Optional[List[str]]:
+        """Boyut+mtime+inode önbelleği tutuyorsa ve parçalar hâlâ depodaysa parça listesi"""
+        row = conn.execute('SELECT size, mtime_ns, inode, chunks FROM file_cache WHERE path = ?',
+                           (file_path,)).fetchone()
+        if not row or row[:3] != (st.st_size, st.st_mtime_ns, st.st_ino):
+            return None
+        chunks = json.loads(row[3])
+        # Temizlik silmiş olabilir
+        if all(os.path.exists(self.chunk_path(digest)) for digest in chunks):
+            return chunks
+        return None
+        
+    def _store_file(self, file_path: str) -> tuple:
+        """Dosyayı parçalayıp depoya yaz (havuz thread'inde): (parçalar, yeni parça, yazılan bayt)"""
+        chunks, new_chunks, stored_bytes = [], 0, 0
+        with open(file_path, 'rb') as f:
+            while True:
+                data = f.read(self.CHUNK_SIZE)
+                if not data:
+                    break
+                digest, written = self._put_chunk(data)
+                chunks.append(digest)
+                if written:
+                    new_chunks += 1
+                    stored_bytes += written
+        return chunks, new_chunks, stored_bytes
+        
+    def _finish_file(self, conn, item: tuple, entries: List[Dict], stats: Dict, progress):
+        """Dosyanın sonucunu manifeste ve önbelleğe işle"""
+        file_path, st, future, chunks = item
+        if future is None:
+            stats['cached_files'] += 1
+            stats['reused_chunks'] += len(chunks)
+        else:
+            try:
+                chunks, new_chunks, stored_bytes = future.result()
+            except OSError as e:
+                logging.warning(f"Backup skipped {file_path}: {e}")
+                stats['errors'] += 1
+                return
+            stats['new_chunks'] += new_chunks
+            stats['reused_chunks'] += len(chunks) - new_chunks
+            stats['stored_bytes'] += stored_bytes
+            conn.execute('INSERT OR REPLACE INTO file_cache (path, size, mtime_ns, inode, chunks) '
+                         'VALUES (?, ?, ?, ?, ?)',
+                         (file_path, st.st_size, st.st_mtime_ns, st.st_ino, json.dumps(chunks)))
+        
+        entries.append({'path': file_path, 'size': st.st_size, 'mtime_ns': st.st_mtime_ns,
+                        'mode': st.st_mode & 0o7777, 'chunks': chunks})
+        stats['files'] += 1
+        stats['bytes'] += st.st_size
+        if progress:
+            progress(stats)
+        
+    def load_manifest(self, name: str) -> Optional[Dict]:
+        try:
+            with open(self.manifest_path(name), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+    def list_backups(self) -> List[str]:
+        """Yedek adları (eskiden yeniye)"""
+        names = [filename[:-5] for filename in os.listdir(self.manifest_dir) if filename.endswith('.json')]
+        return sorted(names, key=lambda name: os.path.getmtime(self.manifest_path(name)))
+        
+    def restore(self, name: str, target_root: str = None) -> int:
+        """Yedeği geri yükle; target_root verilirse yollar onun altına kurulur. Yazılan dosya sayısını döndür"""
+        manifest = self.load_manifest(name)
+        if manifest is None:
+            raise FileNotFoundError(f"Yedek bulunamadı: {name}")
+        
+        restored = 0
+        for entry in manifest['files']:
+            destination = entry['path']
+            if target_root:
+                destination = os.path.join(target_root, *archive_name(destination).split('/'))
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            temp_path = destination + ".restore.tmp"
+            with open(temp_path, 'wb') as f:
+                for digest in entry['chunks']:
+                    f.write(self.read_chunk(digest))
+            os.chmod(temp_path, entry['mode'])
+            os.replace(temp_path, destination)
+            os.utime(destination, ns=(entry['mtime_ns'], entry['mtime_ns']))
+            restored += 1
+        return restored
+        
+    def delete_backup(self, name: str) -> bool:
+        """Manifesti sil; parçalar garbage_collect ile temizlenir"""
+        try:
+            os.remove(self.manifest_path(name))
+            return True
+        except FileNotFoundError:
+            return False
+        
+    def garbage_collect(self) -> int:
+        """Hiçbir manifestin başvurmadığı parçaları sil (işaretle ve süpür); silinen parça sayısını döndür"""
+        with self._lock:
+            live = set()
+            for name in self.list_backups():
+                manifest = self.load_manifest(name)
+                if manifest:
+                    for entry in manifest['files']:
+                        live.update(entry['chunks'])
+            
+            removed = 0
+            for directory, _, files in os.walk(self.chunk_dir):
+                for filename in files:
+                    if filename not in live:
+                        os.remove(os.path.join(directory, filename))
+                        removed += 1
+            return removed
@@ -0,0 +1,253 @@
+"""
+Cron ifadeleri
+Zamanlayıcının kullandığı ayrıştırıcı; yalnız standart kütüphaneye dayanır (testler GUI olmadan çalışır)
+"""
+
+import calendar
+import random
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+# ---------- Cron İfadeleri ----------
+class CronExpression:
+    """Beş alanlı cron ifadesi: dakika saat ayın-günü ay haftanın-günü"""
+    
+    MONTH_NAMES = {"jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+                   "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12}
+    DAY_NAMES = {"sun": 0, "mon": 1, "tue": 2, "wed": 3, "thu": 4, "fri": 5, "sat": 6}
+    MACROS = {"@yearly": "0 0 1 1 *", "@annually": "0 0 1 1 *", "@monthly": "0 0 1 * *",
+              "@weekly": "0 0 * * 0", "@daily": "0 0 * * *", "@midnight": "0 0 * * *",
+              "@hourly": "0 * * * *"}
+    # Gregoryen takvim 400 yılda bir tekrarlar; bu sürede eşleşme yoksa hiç yoktur
+    SEARCH_YEARS = 400
+    MONTH_CACHE_SIZE = 48
+    
+    def __init__(self, expression: str):
+        self.expression = expression.strip()
+        text = self.MACROS.get(self.expression.lower(), self.expression)
+        fields = text.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron ifadesi 5 alan içermeli: {expression!r}")
+        minute, hour, dom, month, dow = fields
+        
+        self.minutes = self._parse_field(minute, 0, 59)
+        self.hours = self._parse_field(hour, 0, 23)
+        self.months = self._parse_field(month, 1, 12, self.MONTH_NAMES)
+        self._parse_dom(dom)
+        self._parse_dow(dow)
+        
+        # Klasik (Vixie) cron kuralı: gün alanlarından biri '*' ile başlıyorsa ikisi de tutmalı,
+        # ikisi de '*' ile başlamıyorsa biri tutması yeterli ('*/2' de '*' ile başlar)
+        self.day_fields_intersect = dom.startswith(("*", "?")) or dow.startswith(("*", "?"))
+        self._month_cache = {}
+    
+    def __repr__(self):
+        return f"CronExpression({self.expression!r})"
+    
+    # --- Ayrıştırma ---
+    @staticmethod
+    def _parse_value(token: str, low: int, high: int, names: Dict = None) -> int:
+        """Tek bir sayı ya da isim (jan, mon...)"""
+        token = token.lower()
+        if names and token in names:
+            value = names[token]
+        elif token.isdigit():
+            value = int(token)
+        else:
+            raise ValueError(f"Geçersiz cron değeri: {token!r}")
+        if not low <= value <= high:
+            raise ValueError(f"Cron değeri {low}-{high} aralığı dışında: {token!r}")
+        return value
+    
+    @classmethod
+    def _parse_range(cls, part: str, low: int, high: int, names: Dict = None) -> List[int]:
+        """'*', 'a', 'a-b', adımlı '*/s', 'a-b/s', 'a/s' parçalarını değerlere aç"""
+        body, slash, step_text = part.partition("/")
+        step = 1
+        if slash:
+            if not step_text.isdigit() or int(step_text) == 0:
+                raise ValueError(f"Geçersiz cron adımı: {part!r}")
+            step = int(step_text)
+        
+        if body in ("*", "?"):
+            start, end = low, high
+        elif "-" in body:
+            first, _, last = body.partition("-")
+            start = cls._parse_value(first, low, high, names)
+            end = cls._parse_value(last, low, high, names)
+        else:
+            start = cls._parse_value(body, low, high, names)
+            end = high if slash else start
+        
+        if start <= end:
+            return list(range(start, end + 1, step))
+        # 22-2 gibi sarmalayan aralık
+        span = list(range(start, high + 1)) + list(range(low, end + 1))
+        return span[::step]
+    
+    @classmethod
+    def _parse_field(cls, text: str, low: int, high: int, names: Dict = None) -> List[int]:
+        values = set()
+        for part in text.split(","):
+            values.update(cls._parse_range(part, low, high, names))
+        return sorted(values)
+    
+    def _parse_dom(self, text: str):
+        """Ayın günü: sayılar artı L (son gün), L-n, nW (en yakın hafta içi), LW (son hafta içi)"""
+        self.dom_values = set()
+        self.dom_last_offsets = []
+        self.dom_nearest_weekday = []
+        self.dom_last_weekday = False
+        for part in text.upper().split(","):
+            if part == "LW":
+                self.dom_last_weekday = True
+            elif part == "L":
+                self.dom_last_offsets.append(0)
+            elif part.startswith("L-"):
+                self.dom_last_offsets.append(self._parse_value(part[2:], 0, 30))
+            elif part.endswith("W"):
+                self.dom_nearest_weekday.append(self._parse_value(part[:-1], 1, 31))
+            else:
+                self.dom_values.update(self._parse_range(part, 1, 31))
+    
+    def _parse_dow(self, text: str):
+        """Haftanın günü (0/7=Pazar): sayılar/isimler artı nL (ayın son n günü), n#k (ayın k. n günü)"""
+        self.dow_values = set()
+        self.dow_last = set()
+        self.dow_nth = set()
+        for part in text.split(","):
+            if "#" in part:
+                day, _, nth = part.partition("#")
+                self.dow_nth.add((self._parse_value(day, 0, 7, self.DAY_NAMES) % 7,
+                                  self._parse_value(nth, 1, 5)))
+            elif len(part) > 1 and part.upper().endswith("L"):
+                self.dow_last.add(self._parse_value(part[:-1], 0, 7, self.DAY_NAMES) % 7)
+            else:
+                self.dow_values.update(v % 7 for v in self._parse_range(part, 0, 7, self.DAY_NAMES))
+    
+    # --- Takvim ---
+    def _compute_month_days(self, year: int, month: int) -> List[int]:
+        """Verilen ayda ifadenin tuttuğu günler (sıralı)"""
+        first_weekday, last = calendar.monthrange(year, month)
+        # calendar Pazartesi=0 sayar, cron Pazar=0
+        first_dow = (first_weekday + 1) % 7
+        
+        def dow_of(day):
+            return (first_dow + day - 1) % 7
+        
+        def nearest_weekday(day):
+            dow = dow_of(day)
+            if dow == 6:  # Cumartesi -> Cuma, ayın 1'iyse Pazartesi
+                return day - 1 if day > 1 else day + 2
+            if dow == 0:  # Pazar -> Pazartesi, ayın son günüyse Cuma
+                return day + 1 if day < last else day - 2
+            return day
+        
+        dom_days = {day for day in self.dom_values if day <= last}
+        dom_days.update(last - offset for offset in self.dom_last_offsets if last - offset >= 1)
+        dom_days.update(nearest_weekday(day) for day in self.dom_nearest_weekday if day <= last)
+        if self.dom_last_weekday:
+            dom_days.add(nearest_weekday(last))
+        
+        dow_days = set()
+        for dow in self.dow_values:
+            dow_days.update(range(1 + (dow - first_dow) % 7, last + 1, 7))
+        for dow, nth in self.dow_nth:
+            day = 1 + (dow - first_dow) % 7 + 7 * (nth - 1)
+            if day <= last:
+                dow_days.add(day)
+        for dow in self.dow_last:
+            dow_days.add(last - (dow_of(last) - dow) % 7)
+        
+        # Düz '*' alanı zaten ayın bütün günlerini içerir
+        days = dom_days & dow_days if self.day_fields_intersect else dom_days | dow_days
+        return sorted(days)
+    
+    def _month_days(self, year: int, month: int) -> List[int]:
+        key = (year, month)
+        days = self._month_cache.get(key)
+        if days is None:
+            if len(self._month_cache) >= self.MONTH_CACHE_SIZE:
+                self._month_cache.clear()
+            days = self._month_cache[key] = self._compute_month_days(year, month)
+        return days
+    
+    def _time_on_or_after(self, hour: int, minute: int):
+        """Gün içinde (hour, minute) veya sonrasındaki ilk eşleşen saat:dakika; yoksa None"""
+        index = bisect_left(self.hours, hour)
+        if index < len(self.hours) and self.hours[index] == hour:
+            minute_index = bisect_left(self.minutes, minute)
+            if minute_index < len(self.minutes):
+                return hour, self.minutes[minute_index]
+            index += 1
+        if index < len(self.hours):
+            return self.hours[index], self.minutes[0]
+        return None
+    
+    def matches(self, moment: datetime) -> bool:
+        """Verilen dakika ifadeye uyuyor mu"""
+        return (moment.minute in self.minutes and moment.hour in self.hours
+                and moment.month in self.months
+                and moment.day in self._month_days(moment.year, moment.month))
+    
+    def next_after(self, after: datetime) -> Optional[datetime]:
+        """after anından kesin sonraki ilk eşleşme; dakika dakika taramak yerine ay, gün, saat, dakika sırasıyla atlar"""
+        start = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        year, month, day = start.year, start.month, start.day
+        hour, minute = start.hour, start.minute
+        
+        while year <= start.year + self.SEARCH_YEARS:
+            if month in self.months:
+                days = self._month_days(year, month)
+                for candidate in days[bisect_left(days, day):]:
+                    if candidate == day:
+                        found = self._time_on_or_after(hour, minute)
+                    else:
+                        found = (self.hours[0], self.minutes[0])
+                    if found:
+                        return datetime(year, month, candidate, found[0], found[1], tzinfo=after.tzinfo)
+            
+            # Bu ayda eşleşme yok: izin verilen bir sonraki aya atla
+            index = bisect_right(self.months, month)
+            if index < len(self.months):
+                month = self.months[index]
+            else:
+                year, month = year + 1, self.months[0]
+            day, hour, minute = 1, 0, 0
+        return None
+
+def benchmark_cron(count: int = 10000, seed: int = 1) -> Dict:
+    """Rastgele cron ifadeleri için ayrıştırma ve sonraki çalışma hesaplama süresini ölç"""
+    rng = random.Random(seed)
+    templates = [
+        lambda: f"{rng.randrange(60)} {rng.randrange(24)} * * *",
+        lambda: f"*/{rng.randint(1, 30)} {rng.randint(0, 11)}-{rng.randint(12, 23)} * * {rng.randint(1, 5)}",
+        lambda: f"{rng.randrange(60)} {rng.randrange(24)} * * {rng.randrange(7)}#{rng.randint(1, 5)}",
+        lambda: f"0 {rng.randrange(24)} L * *",
+        lambda: f"30 {rng.randrange(24)} LW */{rng.randint(1, 6)} *",
+        lambda: f"{rng.randrange(60)} {rng.randrange(24)} {rng.randint(1, 31)}W * *",
+        lambda: f"{rng.randrange(60)} {rng.randrange(24)} * * {rng.randrange(7)}L",
+        lambda: "0 0 29 2 *",
+        lambda: f"{rng.randrange(60)} {rng.randrange(24)} {rng.randint(1, 28)} {rng.randint(1, 12)} {rng.randrange(7)}",
+        lambda: f"0,15,30,45 */{rng.randint(1, 8)} 1-{rng.randint(1, 31)} jan-{rng.choice(['jun', 'dec'])} mon-fri",
+    ]
+    expressions = [rng.choice(templates)() for _ in range(count)]
+    after = datetime(2026, 1, 1, 0, 0)
+    
+    started = time.perf_counter()
+    parsed = [CronExpression(text) for text in expressions]
+    parse_seconds = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    unmatched = sum(1 for cron in parsed if cron.next_after(after) is None)
+    next_seconds = time.perf_counter() - started
+    
+    return {
+        'expressions': count,
+        'unmatched': unmatched,
+        'parse_seconds': parse_seconds,
+        'next_run_seconds': next_seconds,
+        'next_run_per_expression_us': next_seconds / count * 1e6 if count else 0.0
+    }
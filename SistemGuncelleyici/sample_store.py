@@ -0,0 +1,228 @@
+"""
+İzleme örneği deposu
+Host metrik örneklerini delta kodlu gruplar ve özet kovaları olarak SQLite'ta saklar; yalnız standart kütüphaneye dayanır
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from array import array
+from itertools import accumulate
+from typing import Dict, List, Optional
+
+# ---------- İzleme Örneği Deposu ----------
+class MonitorSampleStore:
+    """İzleme örneklerini oturum/komut etiketiyle, delta kodlu gruplar halinde saklar"""
+    
+    # Tam sayı sütunları: zaman milisaniye, yüzdeler binde bir, hızlar bayt/sn
+    COLUMNS = ('timestamp_ms', 'cpu_permille', 'memory_permille',
+               'disk_read_bps', 'disk_write_bps', 'net_recv_bps', 'net_sent_bps')
+    DOWNSAMPLE_EVERY = 3600       # saniye
+    
+    def __init__(self, db_path: str, batch_size: int = 60, raw_retention_days: int = 7,
+                 rollup_seconds: int = 300, rollup_retention_days: int = 180):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.raw_retention_days = raw_retention_days
+        self.rollup_seconds = rollup_seconds
+        self.rollup_retention_days = rollup_retention_days
+        self._buffer = []
+        self._context = (None, None)      # (session_id, komut)
+        self._last_downsample = None     # ilk yazımda eski örnekler hemen özetlenir
+        self._lock = threading.Lock()
+        self.setup_tables()
+        
+    def setup_tables(self):
+        """Ham örnek grupları ve özet kovaları tablolarını kur"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        # Her satır aynı etiketli ardışık örneklerden oluşan bir grup
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS monitor_samples (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id INTEGER,
+                command TEXT,
+                start_ms INTEGER NOT NULL,
+                end_ms INTEGER NOT NULL,
+                sample_count INTEGER NOT NULL,
+                data BLOB NOT NULL
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_monitor_samples_session ON monitor_samples (session_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_monitor_samples_end ON monitor_samples (end_ms)')
+        
+        # Eski örneklerin min/ortalama/maks kovaları
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS monitor_rollups (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                bucket_start_ms INTEGER NOT NULL,
+                bucket_seconds INTEGER NOT NULL,
+                session_id INTEGER,
+                sample_count INTEGER NOT NULL,
+                stats TEXT NOT NULL,
+                UNIQUE (bucket_start_ms, session_id)
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_monitor_rollups_session ON monitor_rollups (session_id)')
+        
+        conn.commit()
+        conn.close()
+        
+    def set_context(self, session_id: Optional[int] = None, command: Optional[str] = None):
+        """Sonraki örneklerin etiketini değiştir (bekleyen grup eski etiketle yazılır)"""
+        with self._lock:
+            if (session_id, command) != self._context:
+                self._flush_locked()
+                self._context = (session_id, command)
+        
+    def append(self, cpu: float, memory: float, disk_read: float = 0, disk_write: float = 0,
+               net_recv: float = 0, net_sent: float = 0, timestamp: float = None):
+        """Tek örnek ekle; grup dolunca veritabanına yazılır"""
+        timestamp = time.time() if timestamp is None else timestamp
+        row = (int(timestamp * 1000), int(round(cpu * 10)), int(round(memory * 10)),
+               int(disk_read), int(disk_write), int(net_recv), int(net_sent))
+        with self._lock:
+            self._buffer.append(row)
+            if len(self._buffer) >= self.batch_size:
+                self._flush_locked()
+        
+    def flush(self):
+        """Bekleyen örnekleri yaz"""
+        with self._lock:
+            self._flush_locked()
+        
+    def _flush_locked(self):
+        if not self._buffer:
+            return
+        rows, self._buffer = self._buffer, []
+        session_id, command = self._context
+        
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT INTO monitor_samples (session_id, command, start_ms, end_ms, sample_count, data)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (session_id, command, rows[0][0], rows[-1][0], len(rows), self.encode(rows)))
+        
+        if (self._last_downsample is None or
+                time.monotonic() - self._last_downsample >= self.DOWNSAMPLE_EVERY):
+            self._last_downsample = time.monotonic()
+            self._downsample(cursor)
+        
+        conn.commit()
+        conn.close()
+        
+    @classmethod
+    def encode(cls, rows: List[tuple]) -> bytes:
+        """Satırları sütunlara çevir, her sütunu önceki değerden farkla kodla ve sıkıştır"""
+        values = array('q')
+        for column in zip(*rows):
+            previous = 0
+            for value in column:
+                values.append(value - previous)
+                previous = value
+        return zlib.compress(values.tobytes())
+        
+    @classmethod
+    def decode(cls, data: bytes, sample_count: int) -> List[tuple]:
+        """encode'un tersi: sıkıştırılmış farklardan satırları geri üret"""
+        values = array('q')
+        values.frombytes(zlib.decompress(data))
+        columns = [accumulate(values[i * sample_count:(i + 1) * sample_count])
+                   for i in range(len(cls.COLUMNS))]
+        return list(zip(*columns))
+        
+    def _downsample(self, cursor):
+        """Saklama süresini aşan ham grupları min/ortalama/maks kovalarına indir, eski kovaları sil"""
+        now = time.time()
+        cutoff_ms = int((now - self.raw_retention_days * 86400) * 1000)
+        bucket_ms = self.rollup_seconds * 1000
+        
+        # Oturum dışı (boştaki) örnekler hiçbir eğriye ait değildir; özetlenmeden silinir
+        cursor.execute('''
+            SELECT id, session_id, sample_count, data FROM monitor_samples
+            WHERE end_ms < ? AND session_id IS NOT NULL
+        ''', (cutoff_ms,))
+        buckets = {}
+        expired_ids = []
+        for batch_id, session_id, sample_count, data in cursor.fetchall():
+            expired_ids.append((batch_id,))
+            for row in self.decode(data, sample_count):
+                bucket_start = row[0] // bucket_ms * bucket_ms
+                buckets.setdefault((bucket_start, session_id), []).append(row[1:])
+        
+        for (bucket_start, session_id), rows in buckets.items():
+            stats = {name: [min(column), sum(column) / len(column), max(column)]
+                     for name, column in zip(self.COLUMNS[1:], zip(*rows))}
+            sample_count = len(rows)
+            
+            # Kovanın bir kısmı önceki turda özetlendiyse ikisi birleştirilir
+            cursor.execute('SELECT sample_count, stats FROM monitor_rollups '
+                           'WHERE bucket_start_ms = ? AND session_id = ?', (bucket_start, session_id))
+            previous = cursor.fetchone()
+            if previous:
+                stats = self._merge_stats(json.loads(previous[1]), previous[0], stats, sample_count)
+                sample_count += previous[0]
+            
+            cursor.execute('''
+                INSERT INTO monitor_rollups (bucket_start_ms, bucket_seconds, session_id, sample_count, stats)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (bucket_start_ms, session_id)
+                DO UPDATE SET sample_count = excluded.sample_count, stats = excluded.stats
+            ''', (bucket_start, self.rollup_seconds, session_id, sample_count, json.dumps(stats)))
+        
+        cursor.executemany('DELETE FROM monitor_samples WHERE id = ?', expired_ids)
+        cursor.execute('DELETE FROM monitor_samples WHERE end_ms < ? AND session_id IS NULL', (cutoff_ms,))
+        cursor.execute('DELETE FROM monitor_rollups WHERE bucket_start_ms < ?',
+                       (int((now - self.rollup_retention_days * 86400) * 1000),))
+        
+    @staticmethod
+    def _merge_stats(first: Dict, first_count: int, second: Dict, second_count: int) -> Dict:
+        """İki [min, ortalama, maks] özetini örnek sayılarıyla ağırlıklandırarak birleştir"""
+        total = first_count + second_count
+        return {name: [min(first[name][0], second[name][0]),
+                       (first[name][1] * first_count + second[name][1] * second_count) / total,
+                       max(first[name][2], second[name][2])]
+                for name in second}
+        
+    def get_session_samples(self, session_id: int) -> Dict:
+        """Oturumun kaynak eğrisi: zamanlar ve CPU/bellek yüzdesi, disk/ağ hızı serileri"""
+        self.flush()
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT sample_count, data FROM monitor_samples
+            WHERE session_id = ? ORDER BY start_ms
+        ''', (session_id,))
+        rows = []
+        for sample_count, data in cursor.fetchall():
+            rows.extend(self.decode(data, sample_count))
+        
+        # Ham örnekleri silinmiş kısımlar için kova ortalamaları kullanılır
+        cursor.execute('''
+            SELECT bucket_start_ms, bucket_seconds, stats FROM monitor_rollups
+            WHERE session_id = ?
+        ''', (session_id,))
+        rollups = cursor.fetchall()
+        for bucket_start, bucket_seconds, stats in rollups:
+            stats = json.loads(stats)
+            rows.append((bucket_start + bucket_seconds * 500,) +
+                        tuple(stats[name][1] for name in self.COLUMNS[1:]))
+        downsampled = bool(rollups)
+        rows.sort()
+        conn.close()
+        
+        return {
+            'downsampled': downsampled,
+            'timestamps': [row[0] / 1000 for row in rows],
+            'series': {
+                'cpu': [row[1] / 10 for row in rows],
+                'memory': [row[2] / 10 for row in rows],
+                'disk': [row[3] + row[4] for row in rows],
+                'net': [row[5] + row[6] for row in rows]
+            }
+        }
@@ -0,0 +1,268 @@
+"""
+Güncelleme iş kuyruğu
+GUI ve API isteklerini kalıcı SQLite kuyruğunda sıralar; yalnız standart kütüphaneye dayanır (psutil isteğe bağlı)
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# ---------- Süreç Kontrolü ----------
+def pid_exists(pid: int) -> bool:
+    """Süreç hâlâ çalışıyor mu; psutil yoksa POSIX'te sinyal 0 ile denenir"""
+    if psutil is not None:
+        return psutil.pid_exists(pid)
+    if os.name != 'posix':
+        # Windows'ta os.kill(pid, 0) süreci sonlandırır; emin olunamıyorsa çalışıyor sayılır
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+# ---------- GÜNCELLEME İŞ KUYRUĞU ----------
+class UpdateJobQueue:
+    """Güncelleme isteklerini kalıcı kuyrukta tutar ve bu makinede tek tek çalıştırır"""
+    
+    FINISHED_STATES = ('completed', 'failed', 'cancelled', 'interrupted')
+    
+    def __init__(self, db_path: str, runner, metrics=None, poll_interval: float = 30.0):
+        self.db_path = db_path
+        self.runner = runner                  # runner(iş, iptal olayı) -> sonuç sözlüğü
+        self.metrics = metrics                # MetricsRegistry (isteğe bağlı)
+        self.poll_interval = poll_interval    # başka süreçlerin eklediği işler için yedek kontrol
+        self._cancel_events = {}              # çalışan iş ID -> threading.Event
+        self._cond = threading.Condition()
+        self._wakeup = False
+        self._running = False
+        self._thread = None
+        self.setup_database()
+        self.recover_interrupted()
+        if metrics:
+            metrics.gauge('updater_update_queue_depth', 'Bekleyen ya da çalışan güncelleme sayısı')
+            metrics.set('updater_update_queue_depth', self._count_active())
+        
+    def setup_database(self):
+        """İş tablosunu kur"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS update_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created TEXT NOT NULL,
+                source TEXT NOT NULL,
+                managers TEXT,
+                dry_run INTEGER NOT NULL DEFAULT 0,
+                dedupe_key TEXT NOT NULL,
+                status TEXT NOT NULL,
+                owner_pid INTEGER,
+                session_id INTEGER,
+                started TEXT,
+                finished TEXT,
+                result TEXT
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_update_jobs_status ON update_jobs (status, id)')
+        conn.commit()
+        conn.close()
+        
+    def _connect(self):
+        # BEGIN IMMEDIATE ile alınan yazma kilidi, aynı veritabanını kullanan süreçler arasında da sıralar
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.isolation_level = None
+        return conn
+        
+    def recover_interrupted(self):
+        """Sahibi artık çalışmayan 'running' işleri kesilmiş say"""
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        rows = conn.execute("SELECT id, owner_pid FROM update_jobs WHERE status = 'running'").fetchall()
+        for job_id, owner_pid in rows:
+            if owner_pid == os.getpid() or not owner_pid or not pid_exists(owner_pid):
+                conn.execute("UPDATE update_jobs SET status = 'interrupted', finished = ? WHERE id = ?",
+                             (datetime.now().isoformat(), job_id))
+        conn.execute('COMMIT')
+        conn.close()
+        
+    def start(self):
+        """Çalıştırıcı thread'i başlat; önceki oturumdan kalan sıradaki işler de çalışır"""
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        
+    def stop(self):
+        """Yeni iş almayı durdur (çalışan iş bir sonraki komuttan önce iptal edilir)"""
+        with self._cond:
+            self._running = False
+            for event in self._cancel_events.values():
+                event.set()
+            self._cond.notify_all()
+        
+    def submit(self, managers: Optional[List[str]] = None, dry_run: bool = False,
+               source: str = 'api') -> tuple:
+        """İş ekle; aynı istekle bekleyen iş varsa o döner. (iş, birleştirildi mi) döndür"""
+        managers = sorted({name.lower() for name in managers}) if managers else None
+        dedupe_key = json.dumps([managers, bool(dry_run)])
+        
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        row = conn.execute('''
+            SELECT id FROM update_jobs WHERE status = 'queued' AND dedupe_key = ? ORDER BY id LIMIT 1
+        ''', (dedupe_key,)).fetchone()
+        collapsed = row is not None
+        if collapsed:
+            job_id = row[0]
+        else:
+            job_id = conn.execute('''
+                INSERT INTO update_jobs (created, source, managers, dry_run, dedupe_key, status)
+                VALUES (?, ?, ?, ?, ?, 'queued')
+            ''', (datetime.now().isoformat(), source, json.dumps(managers) if managers else None,
+                  int(bool(dry_run)), dedupe_key)).lastrowid
+        conn.execute('COMMIT')
+        conn.close()
+        
+        if not collapsed:
+            self._change_depth(1)
+            with self._cond:
+                self._wakeup = True
+                self._cond.notify_all()
+        return self.get_job(job_id), collapsed
+        
+    def cancel(self, job_id: int) -> Optional[str]:
+        """Sıradaki işi iptal et, çalışanı durdurmaya çalış; işin yeni durumunu döndür"""
+        conn = self._connect()
+        updated = conn.execute('''
+            UPDATE update_jobs SET status = 'cancelled', finished = ?
+            WHERE id = ? AND status = 'queued'
+        ''', (datetime.now().isoformat(), job_id)).rowcount
+        row = conn.execute('SELECT status FROM update_jobs WHERE id = ?', (job_id,)).fetchone()
+        conn.close()
+        
+        if updated:
+            self._change_depth(-1)
+            return 'cancelled'
+        if row is None:
+            return None
+        event = self._cancel_events.get(job_id)
+        if row[0] == 'running' and event is not None:
+            event.set()
+            return 'cancelling'
+        return row[0]
+        
+    def get_job(self, job_id: int) -> Optional[Dict]:
+        """İşi, önündeki iş sayısıyla (position) birlikte getir"""
+        conn = sqlite3.connect(self.db_path)
+        row = conn.execute('SELECT * FROM update_jobs WHERE id = ?', (job_id,)).fetchone()
+        ahead = conn.execute('''
+            SELECT COUNT(*) FROM update_jobs
+            WHERE status = 'running' OR (status = 'queued' AND id < ?)
+        ''', (job_id,)).fetchone()[0] if row and row[6] == 'queued' else 0
+        conn.close()
+        return self._job_from_row(row, ahead) if row else None
+        
+    def list_jobs(self, limit: int = 20) -> List[Dict]:
+        """Çalışan ve sıradaki işler ile son biten işler"""
+        conn = sqlite3.connect(self.db_path)
+        active = conn.execute('''
+            SELECT * FROM update_jobs WHERE status IN ('running', 'queued')
+            ORDER BY status = 'queued', id
+        ''').fetchall()
+        finished = conn.execute('''
+            SELECT * FROM update_jobs WHERE status NOT IN ('running', 'queued')
+            ORDER BY id DESC LIMIT ?
+        ''', (limit,)).fetchall()
+        conn.close()
+        return ([self._job_from_row(row, position) for position, row in enumerate(active)] +
+                [self._job_from_row(row, 0) for row in finished])
+        
+    @staticmethod
+    def _job_from_row(row, position: int) -> Dict:
+        return {
+            'id': row[0],
+            'created': row[1],
+            'source': row[2],
+            'managers': json.loads(row[3]) if row[3] else None,
+            'dry_run': bool(row[4]),
+            'status': row[6],
+            'position': position,
+            'session_id': row[8],
+            'started': row[9],
+            'finished': row[10],
+            'result': json.loads(row[11]) if row[11] else None
+        }
+        
+    def _count_active(self) -> int:
+        conn = sqlite3.connect(self.db_path)
+        active = conn.execute("SELECT COUNT(*) FROM update_jobs WHERE status IN ('queued', 'running')").fetchone()[0]
+        conn.close()
+        return active
+        
+    def _change_depth(self, delta: int):
+        if self.metrics:
+            self.metrics.inc('updater_update_queue_depth', delta)
+        
+    def _claim_next(self) -> Optional[tuple]:
+        """Makinede çalışan iş yoksa sıradaki ilk işi bu süreç adına al; (iş, iptal olayı) döndür"""
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        busy = conn.execute("SELECT 1 FROM update_jobs WHERE status = 'running' LIMIT 1").fetchone()
+        row = None if busy else conn.execute(
+            "SELECT id FROM update_jobs WHERE status = 'queued' ORDER BY id LIMIT 1").fetchone()
+        cancel = None
+        if row:
+            # Olay, iş 'running' olarak görünmeden kaydedilir; araya giren iptal isteği onu bulur
+            cancel = threading.Event()
+            with self._cond:
+                self._cancel_events[row[0]] = cancel
+            conn.execute('''
+                UPDATE update_jobs SET status = 'running', owner_pid = ?, started = ? WHERE id = ?
+            ''', (os.getpid(), datetime.now().isoformat(), row[0]))
+        conn.execute('COMMIT')
+        conn.close()
+        return (self.get_job(row[0]), cancel) if row else None
+        
+    def _finish(self, job_id: int, status: str, result: Dict):
+        conn = self._connect()
+        conn.execute('''
+            UPDATE update_jobs SET status = ?, finished = ?, session_id = ?, result = ? WHERE id = ?
+        ''', (status, datetime.now().isoformat(), result.get('session_id'), json.dumps(result), job_id))
+        conn.close()
+        self._change_depth(-1)
+        
+    def _run(self):
+        while self._running:
+            claimed = self._claim_next()
+            if claimed is None:
+                with self._cond:
+                    if not self._wakeup and self._running:
+                        self._cond.wait(self.poll_interval)
+                    self._wakeup = False
+                continue
+            
+            job, cancel = claimed
+            try:
+                result = self.runner(job, cancel)
+                status = result.pop('status', 'completed')
+                if cancel.is_set():
+                    status = 'cancelled'
+            except Exception as e:
+                logging.error(f"Güncelleme işi {job['id']} başarısız: {e}")
+                status, result = 'failed', {'error': str(e)}
+            try:
+                self._finish(job['id'], status, result)
+            finally:
+                # İş 'running' göründüğü sürece iptal olayı da kayıtlı kalır
+                with self._cond:
+                    self._cancel_events.pop(job['id'], None)
@@ -0,0 +1,398 @@
+"""
+Zamanlanmış güncellemeler
+Host'a özgü başlangıç yayması ve ortak zamanlayıcı üzerinde çalışan güncelleme zamanlaması
+"""
+
+import hashlib
+import json
+import os
+import platform
+import subprocess
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from SistemGuncelleyici.cron_expression import CronExpression
+from SistemGuncelleyici.updater_core import TaskScheduler
+
+# ---------- Host Kimliği ve Başlangıç Yayması ----------
+def host_identity() -> str:
+    """Yeniden başlatmalarda değişmeyen makine kimliği (özetlenmiş; ham kimlik dışarı verilmez)"""
+    raw = None
+    system = platform.system().lower()
+    try:
+        if system == "linux":
+            for path in ("/etc/machine-id", "/var/lib/dbus/machine-id"):
+                if os.path.exists(path):
+                    with open(path, "r", encoding="utf-8") as f:
+                        raw = f.read().strip() or None
+                    if raw:
+                        break
+        elif system == "darwin":
+            result = subprocess.run(["ioreg", "-rd1", "-c", "IOPlatformExpertDevice"],
+                                    capture_output=True, text=True, timeout=5)
+            for line in result.stdout.splitlines():
+                if "IOPlatformUUID" in line:
+                    raw = line.split("=")[-1].strip().strip('"')
+                    break
+        elif system == "windows":
+            import winreg
+            with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Cryptography") as key:
+                raw = winreg.QueryValueEx(key, "MachineGuid")[0]
+    except Exception:
+        raw = None
+    
+    # Makine kimliği okunamazsa ana bilgisayar adı ve MAC adresi kullanılır
+    if not raw:
+        raw = f"{platform.node()}-{uuid.getnode():012x}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def splay_offset(host_id: str, splay_minutes: float = 0, cohorts: int = 1,
+                 cohort_interval_minutes: float = 60, salt: str = "") -> timedelta:
+    """Host kimliğinden türetilen sabit başlangıç gecikmesi.
+    
+    Host önce hash ile bir kohorta (dalgaya) düşer; kohort c, c * cohort_interval_minutes
+    sonra başlar ve kohort içindeki hostlar splay_minutes penceresine düzgün dağılır.
+    Aynı host her çalışmada aynı gecikmeyi alır.
+    """
+    digest = hashlib.sha256(f"{salt}:{host_id}".encode()).digest()
+    cohort = int.from_bytes(digest[:4], "big") % max(cohorts, 1)
+    fraction = int.from_bytes(digest[4:12], "big") / 2 ** 64
+    return timedelta(seconds=int(cohort * cohort_interval_minutes * 60 + fraction * max(splay_minutes, 0) * 60))
+
+
+def simulate_splay(hosts: int = 500, splay_minutes: float = 30, cohorts: int = 1,
+                   cohort_interval_minutes: float = 60, bucket_seconds: int = 1,
+                   run_minutes: float = 5) -> Dict:
+    """Aynı saate zamanlanmış N host için eşzamanlı başlangıç tepesini yaymalı/yaymasız karşılaştır"""
+    host_ids = [hashlib.sha256(f"simulated-host-{index}".encode()).hexdigest() for index in range(hosts)]
+    
+    def peaks(offsets):
+        # Aynı kovaya düşen başlangıçlar ve run_minutes boyunca üst üste binen çalışmalar
+        buckets = {}
+        events = []
+        for offset in offsets:
+            seconds = offset.total_seconds()
+            bucket = int(seconds // bucket_seconds)
+            buckets[bucket] = buckets.get(bucket, 0) + 1
+            events.append((seconds, 1))
+            events.append((seconds + run_minutes * 60, -1))
+        running = peak_running = 0
+        for _, delta in sorted(events):
+            running += delta
+            peak_running = max(peak_running, running)
+        return max(buckets.values(), default=0), peak_running
+    
+    without = peaks([timedelta(0)] * hosts)
+    with_splay = peaks([splay_offset(host_id, splay_minutes, cohorts, cohort_interval_minutes, "scheduled_update")
+                        for host_id in host_ids])
+    
+    # Düzgün dağılımda kova başına beklenen başlangıç (tek kohort içinde)
+    window_seconds = max(splay_minutes * 60, bucket_seconds)
+    expected = hosts / max(cohorts, 1) * bucket_seconds / window_seconds
+    return {
+        'hosts': hosts,
+        'bucket_seconds': bucket_seconds,
+        'peak_starts_without_splay': without[0],
+        'peak_starts_with_splay': with_splay[0],
+        'expected_starts_per_bucket': expected,
+        'peak_running_without_splay': without[1],
+        'peak_running_with_splay': with_splay[1]
+    }
+
+# ---------- Zamanlama Sistemi ----------
+class ScheduledUpdateManager:
+    # Zamanında tetiklenen iş bu kadar saniyeden geç kalmışsa (uyku, kapalı makine) telafi sayılır
+    LATE_TOLERANCE = 120
+    
+    def __init__(self, config_file="schedule_config.json", task_scheduler=None, host_id: str = None,
+                 load_probe=None):
+        self.config_file = config_file
+        self.schedule_config = self.load_config()
+        self.scheduler_running = False
+        self.update_callback = None
+        self._job_names = set()
+        
+        # Ortak config paylaşan hostlar bu kimlikten türeyen sabit gecikmeyle yayılır
+        self.host_id = host_id or host_identity()
+        
+        # Meşguliyet ölçüsü: CPU yüzdesi ya da None döndüren çağrılabilir (örn. PerformanceMonitor.current_load)
+        self.load_probe = load_probe or self.system_load_percent
+        self._defer_deadline = None   # ertelenen çalışmanın en geç başlayacağı an
+        
+        # Uygulamanın ortak zamanlayıcısı (yoksa kendi zamanlayıcısını açar)
+        if task_scheduler is None:
+            task_scheduler = TaskScheduler()
+            task_scheduler.start()
+        self.task_scheduler = task_scheduler
+        
+    def load_config(self) -> Dict:
+        """Zamanlama ayarlarını yükle"""
+        default_config = {
+            "enabled": False,
+            "schedule_type": "weekly",  # weekly, daily, monthly, cron
+            "day_of_week": "monday",    # monday, tuesday, etc.
+            "time": "14:00",            # HH:MM format
+            "cron": None,               # schedule_type cron ise ifade, örn. "0 2 * * 2#2"
+            "splay_minutes": 0,         # hostlar bu pencereye sabit gecikmeyle dağılır
+            "cohorts": 1,               # dalga sayısı; dalgalar arası cohort_interval_minutes
+            "cohort_interval_minutes": 60,
+            "catch_up": True,           # kaçırılan çalışma açılışta/uyanınca telafi edilir
+            "catch_up_delay_minutes": 10,  # telafi bu pencere içinde host'a özgü anda başlar
+            "busy_cpu_percent": 80,     # bu yükün üstünde çalışma ertelenir
+            "defer_check_minutes": 5,
+            "max_defer_minutes": 120,   # erteleme sınırı; sonra yük ne olursa olsun çalışır
+            "last_run": None,
+            "next_run": None
+        }
+        
+        try:
+            if os.path.exists(self.config_file):
+                with open(self.config_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"Config yükleme hatası: {e}")
+            
+        return default_config
+    
+    def save_config(self):
+        """Zamanlama ayarlarını kaydet"""
+        try:
+            with open(self.config_file, 'w', encoding='utf-8') as f:
+                json.dump(self.schedule_config, f, indent=2, ensure_ascii=False)
+        except Exception as e:
+            print(f"Config kaydetme hatası: {e}")
+    
+    def set_schedule(self, schedule_type: str, day_of_week: str, time_str: str, cron: str = None):
+        """Yeni zamanlama ayarla"""
+        next_run = self.calculate_next_run(schedule_type, day_of_week, time_str, cron=cron)
+        self.schedule_config.update({
+            "enabled": True,
+            "schedule_type": schedule_type.lower(),
+            "day_of_week": day_of_week.lower(),
+            "time": time_str,
+            "cron": cron,
+            "last_run": None,
+            "next_run": next_run
+        })
+        self.save_config()
+        
+    def calculate_next_run(self, schedule_type: str, day_of_week: str, time_str: str,
+                           after: datetime = None, cron: str = None) -> Optional[str]:
+        """Bir sonraki çalışma zamanını hesapla"""
+        offset = self.start_offset()
+        next_run = self.next_run_after(schedule_type, day_of_week, time_str,
+                                       (after or datetime.now()) - offset, cron)
+        return (next_run + offset).isoformat() if next_run else None
+    
+    def start_offset(self, name: str = "scheduled_update") -> timedelta:
+        """Bu host ve iş için sabit başlangıç gecikmesi (yayma kapalıysa sıfır)"""
+        return splay_offset(self.host_id,
+                            self.schedule_config.get("splay_minutes", 0),
+                            self.schedule_config.get("cohorts", 1),
+                            self.schedule_config.get("cohort_interval_minutes", 60),
+                            salt=name)
+    
+    @staticmethod
+    def schedule_expression(schedule_type: str, day_of_week: str, time_str: str,
+                            cron: str = None) -> CronExpression:
+        """Zamanlama ayarını cron ifadesine çevir (aylık: ayın 1'i)"""
+        if schedule_type.lower() == "cron":
+            if not cron:
+                raise ValueError("Cron zamanlaması için ifade gerekli")
+            return CronExpression(cron)
+        
+        target_time = datetime.strptime(time_str, "%H:%M").time()
+        prefix = f"{target_time.minute} {target_time.hour}"
+        if schedule_type.lower() == "daily":
+            return CronExpression(f"{prefix} * * *")
+        if schedule_type.lower() == "weekly":
+            return CronExpression(f"{prefix} * * {day_of_week.lower()[:3]}")
+        return CronExpression(f"{prefix} 1 * *")
+    
+    @staticmethod
+    def next_run_after(schedule_type: str, day_of_week: str, time_str: str, after: datetime,
+                       cron: str = None) -> Optional[datetime]:
+        """after anından sonraki ilk yerel çalışma zamanı"""
+        expression = ScheduledUpdateManager.schedule_expression(schedule_type, day_of_week, time_str, cron)
+        return expression.next_after(after)
+    
+    def get_next_run_info(self) -> str:
+        """Bir sonraki çalışma bilgisini formatla"""
+        if not self.schedule_config["enabled"]:
+            return "Zamanlama kapalı"
+            
+        next_run_str = self.schedule_config.get("next_run")
+        if not next_run_str:
+            return "Zamanlama ayarlanmamış"
+            
+        try:
+            next_run = datetime.fromisoformat(next_run_str)
+            now = datetime.now()
+            
+            if next_run <= now:
+                return "Şimdi çalışacak!"
+            else:
+                delta = next_run - now
+                days = delta.days
+                hours = delta.seconds // 3600
+                minutes = (delta.seconds % 3600) // 60
+                
+                if days > 0:
+                    return f"{days} gün {hours} saat sonra"
+                elif hours > 0:
+                    return f"{hours} saat {minutes} dakika sonra"
+                else:
+                    return f"{minutes} dakika sonra"
+                    
+        except Exception as e:
+            return f"Hesaplama hatası: {e}"
+    
+    def start_scheduler(self, update_callback):
+        """Zamanlayıcıyı başlat"""
+        if not self.schedule_config["enabled"]:
+            return
+            
+        self.scheduler_running = True
+        self.update_callback = update_callback
+        
+        # Kapalıyken kaçırılan çalışma, kayıtlı next_run üzerine yazılmadan önce tespit edilir
+        missed = self.overdue_run()
+        
+        # Ortak zamanlayıcı bir sonraki yerel çalışma anına kadar uyur; yoklama yapılmaz
+        next_due = self.schedule_job("scheduled_update",
+                                     self.schedule_config["schedule_type"],
+                                     self.schedule_config["day_of_week"],
+                                     self.schedule_config["time"],
+                                     self._run_scheduled_update,
+                                     cron=self.schedule_config.get("cron"))
+        
+        if missed and self.schedule_config.get("catch_up", True):
+            self._schedule_catch_up(missed)
+        elif next_due:
+            self.schedule_config["next_run"] = next_due.isoformat()
+            self.save_config()
+        
+        print("⏰ Zamanlayıcı başlatıldı")
+    
+    def overdue_run(self, now: datetime = None) -> Optional[datetime]:
+        """Kayıtlı next_run (yoksa last_run'dan hesaplanan) geçmişte kaldıysa o zamanı döndür"""
+        if not self.schedule_config.get("enabled"):
+            return None
+        now = now or datetime.now()
+        
+        try:
+            if self.schedule_config.get("next_run"):
+                expected = datetime.fromisoformat(self.schedule_config["next_run"])
+            elif self.schedule_config.get("last_run"):
+                expected = datetime.fromisoformat(self.calculate_next_run(
+                    self.schedule_config["schedule_type"],
+                    self.schedule_config["day_of_week"],
+                    self.schedule_config["time"],
+                    after=datetime.fromisoformat(self.schedule_config["last_run"]),
+                    cron=self.schedule_config.get("cron")))
+            else:
+                return None
+        except (TypeError, ValueError):
+            return None
+        return expected if expected <= now else None
+    
+    @staticmethod
+    def system_load_percent() -> Optional[float]:
+        """1 dakikalık yük ortalamasının çekirdek sayısına oranı (yüzde); ölçülemiyorsa None"""
+        if not hasattr(os, "getloadavg"):
+            return None
+        try:
+            return os.getloadavg()[0] / (os.cpu_count() or 1) * 100
+        except OSError:
+            return None
+    
+    def host_busy(self) -> bool:
+        """Ölçülen yük eşiğin üstünde mi (ölçüm yoksa meşgul sayılmaz)"""
+        try:
+            load = self.load_probe()
+        except Exception:
+            return False
+        return load is not None and load >= self.schedule_config.get("busy_cpu_percent", 80)
+    
+    def _schedule_catch_up(self, missed: datetime):
+        """Kaçırılan çalışmayı açılış fırtınası olmadan, host'a özgü gecikmeyle telafi et"""
+        delay = splay_offset(self.host_id, self.schedule_config.get("catch_up_delay_minutes", 10),
+                             salt="catch_up")
+        self._defer_deadline = (datetime.now() + delay
+                                + timedelta(minutes=self.schedule_config.get("max_defer_minutes", 120)))
+        print(f"⏰ Kaçırılan çalışma ({missed.strftime('%d.%m.%Y %H:%M')}) "
+              f"{int(delay.total_seconds() // 60)} dakika içinde telafi edilecek")
+        self._job_names.add("catch_up")
+        self.task_scheduler.call_later("schedule:catch_up", delay.total_seconds(), self._run_when_idle)
+    
+    def schedule_job(self, name: str, schedule_type: str, day_of_week: str, time_str: str,
+                     callback, cron: str = None) -> Optional[datetime]:
+        """İsimli zamanlanmış iş ekle (aynı isimli iş yenisiyle değişir), ilk çalışma zamanını döndür"""
+        # İfade bir kez ayrıştırılır; geçersizse ValueError iş eklenmeden yükselir
+        expression = self.schedule_expression(schedule_type, day_of_week, time_str, cron)
+        offset = self.start_offset(name)
+        
+        def next_run(after):
+            # Gecikmeli çalışma after'dan sonra olmalı: taban zaman after - offset'ten aranır
+            base = expression.next_after(after - offset)
+            return base + offset if base else None
+        
+        self._job_names.add(name)
+        return self.task_scheduler.add_wall_job(f"schedule:{name}", next_run, callback)
+    
+    def cancel_job(self, name: str):
+        """İsimli işi kaldır; diğer işlere dokunulmaz"""
+        self._job_names.discard(name)
+        self.task_scheduler.remove_job(f"schedule:{name}")
+    
+    def _run_scheduled_update(self):
+        """Duvar saati işi: zamanındaysa çalıştır; uykudan dönüşte geç tetiklendiyse telafi penceresine al"""
+        missed = self.overdue_run()
+        late = missed and (datetime.now() - missed).total_seconds() > self.LATE_TOLERANCE
+        if late and self._defer_deadline is None and self.schedule_config.get("catch_up", True):
+            self._schedule_catch_up(missed)
+            return
+        self._run_when_idle()
+    
+    def _run_when_idle(self):
+        """Host meşgulse son tarihe kadar aralıklarla ertele, değilse güncellemeyi başlat"""
+        now = datetime.now()
+        if self._defer_deadline is None:
+            self._defer_deadline = now + timedelta(minutes=self.schedule_config.get("max_defer_minutes", 120))
+        
+        if now < self._defer_deadline and self.host_busy():
+            retry = min(self.schedule_config.get("defer_check_minutes", 5) * 60,
+                        (self._defer_deadline - now).total_seconds())
+            self._job_names.add("deferred")
+            self.task_scheduler.call_later("schedule:deferred", retry, self._run_when_idle)
+            print(f"⏳ Sistem meşgul, zamanlanmış güncelleme ertelendi ({int(retry)} sn)")
+            return
+        
+        self._defer_deadline = None
+        for name in ("catch_up", "deferred"):
+            if name in self._job_names:
+                self.cancel_job(name)
+        self._start_scheduled_run()
+    
+    def _start_scheduled_run(self):
+        """Zamanlanmış güncellemeyi çalıştır"""
+        print("🔄 Zamanlanmış güncelleme başlatılıyor...")
+        
+        # Son çalışma zamanını güncelle (sonraki zamanı zamanlayıcı zaten hesapladı)
+        next_due = self.task_scheduler.next_due("schedule:scheduled_update")
+        self.schedule_config["last_run"] = datetime.now().isoformat()
+        self.schedule_config["next_run"] = next_due.isoformat() if next_due else None
+        self.save_config()
+        
+        # Güncellemeyi başlat
+        if self.update_callback:
+            self.update_callback(scheduled=True)
+    
+    def stop_scheduler(self):
+        """Zamanlayıcıyı durdur"""
+        self.scheduler_running = False
+        self._defer_deadline = None
+        for name in list(self._job_names):
+            self.cancel_job(name)
+        print("⏹️ Zamanlayıcı durduruldu")
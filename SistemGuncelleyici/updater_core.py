@@ -0,0 +1,1060 @@
+"""
+Ortak güncelleyici altyapısı
+Professionel System Updater ve SsystemUPDATER aynı sınıfları buradan kullanır
+"""
+
+import argparse
+import os
+import re
+import select
+import threading
+import time
+import heapq
+from array import array
+from bisect import bisect_left
+from collections import deque, namedtuple
+from itertools import count, islice
+from datetime import datetime
+from typing import Dict, List, Optional
+import customtkinter as ctk
+import tkinter.font as tkfont
+
+# ---------- Ana Döngü Olay Kuyruğu ----------
+class UIEventQueue:
+    """Worker thread'lerden gelen GUI olaylarını Tk ana döngüsünde işler"""
+    
+    def __init__(self, root, frame_ms: int = 33, budget_ms: int = 12, idle_ms: int = 250):
+        self.root = root
+        self.frame_ms = frame_ms      # Olay varken çizim aralığı (~30 FPS)
+        self.budget_ms = budget_ms    # Bir karede olaylara ayrılan süre
+        self.idle_ms = idle_ms        # Boştayken kontrol aralığı
+        self._events = deque()
+        self._lock = threading.Lock()
+        self._progress_handler = None
+        self._text_handler = None
+        self._after_id = None
+        self._running = False
+    
+    def bind(self, progress_handler=None, text_handler=None):
+        """İlerleme ve metin olaylarını işleyecek fonksiyonları bağla"""
+        self._progress_handler = progress_handler
+        self._text_handler = text_handler
+    
+    def post_progress(self, *args):
+        """İlerleme olayı ekle (aynı karedeki ilerlemeler birleştirilir)"""
+        with self._lock:
+            self._events.append(('progress', args))
+    
+    def post_text(self, text: str):
+        """Çıktı alanına eklenecek metni kuyruğa al (karede tek insert)"""
+        with self._lock:
+            self._events.append(('text', text))
+    
+    def call(self, func, *args, **kwargs):
+        """Fonksiyonu ana döngüde, önceki olaylardan sonra çalıştır"""
+        with self._lock:
+            self._events.append(('call', (func, args, kwargs)))
+    
+    def pending(self) -> int:
+        """Bekleyen olay sayısı"""
+        with self._lock:
+            return len(self._events)
+    
+    def start(self):
+        """Kuyruk işlemeyi başlat (ana thread'den çağrılmalı)"""
+        if not self._running:
+            self._running = True
+            self._after_id = self.root.after(self.frame_ms, self._drain)
+    
+    def stop(self):
+        """Kuyruk işlemeyi durdur"""
+        self._running = False
+        if self._after_id:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+    
+    def _drain(self):
+        """Bir karelik olayları işle ve sonraki kareyi planla"""
+        if not self._running:
+            return
+        
+        with self._lock:
+            batch, self._events = self._events, deque()
+        
+        deadline = time.perf_counter() + self.budget_ms / 1000
+        latest_progress = None
+        texts = []
+        
+        while batch:
+            kind, payload = batch.popleft()
+            
+            if kind == 'progress':
+                latest_progress = payload
+            elif kind == 'text':
+                texts.append(payload)
+            else:
+                # Sıralama korunsun: önce biriken ilerleme ve metni çiz
+                self._flush(latest_progress, texts)
+                latest_progress, texts = None, []
+                
+                func, args, kwargs = payload
+                try:
+                    func(*args, **kwargs)
+                except Exception as e:
+                    print(f"GUI olay hatası: {e}")
+                
+                if time.perf_counter() >= deadline and batch:
+                    # Kare bütçesi doldu, kalanlar bir sonraki kareye
+                    with self._lock:
+                        self._events.extendleft(reversed(batch))
+                    break
+        
+        self._flush(latest_progress, texts)
+        
+        delay = self.frame_ms if self.pending() else self.idle_ms
+        self._after_id = self.root.after(delay, self._drain)
+    
+    def _flush(self, progress, texts):
+        """Birleştirilmiş ilerlemeyi ve toplu metni uygula"""
+        if progress is not None and self._progress_handler:
+            self._progress_handler(*progress)
+        if texts and self._text_handler:
+            self._text_handler("".join(texts))
+
+# ---------- Sınırlı Çıktı Görünümü ----------
+class BoundedOutputView(ctk.CTkFrame):
+    """Son satırları halka tamponda tutan, sanal kaydırmalı çıktı alanı"""
+    
+    def __init__(self, master, width=460, height=150, max_lines: int = 5000, on_evict=None, **kwargs):
+        super().__init__(master, width=width, height=height, fg_color="transparent", **kwargs)
+        self.max_lines = max_lines
+        self.on_evict = on_evict      # Tampondan düşen satırlar (kalıcı kayda yazmak için)
+        self.lines = deque(maxlen=max_lines)
+        self.evicted_count = 0        # Temizlemeden beri tampondan düşen satır sayısı
+        self.persisted = 0            # Tamponun başında flush ile zaten kayda verilmiş satırlar
+        self.top = 0                  # Görünen ilk satırın tampondaki indeksi
+        self.follow = True            # Yeni satırlarla sona kaydır
+        
+        # Metin kutusu sadece görünen sayfayı tutar, kaydırmayı biz yönetiriz
+        self.textbox = ctk.CTkTextbox(self, width=width, height=height, activate_scrollbars=False)
+        self.textbox.pack(side="left", fill="both", expand=True)
+        self.textbox.configure(state="disabled")
+        
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scroll)
+        self.scrollbar.pack(side="right", fill="y")
+        
+        font = self.textbox.cget("font")
+        if not isinstance(font, tkfont.Font):
+            font = tkfont.Font(font=font)
+        self.line_height = max(1, font.metrics("linespace"))
+        self.visible_rows = max(1, height // self.line_height)
+        
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.textbox.bind(sequence, self._on_wheel)
+        self.textbox.bind("<Configure>", self._on_resize)
+    
+    def append(self, text: str):
+        """Metni tampona ekle ve görünen sayfayı yeniden çiz"""
+        new_lines = text.splitlines()
+        if not new_lines:
+            return
+        
+        overflow = len(self.lines) + len(new_lines) - self.max_lines
+        if overflow > 0:
+            dropped = list(islice(self.lines, overflow))
+            dropped.extend(new_lines[:overflow - len(dropped)])
+            self.evicted_count += overflow
+            if not self.follow:
+                self.top = max(0, self.top - overflow)
+            # Daha önce flush edilmiş satırlar ikinci kez yazılmaz
+            already = min(self.persisted, overflow)
+            self.persisted -= already
+            if self.on_evict and len(dropped) > already:
+                self.on_evict(dropped[already:])
+        
+        self.lines.extend(new_lines)
+        self._render()
+    
+    def flush(self):
+        """Tamponda kalan ve henüz kayda verilmemiş satırları on_evict'e ver (oturum sonunda)"""
+        if self.on_evict and self.persisted < len(self.lines):
+            self.on_evict(list(islice(self.lines, self.persisted, None)))
+        self.persisted = len(self.lines)
+    
+    def clear(self):
+        """Tamponu ve görünümü temizle"""
+        self.lines.clear()
+        self.evicted_count = 0
+        self.persisted = 0
+        self.top = 0
+        self.follow = True
+        self._render()
+    
+    def _render(self):
+        """Sadece görünen satırları metin kutusuna yaz"""
+        total = len(self.lines)
+        rows = self.visible_rows
+        last_top = max(0, total - rows)
+        
+        if self.follow:
+            self.top = last_top
+            page = list(islice(reversed(self.lines), rows))[::-1]
+        else:
+            self.top = min(self.top, last_top)
+            page = list(islice(self.lines, self.top, self.top + rows))
+        
+        if self.top == 0 and self.evicted_count:
+            where = "geçmiş kaydında" if self.on_evict else "tampondan atıldı"
+            page.insert(0, f"⋯ {self.evicted_count} eski satır {where}")
+        
+        self.textbox.configure(state="normal")
+        self.textbox.delete("1.0", "end")
+        self.textbox.insert("end", "\n".join(page))
+        if self.follow:
+            self.textbox.see("end")
+        self.textbox.configure(state="disabled")
+        
+        if total > rows:
+            self.scrollbar.set(self.top / total, (self.top + rows) / total)
+        else:
+            self.scrollbar.set(0, 1)
+    
+    def _on_scroll(self, action, amount, unit=None):
+        """Kaydırma çubuğu komutlarını tampon indeksine çevir"""
+        total = len(self.lines)
+        rows = self.visible_rows
+        
+        if action == "moveto":
+            self.top = int(float(amount) * total)
+        elif action == "scroll":
+            step = int(amount) * (rows if unit == "pages" else 1)
+            self.top += step
+        
+        last_top = max(0, total - rows)
+        self.top = max(0, min(self.top, last_top))
+        self.follow = self.top >= last_top
+        self._render()
+    
+    def _on_wheel(self, event):
+        """Fare tekerleği ile üç satır kaydır"""
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            self._on_scroll("scroll", -3, "units")
+        else:
+            self._on_scroll("scroll", 3, "units")
+        return "break"
+    
+    def _on_resize(self, event):
+        """Görünen satır sayısını pencere boyuna göre ayarla"""
+        rows = max(1, event.height // self.line_height)
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self._render()
+
+# ---------- Ortak Zamanlayıcı ----------
+class TaskScheduler:
+    """Tüm periyodik işleri tek thread'de çalıştıran heap tabanlı zamanlayıcı"""
+    
+    # Duvar saati işleri varken saat atlamalarını yakalamak için en uzun uyku (saniye)
+    WALL_CLOCK_RECHECK = 300
+    # Duvar saati ile monotonik saat arasındaki farkın bu kadar değişmesi saat atlaması sayılır
+    CLOCK_JUMP_TOLERANCE = 2.0
+    
+    def __init__(self, ui_queue=None):
+        self.ui_queue = ui_queue      # GUI işleri bu kuyrukla ana döngüye gider
+        self._heap = []               # (monotonik son tarih, sıra, iş)
+        self._jobs = {}               # isim -> iş
+        self._sequence = count()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+        self._clock_offset = time.time() - time.monotonic()
+    
+    def add_job(self, name: str, interval: float, callback, on_main_loop: bool = False,
+                initial_delay: float = None):
+        """Periyodik iş ekle (aynı isimde iş varsa yerine geçer)"""
+        delay = interval if initial_delay is None else initial_delay
+        self._schedule(name, delay, interval, callback, on_main_loop)
+    
+    def call_later(self, name: str, delay: float, callback, on_main_loop: bool = False):
+        """Tek seferlik iş ekle"""
+        self._schedule(name, delay, None, callback, on_main_loop)
+    
+    def add_wall_job(self, name: str, next_run, callback, on_main_loop: bool = False) -> Optional[datetime]:
+        """Yerel saate bağlı iş ekle; next_run(önceki yerel zaman) sonraki yerel zamanı ya da None döndürür"""
+        job = {
+            'name': name,
+            'interval': None,
+            'callback': callback,
+            'on_main_loop': on_main_loop,
+            'active': True,
+            'next_run': next_run,
+            'due': None
+        }
+        due = self._next_wall_due(job, datetime.now())
+        if due is None:
+            self.remove_job(name)
+            return None
+        job['due'] = due
+        with self._cond:
+            self._replace_job(job)
+            heapq.heappush(self._heap, (self._wall_deadline(due), next(self._sequence), job))
+            self._cond.notify()
+        return due
+    
+    def next_due(self, name: str) -> Optional[datetime]:
+        """Duvar saati işinin sonraki yerel çalışma zamanı"""
+        with self._cond:
+            job = self._jobs.get(name)
+            return job.get('due') if job else None
+    
+    def remove_job(self, name: str):
+        """İşi iptal et"""
+        with self._cond:
+            job = self._jobs.pop(name, None)
+            if job:
+                job['active'] = False
+                self._cond.notify()
+    
+    def has_job(self, name: str) -> bool:
+        with self._cond:
+            return name in self._jobs
+    
+    def start(self):
+        """Zamanlayıcı thread'ini başlat"""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="TaskScheduler", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Zamanlayıcıyı durdur"""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+    
+    def _schedule(self, name, delay, interval, callback, on_main_loop):
+        job = {
+            'name': name,
+            'interval': interval,
+            'callback': callback,
+            'on_main_loop': on_main_loop,
+            'active': True
+        }
+        with self._cond:
+            self._replace_job(job)
+            heapq.heappush(self._heap, (time.monotonic() + max(delay, 0), next(self._sequence), job))
+            # En yakın son tarih değişmiş olabilir, bekleyen thread'i uyandır
+            self._cond.notify()
+    
+    def _replace_job(self, job):
+        old_job = self._jobs.get(job['name'])
+        if old_job:
+            old_job['active'] = False
+        self._jobs[job['name']] = job
+    
+    @staticmethod
+    def _next_wall_due(job, after: datetime) -> Optional[datetime]:
+        """Şu andan sonraki ilk yerel çalışma zamanı (kaçırılan turlar tek tek çalıştırılmaz)"""
+        now = datetime.now()
+        due = job['next_run'](after)
+        for _ in range(100000):
+            if due is None or due > now:
+                return due
+            due = job['next_run'](due)
+        raise ValueError(f"{job['name']}: sonraki çalışma zamanı ilerlemiyor")
+    
+    @staticmethod
+    def _wall_deadline(due: datetime) -> float:
+        # Yerel zaman o tarihteki saat dilimi kurallarıyla çevrilir; DST geçişi kendiliğinden hesaba katılır
+        return time.monotonic() + (due.timestamp() - time.time())
+    
+    def _check_clock(self) -> bool:
+        """Duvar saati monotonik saate göre kaydıysa (elle ayar, NTP, uyku) duvar işlerini yeniden yerleştir"""
+        offset = time.time() - time.monotonic()
+        if abs(offset - self._clock_offset) < self.CLOCK_JUMP_TOLERANCE:
+            return False
+        self._clock_offset = offset
+        self._heap = [(self._wall_deadline(job['due']) if job.get('next_run') else deadline, sequence, job)
+                      for deadline, sequence, job in self._heap if job['active']]
+        heapq.heapify(self._heap)
+        return True
+    
+    def _run(self):
+        """En yakın son tarihe kadar uyu, zamanı gelen işi çalıştır"""
+        while True:
+            with self._cond:
+                job = None
+                while self._running:
+                    if not self._heap:
+                        # Bekleyen iş yokken hiç uyanılmaz
+                        self._cond.wait()
+                        continue
+                    
+                    if self._check_clock():
+                        continue
+                    
+                    deadline, _, candidate = self._heap[0]
+                    if not candidate['active']:
+                        heapq.heappop(self._heap)
+                        continue
+                    
+                    remaining = deadline - time.monotonic()
+                    if remaining > 0:
+                        # Monotonik bekleme saat ayarını görmez; duvar işleri varken aralıkla kontrol edilir
+                        if any(job.get('next_run') for job in self._jobs.values()):
+                            remaining = min(remaining, self.WALL_CLOCK_RECHECK)
+                        self._cond.wait(remaining)
+                        continue
+                    
+                    heapq.heappop(self._heap)
+                    job = candidate
+                    break
+                
+                if not self._running:
+                    return
+                
+                if job.get('next_run'):
+                    job['due'] = self._next_wall_due(job, job['due'])
+                    if job['due'] is None:
+                        job['active'] = False
+                        if self._jobs.get(job['name']) is job:
+                            del self._jobs[job['name']]
+                    else:
+                        heapq.heappush(self._heap, (self._wall_deadline(job['due']),
+                                                    next(self._sequence), job))
+                elif job['interval'] is None:
+                    job['active'] = False
+                    if self._jobs.get(job['name']) is job:
+                        del self._jobs[job['name']]
+                else:
+                    # Gecikme birikirse kaçırılan turlar tekrar edilmez
+                    next_deadline = max(deadline + job['interval'], time.monotonic())
+                    heapq.heappush(self._heap, (next_deadline, next(self._sequence), job))
+            
+            self._dispatch(job)
+    
+    def _dispatch(self, job):
+        if job['on_main_loop'] and self.ui_queue:
+            self.ui_queue.call(job['callback'])
+            return
+        try:
+            job['callback']()
+        except Exception as e:
+            print(f"Zamanlanmış iş hatası ({job['name']}): {e}")
+
+# ---------- Metrik Halka Tamponu ----------
+class MetricRing:
+    """Sabit kapasiteli, array('d') tabanlı metrik tamponu (O(1) ekleme)"""
+    
+    def __init__(self, capacity: int):
+        self.capacity = max(1, int(capacity))
+        self._values = array('d', bytes(8 * self.capacity))
+        self._head = 0                # bir sonraki yazılacak konum
+        self._size = 0
+        self._lock = threading.Lock()
+    
+    def __len__(self):
+        return self._size
+    
+    def append(self, value: float):
+        """Değer ekle; doluysa en eski değerin üzerine yaz"""
+        with self._lock:
+            self._values[self._head] = value
+            self._head = (self._head + 1) % self.capacity
+            if self._size < self.capacity:
+                self._size += 1
+    
+    def clear(self):
+        with self._lock:
+            self._head = 0
+            self._size = 0
+    
+    def latest(self, default: float = 0.0) -> float:
+        """En son değer"""
+        with self._lock:
+            if not self._size:
+                return default
+            return self._values[self._head - 1]
+    
+    def window(self, n: int = None) -> List[float]:
+        """Son n değer (eskiden yeniye); n verilmezse tamamı"""
+        with self._lock:
+            n = self._size if n is None else max(0, min(n, self._size))
+            start = (self._head - n) % self.capacity
+            if start + n <= self.capacity:
+                return self._values[start:start + n].tolist()
+            return (self._values[start:] + self._values[:self._head]).tolist()
+    
+    def mean(self, n: int = None) -> float:
+        values = self.window(n)
+        return sum(values) / len(values) if values else 0.0
+    
+    def max(self, n: int = None) -> float:
+        values = self.window(n)
+        return max(values) if values else 0.0
+    
+    def percentile(self, q: float, n: int = None) -> float:
+        """Doğrusal ara değerli yüzdelik (q: 0-100)"""
+        return self._percentile(sorted(self.window(n)), q)
+    
+    def histogram(self, bounds: List[float], n: int = None) -> List[int]:
+        """Değerleri üst sınırlara göre kovalara say (son kova: en büyük sınırın üstü)"""
+        counts = [0] * (len(bounds) + 1)
+        for value in self.window(n):
+            counts[bisect_left(bounds, value)] += 1
+        return counts
+    
+    def summary(self, n: int = None, percentiles=(50, 95, 99)) -> Dict:
+        """Pencere için ortalama, maksimum ve yüzdelikler (tek sıralama ile)"""
+        values = sorted(self.window(n))
+        result = {
+            'count': len(values),
+            'mean': sum(values) / len(values) if values else 0.0,
+            'max': values[-1] if values else 0.0
+        }
+        for q in percentiles:
+            result[f'p{q:g}'] = self._percentile(values, q)
+        return result
+    
+    @staticmethod
+    def _percentile(ordered: List[float], q: float) -> float:
+        if not ordered:
+            return 0.0
+        rank = (len(ordered) - 1) * min(max(q, 0), 100) / 100
+        low = int(rank)
+        high = min(low + 1, len(ordered) - 1)
+        return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+# ---------- G/Ç Hız Takibi ----------
+class IORateTracker:
+    """Kümülatif disk/ağ sayaçlarından aygıt ve arayüz başına hız serileri üretir"""
+    
+    # psutil alan adı -> hız serisi adı
+    DISK_FIELDS = {'read_bytes': 'read_bps', 'write_bytes': 'write_bps',
+                   'read_count': 'read_iops', 'write_count': 'write_iops'}
+    NET_FIELDS = {'bytes_recv': 'recv_bps', 'bytes_sent': 'sent_bps'}
+    
+    # Histogram kova üst sınırları
+    BYTE_RATE_BOUNDS = [64 * 1024 * 4 ** i for i in range(8)]      # 64 KB/s ... 1 GB/s
+    IOPS_BOUNDS = [10, 50, 100, 500, 1000, 5000, 10000]
+    
+    # Loop/ram aygıtları ve yerel arayüz güncelleme trafiğini yansıtmaz (ad tamamen eşleşmeli)
+    IGNORED_DEVICES = re.compile(r'(?:loop|ram)\d+|lo\d*')
+    
+    def __init__(self, capacity: int = 720):
+        self.capacity = capacity
+        self.series = {}              # ('disk', 'sda', 'read_bps') -> MetricRing
+        self.active_session = None
+        self.last_session = None
+        self._previous = {}           # 'disk.sda' -> (zaman, ham sayaçlar)
+        self._lock = threading.Lock()
+    
+    def update(self, disk_counters: Dict = None, net_counters: Dict = None,
+               disk_total=None, now: float = None):
+        """Yeni sayaç okumasını işle (perdisk/pernic sözlükleri ve tüm disk toplamı)"""
+        net_total = dict.fromkeys(self.NET_FIELDS, 0)
+        
+        with self._lock:
+            # Zaman kilit içinde alınır; farklı thread'lerden gelen okumalar sıralı kalır
+            now = time.monotonic() if now is None else now
+            for name, counters in (disk_counters or {}).items():
+                if not self.ignored(name):
+                    self._record('disk', name, now, self._read_fields(counters, self.DISK_FIELDS))
+            
+            for name, counters in (net_counters or {}).items():
+                if self.ignored(name):
+                    continue
+                values = self._read_fields(counters, self.NET_FIELDS)
+                self._record('net', name, now, values)
+                for field, value in values.items():
+                    net_total[field] += value
+            
+            # Toplamlar: disk için psutil'in bölümleri saymayan toplamı, ağ için arayüzlerin toplamı
+            if disk_total is not None:
+                self._record('disk', 'total', now, self._read_fields(disk_total, self.DISK_FIELDS))
+            if net_counters:
+                self._record('net', 'total', now, net_total)
+    
+    @classmethod
+    def ignored(cls, name: str) -> bool:
+        """loop0, ram1, lo ve lo0 (macOS) atlanır; lowpan0, ramdisk gibi adlar sayılır"""
+        return cls.IGNORED_DEVICES.fullmatch(name) is not None
+    
+    @staticmethod
+    def _read_fields(counters, fields: Dict) -> Dict:
+        return {field: getattr(counters, field, 0) for field in fields}
+    
+    def _record(self, kind: str, name: str, now: float, values: Dict):
+        key = f"{kind}.{name}"
+        previous = self._previous.get(key)
+        self._previous[key] = (now, values)
+        if previous is None or now <= previous[0]:
+            return
+        
+        elapsed = now - previous[0]
+        fields = self.DISK_FIELDS if kind == 'disk' else self.NET_FIELDS
+        for field, rate_name in fields.items():
+            delta = values[field] - previous[1][field]
+            if delta < 0:
+                # Sayaç sıfırlandı ya da taştı; bu aralık atlanır
+                continue
+            series = self.series.get((kind, name, rate_name))
+            if series is None:
+                series = self.series[(kind, name, rate_name)] = MetricRing(self.capacity)
+            series.append(delta / elapsed)
+            
+            if name == 'total' and self.active_session is not None:
+                self.active_session['bytes'][f"{kind}_{field}"] += delta
+    
+    def latest_totals(self) -> tuple:
+        """Son toplam hızlar: (disk okuma, disk yazma, ağ alma, ağ gönderme) bayt/sn"""
+        return tuple(self.series[key].latest() if key in self.series else 0.0
+                     for key in (('disk', 'total', 'read_bps'), ('disk', 'total', 'write_bps'),
+                                 ('net', 'total', 'recv_bps'), ('net', 'total', 'sent_bps')))
+    
+    def begin_session(self, session_id):
+        """Güncelleme oturumunun G/Ç toplamını başlat"""
+        with self._lock:
+            self.active_session = {
+                'session_id': session_id,
+                'started': time.monotonic(),
+                'bytes': {f"{kind}_{field}": 0
+                          for kind, fields in (('disk', self.DISK_FIELDS), ('net', self.NET_FIELDS))
+                          for field in fields}
+            }
+    
+    def end_session(self) -> Optional[Dict]:
+        """Oturumu kapat ve ortalama aktarım hızlarını döndür"""
+        with self._lock:
+            if self.active_session is None:
+                return None
+            self.last_session = self._session_throughput(self.active_session, time.monotonic())
+            self.active_session = None
+            return self.last_session
+    
+    @staticmethod
+    def _session_throughput(session: Dict, now: float) -> Dict:
+        duration = max(now - session['started'], 1e-6)
+        result = {'session_id': session['session_id'], 'duration': duration}
+        for field, total in session['bytes'].items():
+            result[field] = total
+            result[f"{field}_per_s"] = total / duration
+        return result
+    
+    def report(self, window: int = None) -> Dict:
+        """Aygıt/arayüz başına hız özetleri, toplam histogramları ve oturum aktarımı"""
+        with self._lock:
+            series = dict(self.series)
+            active = (self._session_throughput(self.active_session, time.monotonic())
+                      if self.active_session is not None else None)
+        
+        report = {'disk': {}, 'net': {}, 'histograms': {},
+                  'active_session': active, 'last_session': self.last_session}
+        for (kind, name, rate_name), ring in sorted(series.items()):
+            report[kind].setdefault(name, {})[rate_name] = ring.summary(window)
+            if name == 'total':
+                bounds = self.IOPS_BOUNDS if rate_name.endswith('iops') else self.BYTE_RATE_BOUNDS
+                report['histograms'][f"{kind}.{rate_name}"] = {
+                    'bounds': bounds,
+                    'counts': ring.histogram(bounds, window)
+                }
+        return report
+
+# ---------- Basınç (PSI) Okuyucu ----------
+class PressureStallReader:
+    """/proc/pressure okuyucu; dosyalar bir kez açılır, her okuma pread ile baştan yapılır"""
+    
+    RESOURCES = ('cpu', 'memory', 'io')
+    
+    def __init__(self, root: str = '/proc/pressure'):
+        self._fds = {}
+        for resource in self.RESOURCES:
+            try:
+                self._fds[resource] = os.open(os.path.join(root, resource), os.O_RDONLY)
+            except (OSError, AttributeError):
+                # PSI yok (eski çekirdek, Linux dışı sistem) ya da kapalı
+                pass
+    
+    def available(self) -> bool:
+        return bool(self._fds)
+    
+    def read(self, resource: str) -> Optional[Dict]:
+        """{'some': {'avg10': .., 'avg60': .., 'avg300': .., 'total': ..}, 'full': {...}}"""
+        fd = self._fds.get(resource)
+        if fd is None:
+            return None
+        try:
+            data = os.pread(fd, 4096, 0).decode()
+        except OSError:
+            return None
+        
+        result = {}
+        for line in data.splitlines():
+            kind, *fields = line.split()
+            result[kind] = {key: float(value) for key, value in (field.split('=') for field in fields)}
+        return result
+    
+    def some_avg10(self) -> Dict[str, float]:
+        """Kaynak başına son 10 saniyedeki 'some' bekleme yüzdesi"""
+        values = {}
+        for resource in self._fds:
+            pressure = self.read(resource)
+            if pressure and 'some' in pressure:
+                values[resource] = pressure['some']['avg10']
+        return values
+    
+    def close(self):
+        """Açık PSI dosyalarını kapat (tekrar çağrılabilir)"""
+        for fd in self._fds.values():
+            os.close(fd)
+        self._fds.clear()
+
+# ---------- /proc Örnekleyici ----------
+DiskCounters = namedtuple('DiskCounters', 'read_count write_count read_bytes write_bytes')
+NetCounters = namedtuple('NetCounters', 'bytes_recv bytes_sent')
+
+class ProcSampler:
+    """CPU, bellek, disk ve ağ sayaçlarını önceden açılmış /proc dosyalarından pread ile okur"""
+    
+    FILES = {
+        'stat': 'stat',
+        'meminfo': 'meminfo',
+        'diskstats': 'diskstats',
+        'net_dev': 'net/dev'
+    }
+    SECTOR_SIZE = 512                 # /proc/diskstats sektörleri her zaman 512 bayttır
+    
+    def __init__(self, root: str = '/proc'):
+        self._fds = {}
+        self._buffer_sizes = dict.fromkeys(self.FILES, 16384)
+        self._previous_cpu = None
+        for name, relative_path in self.FILES.items():
+            self._fds[name] = os.open(os.path.join(root, relative_path), os.O_RDONLY)
+        try:
+            # Toplam için yalnız bütün diskler (bölümler iki kez sayılmasın)
+            self._whole_disks = set(os.listdir('/sys/block'))
+        except OSError:
+            self._whole_disks = None
+    
+    @classmethod
+    def available(cls, root: str = '/proc') -> bool:
+        return hasattr(os, 'pread') and all(
+            os.path.exists(os.path.join(root, path)) for path in cls.FILES.values())
+    
+    def _read(self, name: str) -> str:
+        """Dosyayı baştan oku; tampon yetmezse büyütüp tekrar dene"""
+        while True:
+            size = self._buffer_sizes[name]
+            data = os.pread(self._fds[name], size, 0)
+            if len(data) < size:
+                return data.decode('ascii', 'replace')
+            self._buffer_sizes[name] = size * 2
+    
+    def cpu_percent(self) -> float:
+        """Son çağrıdan beri toplam CPU kullanımı (ilk çağrıda 0)"""
+        fields = self._read('stat').split('\n', 1)[0].split()[1:]
+        values = [int(value) for value in fields[:8]]   # user..steal; guest zaten user içinde
+        total = sum(values)
+        idle = values[3] + values[4]                    # idle + iowait
+        
+        previous = self._previous_cpu
+        self._previous_cpu = (total, idle)
+        if previous is None or total <= previous[0]:
+            return 0.0
+        return 100.0 * (1 - (idle - previous[1]) / (total - previous[0]))
+    
+    def memory_percent(self) -> float:
+        """(MemTotal - MemAvailable) / MemTotal, psutil ile aynı tanım"""
+        values = {}
+        for line in self._read('meminfo').splitlines():
+            key, _, rest = line.partition(':')
+            if key in ('MemTotal', 'MemAvailable'):
+                values[key] = int(rest.split()[0])
+                if len(values) == 2:
+                    break
+        total = values.get('MemTotal')
+        if not total:
+            return 0.0
+        return 100.0 * (total - values.get('MemAvailable', 0)) / total
+    
+    def read_disks(self):
+        """(aygıt başına sayaçlar, bütün disklerin toplamı)"""
+        disks = {}
+        total = [0, 0, 0, 0]
+        for line in self._read('diskstats').splitlines():
+            fields = line.split()
+            if len(fields) < 10:
+                continue
+            name = fields[2]
+            counters = DiskCounters(
+                read_count=int(fields[3]),
+                write_count=int(fields[7]),
+                read_bytes=int(fields[5]) * self.SECTOR_SIZE,
+                write_bytes=int(fields[9]) * self.SECTOR_SIZE
+            )
+            disks[name] = counters
+            if self._whole_disks is None or name in self._whole_disks:
+                if not IORateTracker.ignored(name):
+                    total = [a + b for a, b in zip(total, counters)]
+        return disks, DiskCounters(*total)
+    
+    def read_network(self) -> Dict:
+        """Arayüz başına alınan/gönderilen baytlar"""
+        interfaces = {}
+        for line in self._read('net_dev').splitlines()[2:]:
+            name, _, rest = line.partition(':')
+            fields = rest.split()
+            if len(fields) >= 9:
+                interfaces[name.strip()] = NetCounters(bytes_recv=int(fields[0]), bytes_sent=int(fields[8]))
+        return interfaces
+    
+    def close(self):
+        for fd in self._fds.values():
+            os.close(fd)
+        self._fds.clear()
+
+# ---------- Basınç Kapısı ----------
+class PressureStallGate:
+    """Her komuttan önce PSI eşiklerini denetler; baskı sürdükçe (en fazla max_deferral) bekler"""
+    
+    # Kaynak -> {'some'/'full': avg10 yüzde eşiği}
+    DEFAULT_THRESHOLDS = {
+        'cpu': {'some': 50.0},
+        'memory': {'some': 10.0, 'full': 5.0},
+        'io': {'some': 25.0, 'full': 10.0}
+    }
+    
+    def __init__(self, thresholds: Dict = None, max_deferral: float = 600, on_timeout: str = "proceed",
+                 window: float = 2.0, reader: PressureStallReader = None):
+        self.thresholds = thresholds or self.DEFAULT_THRESHOLDS
+        self.max_deferral = max_deferral
+        self.on_timeout = on_timeout          # "proceed" ya da "abort"
+        self.window = window                  # yetkisiz tetikleyiciler 2 sn'nin katı olmalı
+        self.owns_reader = reader is None     # dışarıdan verilen okuyucuyu sahibi kapatır
+        self.reader = reader or PressureStallReader()
+        
+    def check(self) -> List[str]:
+        """Eşiği aşan sinyalleri açıklamalarıyla döndür (boşsa kapı açık)"""
+        reasons = []
+        for resource, limits in self.thresholds.items():
+            pressure = self.reader.read(resource)
+            if not pressure:
+                continue
+            for kind, threshold in limits.items():
+                value = pressure.get(kind, {}).get('avg10', 0.0)
+                if value > threshold:
+                    reasons.append(f"{resource} {kind} avg10 {value:.1f} > {threshold:.1f}")
+        return reasons
+        
+    def close(self):
+        """Kapının açtığı PSI dosyalarını kapat"""
+        if self.owns_reader:
+            self.reader.close()
+        
+    def wait(self, on_defer=None) -> Dict:
+        """Baskı geçene ya da süre dolana kadar bekle; bekleme bilgisini döndür"""
+        reasons = self.check()
+        result = {'deferred_seconds': 0.0, 'reasons': reasons, 'timed_out': False, 'proceed': True}
+        if not reasons:
+            return result
+        
+        if on_defer:
+            on_defer(reasons)
+        
+        started = time.monotonic()
+        deadline = started + self.max_deferral
+        triggers = self._open_triggers()
+        try:
+            while reasons and time.monotonic() < deadline:
+                timeout = min(self.window, deadline - time.monotonic())
+                if triggers:
+                    # Tam bir pencere boyunca tetikleyici düşmediyse çekişme bitmiştir
+                    quiet = self._quiet_window(triggers, timeout)
+                    if quiet is None:
+                        for fd in triggers:
+                            os.close(fd)
+                        triggers = []
+                        continue
+                    if quiet:
+                        reasons = []
+                        break
+                else:
+                    # Tetikleyici kurulamadı (yetki/çekirdek); ortalamaları aralıklı yokla
+                    time.sleep(max(timeout, 0))
+                reasons = self.check()
+        finally:
+            for fd in triggers:
+                os.close(fd)
+        
+        result['deferred_seconds'] = time.monotonic() - started
+        if reasons:
+            result['timed_out'] = True
+            result['proceed'] = self.on_timeout != "abort"
+        return result
+        
+    def _open_triggers(self) -> List[int]:
+        """Aşılan eşikler için PSI tetikleyicileri kur (pencerede eşik kadar takılma olunca uyanır)"""
+        if not hasattr(select, 'poll'):
+            return []
+        window_us = int(self.window * 1_000_000)
+        triggers = []
+        for resource, limits in self.thresholds.items():
+            for kind, threshold in limits.items():
+                stall_us = max(1, int(window_us * threshold / 100))
+                try:
+                    fd = os.open(f"/proc/pressure/{resource}", os.O_RDWR | os.O_NONBLOCK)
+                except OSError:
+                    continue
+                try:
+                    os.write(fd, f"{kind} {stall_us} {window_us}".encode() + b"\0")
+                    triggers.append(fd)
+                except OSError:
+                    os.close(fd)
+        return triggers
+        
+    @staticmethod
+    def _quiet_window(triggers: List[int], timeout: float) -> Optional[bool]:
+        """timeout boyunca olay yoksa True, takılma olayı gelirse False, tetikleyici bozulduysa None"""
+        poller = select.poll()
+        for fd in triggers:
+            poller.register(fd, select.POLLPRI)
+        
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return True
+            events = poller.poll(remaining * 1000)
+            if any(event & (select.POLLERR | select.POLLNVAL) for _, event in events):
+                # Tetikleyici geçersiz; ortalamalara dönülür
+                return None
+            if any(event & select.POLLPRI for _, event in events):
+                return False
+
+# ---------- Metrik Kaydı (Prometheus) ----------
+class MetricsRegistry:
+    """Bellek içi sayaç, gösterge ve histogramlar; Prometheus metin formatında sunulur"""
+    
+    def __init__(self):
+        self._metrics = {}            # isim -> tanım ve etiket başına değerler
+        self._collectors = []         # kazıma anında göstergeleri tazeleyen fonksiyonlar
+        self._lock = threading.Lock()
+    
+    def counter(self, name: str, help_text: str):
+        self._define(name, 'counter', help_text)
+    
+    def gauge(self, name: str, help_text: str):
+        self._define(name, 'gauge', help_text)
+    
+    def histogram(self, name: str, help_text: str, buckets):
+        self._define(name, 'histogram', help_text, sorted(buckets))
+    
+    def _define(self, name, kind, help_text, buckets=None):
+        # Aynı metrik birden fazla bileşen tarafından tanımlanabilir
+        with self._lock:
+            self._metrics.setdefault(name, {
+                'type': kind, 'help': help_text, 'buckets': buckets, 'values': {}
+            })
+    
+    def add_collector(self, collector):
+        """Her kazımada çağrılacak fonksiyon ekle (yalnız bellekteki veriyi okumalı)"""
+        self._collectors.append(collector)
+    
+    def inc(self, name: str, amount: float = 1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            values = self._metrics[name]['values']
+            values[key] = values.get(key, 0) + amount
+    
+    def set(self, name: str, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._metrics[name]['values'][key] = value
+    
+    def observe(self, name: str, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            metric = self._metrics[name]
+            state = metric['values'].get(key)
+            if state is None:
+                # [kova sayıları (+Inf dahil), toplam, adet]
+                state = metric['values'][key] = [[0] * (len(metric['buckets']) + 1), 0.0, 0]
+            state[0][bisect_left(metric['buckets'], value)] += 1
+            state[1] += value
+            state[2] += 1
+    
+    def render(self) -> str:
+        """Prometheus metin formatı (0.0.4)"""
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception as e:
+                print(f"Metrik toplayıcı hatası: {e}")
+        
+        lines = []
+        with self._lock:
+            for name, metric in sorted(self._metrics.items()):
+                lines.append(f"# HELP {name} {metric['help']}")
+                lines.append(f"# TYPE {name} {metric['type']}")
+                for key, value in sorted(metric['values'].items()):
+                    if metric['type'] != 'histogram':
+                        lines.append(f"{name}{self._labels(key)} {self._number(value)}")
+                        continue
+                    counts, total, observations = value
+                    cumulative = 0
+                    for bound, bucket_count in zip(metric['buckets'] + ['+Inf'], counts):
+                        cumulative += bucket_count
+                        le = bound if bound == '+Inf' else self._number(bound)
+                        lines.append(f"{name}_bucket{self._labels(key + (('le', le),))} {cumulative}")
+                    lines.append(f"{name}_sum{self._labels(key)} {self._number(total)}")
+                    lines.append(f"{name}_count{self._labels(key)} {observations}")
+        return "\n".join(lines) + "\n"
+    
+    @staticmethod
+    def _labels(key) -> str:
+        if not key:
+            return ""
+        pairs = []
+        for label, value in key:
+            value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+            pairs.append(f'{label}="{value}"')
+        return "{" + ",".join(pairs) + "}"
+    
+    @staticmethod
+    def _number(value) -> str:
+        if isinstance(value, float):
+            if value != value:
+                return "NaN"
+            if value in (float('inf'), float('-inf')):
+                return "+Inf" if value > 0 else "-Inf"
+            return repr(value)
+        return str(value)
+
+# ---------- Komut Satırı ----------
+def parse_cli_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Ölçüm aracı bayraklarını ayrıştır; hiçbiri verilmezse GUI açılır"""
+    parser = argparse.ArgumentParser(description="Evrensel sistem güncelleyici")
+    tools = parser.add_argument_group("ölçüm araçları", "GUI açılmaz, sonuç JSON olarak yazdırılır")
+    tools.add_argument('--benchmark-cron', nargs='?', type=int, const=10000, metavar='N',
+                       help="N rastgele cron ifadesini ayrıştır ve sonraki çalışmayı hesapla (varsayılan 10000)")
+    tools.add_argument('--simulate-splay', nargs='?', type=int, const=500, metavar='HOSTS',
+                       help="Aynı saate zamanlanmış HOSTS makinenin başlangıç tepesini yaymalı/yaymasız karşılaştır")
+    tools.add_argument('--benchmark-dashboard', action='store_true',
+                       help="Süreç içinde geçici bir dashboard başlat ve eşzamanlı istemcilerle yükle")
+    tools.add_argument('--seed', type=int, default=1, help="--benchmark-cron için rastgele tohum")
+    tools.add_argument('--splay-minutes', type=float, default=30, help="--simulate-splay yayma penceresi")
+    tools.add_argument('--cohorts', type=int, default=1, help="--simulate-splay kohort sayısı")
+    tools.add_argument('--clients', type=int, default=100, help="--benchmark-dashboard istemci sayısı")
+    tools.add_argument('--requests', type=int, default=50, help="--benchmark-dashboard istemci başına istek")
+    tools.add_argument('--path', default='/api/status', help="--benchmark-dashboard istek yolu")
+    return parser.parse_args(argv)
+
+def cli_tool_requested(args: argparse.Namespace) -> bool:
+    """Bir ölçüm aracı istendiyse True (GUI'ler atlanır)"""
+    return (args.benchmark_cron is not None or args.simulate_splay is not None
+            or args.benchmark_dashboard)
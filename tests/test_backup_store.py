@@ -0,0 +1,214 @@
+"""
+Yedek deposu için gidiş-dönüş testleri
+ParallelZipWriter zipfile'ın iç alanlarına yazdığından arşiv standart ZipFile ile geri okunarak doğrulanır;
+ChunkStore yedekleri geri yüklenip kaynakla karşılaştırılır
+"""
+
+import builtins
+import hashlib
+import json
+import os
+import sys
+import zipfile
+import zlib
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from SistemGuncelleyici import backup_store
+from SistemGuncelleyici.backup_store import ChunkStore, ParallelZipWriter, archive_name, scan_files
+
+
+# ---------- Yardımcılar ----------
+
+def make_tree(root):
+    """Boş, küçük, blok sınırına denk gelen ve çok bloklu dosyalar; sıkışan ve sıkışmayan içerik"""
+    contents = {
+        "empty.txt": b"",
+        "small.txt": b"merhaba\n",
+        "exact.bin": os.urandom(ParallelZipWriter.BLOCK_SIZE),
+        "sub/dir/repeat.txt": b"abcdefgh" * 300000,
+        "sub/mixed.bin": os.urandom(700000) + b"\0" * 900000 + os.urandom(50000),
+    }
+    for relative, data in contents.items():
+        path = os.path.join(root, *relative.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+    return {os.path.join(root, *relative.split("/")): data for relative, data in contents.items()}
+
+
+class FailingReader:
+    """İlk bloktan sonra okuma hatası veren dosya"""
+
+    def __init__(self, f):
+        self.f = f
+        self.reads = 0
+
+    def read(self, size=-1):
+        self.reads += 1
+        if self.reads > 1:
+            raise OSError(5, "Input/output error")
+        return self.f.read(size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.f.close()
+
+
+def read_tree(root):
+    """Göreli yol -> (içerik, izinler, mtime_ns)"""
+    tree = {}
+    for path, st in scan_files([root]):
+        with open(path, "rb") as f:
+            tree[os.path.relpath(path, root)] = (f.read(), st.st_mode & 0o7777, st.st_mtime_ns)
+    return tree
+
+
+def restored_tree(target, source):
+    """ChunkStore.restore target_root altına kaynağın arşiv adıyla kurar"""
+    return read_tree(os.path.join(target, *archive_name(source).split("/")))
+
+
+def small_chunk_store(root):
+    store = ChunkStore(root)
+    # Küçük parçalar: birkaç yüz KB'lık dosyalar da çok parçalı olur
+    store.CHUNK_SIZE = 64 * 1024
+    return store
+
+
+# ---------- Testler ----------
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_parallel_zip_round_trip(tmp_path, workers):
+    files = make_tree(str(tmp_path / "src"))
+    archive = str(tmp_path / "backup.zip")
+
+    stats = ParallelZipWriter(archive, workers=workers).write(scan_files([str(tmp_path / "src")]),
+                                                              [str(tmp_path / "src")])
+
+    assert stats["files"] == len(files)
+    assert stats["errors"] == 0
+    assert stats["bytes_in"] == sum(len(data) for data in files.values())
+    with zipfile.ZipFile(archive) as zipf:
+        assert zipf.testzip() is None
+        manifest = json.loads(zipf.read(ParallelZipWriter.MANIFEST_NAME))
+        assert sorted(zipf.namelist()) == sorted([archive_name(path) for path in files]
+                                                 + [ParallelZipWriter.MANIFEST_NAME])
+        for path, data in files.items():
+            name = archive_name(path)
+            assert zipf.read(name) == data
+            assert zipf.getinfo(name).file_size == len(data)
+            assert manifest["files"][name]["sha256"] == hashlib.sha256(data).hexdigest()
+
+
+def test_unreadable_file_is_skipped(tmp_path, monkeypatch):
+    files = make_tree(str(tmp_path / "src"))
+    broken = os.path.join(str(tmp_path / "src"), "sub", "mixed.bin")
+
+    def failing_open(path, *args, **kwargs):
+        f = builtins.open(path, *args, **kwargs)
+        return FailingReader(f) if path == broken else f
+
+    monkeypatch.setattr(backup_store, "open", failing_open, raising=False)
+    archive = str(tmp_path / "backup.zip")
+    stats = ParallelZipWriter(archive, workers=2).write(scan_files([str(tmp_path / "src")]))
+
+    assert stats["errors"] == 1
+    assert stats["files"] == len(files) - 1
+    assert stats["bytes_in"] == sum(len(data) for path, data in files.items() if path != broken)
+    with zipfile.ZipFile(archive) as zipf:
+        assert zipf.testzip() is None
+        assert archive_name(broken) not in zipf.namelist()
+        for path, data in files.items():
+            if path != broken:
+                assert zipf.read(archive_name(path)) == data
+
+
+def test_chunk_store_round_trip(tmp_path):
+    source = str(tmp_path / "src")
+    make_tree(source)
+    os.chmod(os.path.join(source, "small.txt"), 0o600)
+    store = small_chunk_store(str(tmp_path / "store"))
+
+    manifest = store.backup("first", [source])
+    assert manifest["stats"]["files"] == 5
+    assert manifest["stats"]["errors"] == 0
+    assert store.list_backups() == ["first"]
+
+    target = str(tmp_path / "restore")
+    assert store.restore("first", target) == 5
+    assert restored_tree(target, source) == read_tree(source)
+
+
+def test_chunk_store_dedupes_unchanged_and_repeated_data(tmp_path):
+    source = str(tmp_path / "src")
+    make_tree(source)
+    store = small_chunk_store(str(tmp_path / "store"))
+
+    first = store.backup("first", [source])["stats"]
+    # repeat.txt aynı 64 KB'lık parçanın tekrarı: tek parça olarak saklanır
+    assert first["reused_chunks"] > 0
+    chunk_count = sum(len(files) for _, _, files in os.walk(store.chunk_dir))
+    assert chunk_count == first["new_chunks"]
+
+    second = store.backup("second", [source])["stats"]
+    assert second["cached_files"] == 5
+    assert second["new_chunks"] == 0 and second["stored_bytes"] == 0
+
+    # Yalnız değişen parça yeniden yazılır; önbellek boyut+mtime'a bakar
+    changed = os.path.join(source, "sub", "mixed.bin")
+    with open(changed, "r+b") as f:
+        f.seek(100)
+        f.write(b"degisti")
+    os.utime(changed, ns=(1_700_000_000_000_000_000, 1_700_000_000_000_000_000))
+    third = store.backup("third", [source])["stats"]
+    assert third["cached_files"] == 4
+    assert third["new_chunks"] == 1
+
+    target = str(tmp_path / "restore")
+    store.restore("third", target)
+    assert restored_tree(target, source) == read_tree(source)
+
+
+def test_chunk_store_garbage_collect_keeps_live_chunks(tmp_path):
+    source = str(tmp_path / "src")
+    make_tree(source)
+    store = small_chunk_store(str(tmp_path / "store"))
+    store.backup("old", [source])
+    original = read_tree(source)
+
+    with open(os.path.join(source, "exact.bin"), "wb") as f:
+        f.write(os.urandom(ParallelZipWriter.BLOCK_SIZE))
+    os.utime(os.path.join(source, "exact.bin"), ns=(1_700_000_000_000_000_000, 1_700_000_000_000_000_000))
+    store.backup("new", [source])
+
+    assert store.garbage_collect() == 0
+    assert store.delete_backup("old")
+    assert not store.delete_backup("old")
+    # Yalnız eski exact.bin'in parçaları artık başvurusuz
+    assert store.garbage_collect() == ParallelZipWriter.BLOCK_SIZE // store.CHUNK_SIZE
+
+    target = str(tmp_path / "restore")
+    store.restore("new", target)
+    restored = restored_tree(target, source)
+    assert restored == read_tree(source)
+    assert restored["exact.bin"] != original["exact.bin"]
+    with pytest.raises(FileNotFoundError):
+        store.restore("old", target)
+
+
+def test_chunk_store_detects_corrupt_chunk(tmp_path):
+    source = str(tmp_path / "src")
+    make_tree(source)
+    store = small_chunk_store(str(tmp_path / "store"))
+    manifest = store.backup("first", [source])
+    digest = next(entry["chunks"][0] for entry in manifest["files"] if entry["chunks"])
+
+    with open(store.chunk_path(digest), "wb") as f:
+        f.write(zlib.compress(b"baska veri"))
+    with pytest.raises(ValueError):
+        store.read_chunk(digest)
@@ -0,0 +1,309 @@
+"""
+CronExpression için özellik tabanlı testler
+Beklenen sonuçlar, ifadenin yapısal tanımından gün gün tarayan bağımsız bir referansla üretilir
+"""
+
+import calendar
+import os
+import random
+import sys
+from datetime import date, datetime, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from SistemGuncelleyici.cron_expression import CronExpression, benchmark_cron
+
+MONTH_NAMES = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+DAY_NAMES = ["sun", "mon", "tue", "wed", "thu", "fri", "sat"]
+HORIZON_DAYS = 366 * 6
+
+
+# ---------- Rastgele ifade üretimi ----------
+# Her alan parça listesidir; parça (tür, ...) demetidir ve metne ayrıca çevrilir
+
+def random_part(rng, low, high):
+    kind = rng.choice(["star", "star", "value", "value", "range", "from"])
+    step = rng.choice([1, 1, 2, 3, 5, 7])
+    if kind == "star":
+        return ("star", step)
+    if kind == "value":
+        return ("value", rng.randint(low, high))
+    if kind == "range":
+        # Sarmalayan aralıklar (22-2 gibi) da üretilir
+        return ("range", rng.randint(low, high), rng.randint(low, high), step)
+    return ("from", rng.randint(low, high), rng.choice([2, 3, 5]))
+
+
+def random_field(rng, low, high):
+    return [random_part(rng, low, high) for _ in range(rng.choice([1, 1, 1, 2, 3]))]
+
+
+def random_dom(rng):
+    parts = []
+    for _ in range(rng.choice([1, 1, 1, 2])):
+        special = rng.random()
+        if special < 0.1:
+            parts.append(("last", 0))
+        elif special < 0.15:
+            parts.append(("last", rng.randint(1, 5)))
+        elif special < 0.25:
+            parts.append(("weekday", rng.randint(1, 31)))
+        elif special < 0.3:
+            parts.append(("last_weekday",))
+        else:
+            parts.append(random_part(rng, 1, 31))
+    return parts
+
+
+def random_dow(rng):
+    parts = []
+    for _ in range(rng.choice([1, 1, 1, 2])):
+        special = rng.random()
+        if special < 0.1:
+            parts.append(("last_dow", rng.randint(0, 7)))
+        elif special < 0.2:
+            parts.append(("nth_dow", rng.randint(0, 7), rng.randint(1, 5)))
+        else:
+            parts.append(random_part(rng, 0, 7))
+    return parts
+
+
+def random_spec(rng):
+    return {
+        "minute": random_field(rng, 0, 59),
+        "hour": random_field(rng, 0, 23),
+        "dom": random_dom(rng),
+        "month": random_field(rng, 1, 12),
+        "dow": random_dow(rng),
+        "question_mark": rng.random() < 0.1,
+    }
+
+
+def part_text(rng, part, names=None, low=0):
+    def value(number):
+        if names and rng.random() < 0.5:
+            return names[number - low] if number - low < len(names) else str(number)
+        return str(number)
+
+    kind = part[0]
+    if kind == "star":
+        return "*" if part[1] == 1 else f"*/{part[1]}"
+    if kind == "value":
+        return value(part[1])
+    if kind == "range":
+        text = f"{value(part[1])}-{value(part[2])}"
+        return text if part[3] == 1 else f"{text}/{part[3]}"
+    if kind == "from":
+        return f"{value(part[1])}/{part[2]}"
+    if kind == "last":
+        return "L" if part[1] == 0 else f"L-{part[1]}"
+    if kind == "weekday":
+        return f"{part[1]}W"
+    if kind == "last_weekday":
+        return "LW"
+    if kind == "last_dow":
+        return f"{part[1]}L"
+    return f"{part[1]}#{part[2]}"
+
+
+def spec_text(rng, spec):
+    fields = [
+        ",".join(part_text(rng, part) for part in spec["minute"]),
+        ",".join(part_text(rng, part) for part in spec["hour"]),
+        ",".join(part_text(rng, part) for part in spec["dom"]),
+        ",".join(part_text(rng, part, MONTH_NAMES, 1) for part in spec["month"]),
+        ",".join(part_text(rng, part, DAY_NAMES, 0) for part in spec["dow"]),
+    ]
+    if spec["question_mark"]:
+        # '?' yalnız '*' yerine, gün alanlarından birinin başında kullanılır
+        index = rng.choice([2, 4])
+        if fields[index].startswith("*"):
+            fields[index] = "?" + fields[index][1:]
+    return " ".join(fields)
+
+
+# ---------- Bağımsız referans ----------
+
+def part_allows(part, number, low, high):
+    """Sayısal parça number değerine izin veriyor mu (aralık başından uzaklık ve adımla)"""
+    size = high - low + 1
+    kind = part[0]
+    if kind == "star":
+        return (number - low) % part[1] == 0
+    if kind == "value":
+        return number == part[1]
+    if kind == "range":
+        _, start, end, step = part
+        offset = (number - start) % size
+        return offset <= (end - start) % size and offset % step == 0
+    if kind == "from":
+        return number >= part[1] and (number - part[1]) % part[2] == 0
+    return False
+
+
+def field_allows(parts, number, low, high):
+    return any(part_allows(part, number, low, high) for part in parts)
+
+
+def cron_weekday(day):
+    """Pazar=0"""
+    return (day.weekday() + 1) % 7
+
+
+def dom_allows(parts, day):
+    last = calendar.monthrange(day.year, day.month)[1]
+    for part in parts:
+        kind = part[0]
+        if kind == "last":
+            if day.day == last - part[1]:
+                return True
+        elif kind == "weekday":
+            target = part[1]
+            if target > last:
+                continue
+            weekday = date(day.year, day.month, target).weekday()
+            if weekday == 5:
+                target = target - 1 if target > 1 else target + 2
+            elif weekday == 6:
+                target = target + 1 if target < last else target - 2
+            if day.day == target:
+                return True
+        elif kind == "last_weekday":
+            target = last
+            while date(day.year, day.month, target).weekday() >= 5:
+                target -= 1
+            if day.day == target:
+                return True
+        elif part_allows(part, day.day, 1, 31):
+            return True
+    return False
+
+
+def dow_allows(parts, day):
+    last = calendar.monthrange(day.year, day.month)[1]
+    weekday = cron_weekday(day)
+    for part in parts:
+        kind = part[0]
+        if kind == "last_dow":
+            if weekday == part[1] % 7 and day.day + 7 > last:
+                return True
+        elif kind == "nth_dow":
+            if weekday == part[1] % 7 and (day.day - 1) // 7 + 1 == part[2]:
+                return True
+        elif any(part_allows(part, number, 0, 7) for number in (weekday, weekday + 7) if number <= 7):
+            return True
+    return False
+
+
+def day_allowed(spec, text, day):
+    if not field_allows(spec["month"], day.month, 1, 12):
+        return False
+    dom_text, dow_text = text.split()[2], text.split()[4]
+    dom_ok = dom_allows(spec["dom"], day)
+    dow_ok = dow_allows(spec["dow"], day)
+    if dom_text.startswith(("*", "?")) or dow_text.startswith(("*", "?")):
+        return dom_ok and dow_ok
+    return dom_ok or dow_ok
+
+
+def reference_matches(spec, text, moment):
+    return (field_allows(spec["minute"], moment.minute, 0, 59)
+            and field_allows(spec["hour"], moment.hour, 0, 23)
+            and day_allowed(spec, text, moment.date()))
+
+
+def reference_next(spec, text, after):
+    """after'dan sonraki ilk eşleşme; HORIZON_DAYS içinde yoksa None"""
+    hours = [hour for hour in range(24) if field_allows(spec["hour"], hour, 0, 23)]
+    minutes = [minute for minute in range(60) if field_allows(spec["minute"], minute, 0, 59)]
+    day = after.date()
+    for _ in range(HORIZON_DAYS):
+        if day_allowed(spec, text, day):
+            for hour in hours:
+                for minute in minutes:
+                    candidate = datetime(day.year, day.month, day.day, hour, minute)
+                    if candidate > after:
+                        return candidate
+        day += timedelta(days=1)
+    return None
+
+
+def random_moment(rng):
+    return datetime(2020, 1, 1) + timedelta(minutes=rng.randrange(60 * 24 * 366 * 16),
+                                            seconds=rng.randrange(60))
+
+
+# ---------- Testler ----------
+
+@pytest.mark.parametrize("seed", range(8))
+def test_next_after_agrees_with_reference(seed):
+    rng = random.Random(seed)
+    for _ in range(40):
+        spec = random_spec(rng)
+        text = spec_text(rng, spec)
+        cron = CronExpression(text)
+        for _ in range(3):
+            after = random_moment(rng)
+            expected = reference_next(spec, text, after)
+            actual = cron.next_after(after)
+            if expected is None:
+                horizon = datetime.combine(after.date() + timedelta(days=HORIZON_DAYS), datetime.min.time())
+                assert actual is None or actual >= horizon, (text, after, actual)
+            else:
+                assert actual == expected, (text, after)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_matches_agrees_with_reference(seed):
+    rng = random.Random(1000 + seed)
+    for _ in range(100):
+        spec = random_spec(rng)
+        text = spec_text(rng, spec)
+        cron = CronExpression(text)
+        for _ in range(20):
+            moment = random_moment(rng).replace(second=0)
+            assert cron.matches(moment) == reference_matches(spec, text, moment), (text, moment)
+
+
+@pytest.mark.parametrize("text, weekdays, days", [
+    # Gün alanlarından biri '*' ile başlıyorsa iki alan da tutmalı
+    ("0 0 */2 * *", None, range(1, 32, 2)),
+    ("0 0 * * */2", {0, 2, 4, 6}, None),
+    ("0 0 */2 * 1", {1}, range(1, 32, 2)),
+    ("0 0 ? * mon-fri", {1, 2, 3, 4, 5}, None),
+])
+def test_star_day_field_intersects(text, weekdays, days):
+    cron = CronExpression(text)
+    moment = datetime(2026, 1, 1)
+    for _ in range(60):
+        moment = cron.next_after(moment)
+        if weekdays is not None:
+            assert cron_weekday(moment) in weekdays, (text, moment)
+        if days is not None:
+            assert moment.day in days, (text, moment)
+
+
+def test_restricted_day_fields_union():
+    cron = CronExpression("0 0 1,15 * mon")
+    runs = []
+    moment = datetime(2026, 1, 1)
+    while True:
+        moment = cron.next_after(moment)
+        if moment.month != 1:
+            break
+        runs.append(moment.day)
+    # 1 ve 15 artı Ocak 2026'nın pazartesileri
+    assert runs == [5, 12, 15, 19, 26]
+
+
+def test_impossible_date_has_no_next_run():
+    assert CronExpression("0 0 31 2 *").next_after(datetime(2026, 1, 1)) is None
+    assert CronExpression("0 0 30 feb mon").next_after(datetime(2026, 1, 1)).weekday() == 0
+
+
+def test_benchmark_cron_runs():
+    result = benchmark_cron(count=300, seed=7)
+    assert result["expressions"] == 300
+    assert result["unmatched"] == 0
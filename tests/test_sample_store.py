@@ -0,0 +1,151 @@
+"""
+MonitorSampleStore için gidiş-dönüş testleri
+Delta kodlama, oturum etiketleri ve ham örneklerin özet kovalarına indirilmesi geçici bir veritabanıyla denenir
+"""
+
+import json
+import os
+import random
+import sqlite3
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from SistemGuncelleyici.sample_store import MonitorSampleStore
+
+DAY = 86400
+
+
+# ---------- Yardımcılar ----------
+
+def bucket_aligned(seconds_ago, bucket_seconds=300):
+    """Kova başından 10 sn sonrası: aynı kovaya düşen ardışık örnekler için"""
+    moment = time.time() - seconds_ago
+    return moment - moment % bucket_seconds + 10
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = MonitorSampleStore(str(tmp_path / "history.db"), batch_size=4)
+    # Her yazımda eski örnekler özetlensin
+    store.DOWNSAMPLE_EVERY = 0
+    return store
+
+
+def rollups(store):
+    conn = sqlite3.connect(store.db_path)
+    rows = conn.execute('SELECT bucket_start_ms, session_id, sample_count, stats FROM monitor_rollups '
+                        'ORDER BY bucket_start_ms, session_id').fetchall()
+    conn.close()
+    return [(bucket, session, count, json.loads(stats)) for bucket, session, count, stats in rows]
+
+
+def raw_sessions(store):
+    conn = sqlite3.connect(store.db_path)
+    rows = conn.execute('SELECT session_id, SUM(sample_count) FROM monitor_samples '
+                        'GROUP BY session_id ORDER BY session_id IS NULL, session_id').fetchall()
+    conn.close()
+    return rows
+
+
+# ---------- Testler ----------
+
+@pytest.mark.parametrize("seed", range(5))
+def test_encode_decode_round_trip(seed):
+    rng = random.Random(seed)
+    start = 1_700_000_000_000
+    rows = []
+    for index in range(rng.randint(1, 300)):
+        rows.append((start + index * rng.randint(1, 5000),
+                     rng.randint(0, 1000), rng.randint(0, 1000),
+                     rng.randint(0, 2 ** 40), rng.randint(0, 2 ** 40),
+                     rng.choice([0, rng.randint(0, 2 ** 50)]), rng.randint(0, 10)))
+    data = MonitorSampleStore.encode(rows)
+    assert MonitorSampleStore.decode(data, len(rows)) == rows
+
+
+def test_samples_are_stored_per_session(store):
+    now = time.time()
+    store.set_context(1, "apt upgrade")
+    for index in range(6):
+        store.append(10 + index, 50.04, disk_read=100, disk_write=20, net_recv=7, net_sent=3,
+                     timestamp=now + index)
+    store.set_context(2)
+    store.append(99.5, 1, timestamp=now + 10)
+    store.set_context(None)
+    store.append(5, 5, timestamp=now + 11)
+    store.flush()
+
+    first = store.get_session_samples(1)
+    assert not first["downsampled"]
+    assert first["series"]["cpu"] == [10.0, 11.0, 12.0, 13.0, 14.0, 15.0]
+    assert first["series"]["memory"] == [50.0] * 6
+    assert first["series"]["disk"] == [120] * 6
+    assert first["series"]["net"] == [10] * 6
+    assert first["timestamps"][0] == pytest.approx(now, abs=0.001)
+    assert store.get_session_samples(2)["series"]["cpu"] == [99.5]
+    assert raw_sessions(store) == [(1, 6), (2, 1), (None, 1)]
+
+
+def test_old_samples_roll_up_and_merge_into_one_bucket(store):
+    start = bucket_aligned(8 * DAY)
+    store.set_context(7)
+    for index, cpu in enumerate([10, 30, 50, 70]):
+        store.append(cpu, 20, disk_read=index * 100, timestamp=start + index)
+    # İkinci grup aynı kovaya düşer: mevcut kovayla örnek sayısına göre birleştirilir
+    for index, cpu in enumerate([90, 90, 0, 0]):
+        store.append(cpu, 40, timestamp=start + 10 + index)
+
+    [(bucket, session, count, stats)] = rollups(store)
+    assert session == 7
+    assert bucket == int(start * 1000) // 300000 * 300000
+    assert count == 8
+    assert stats["cpu_permille"] == [0, pytest.approx(425.0), 900]
+    assert stats["memory_permille"] == [200, pytest.approx(300.0), 400]
+    assert stats["disk_read_bps"][2] == 300
+    assert raw_sessions(store) == []
+
+    curve = store.get_session_samples(7)
+    assert curve["downsampled"]
+    assert curve["series"]["cpu"] == [pytest.approx(42.5)]
+
+
+def test_idle_samples_are_dropped_not_rolled_up(store):
+    start = bucket_aligned(8 * DAY)
+    store.set_context(None)
+    for index in range(4):
+        store.append(50, 50, timestamp=start + index)
+    store.set_context(3)
+    for index in range(4):
+        store.append(50, 50, timestamp=time.time() + index)
+    store.flush()
+
+    assert rollups(store) == []
+    assert raw_sessions(store) == [(3, 4)]
+
+
+def test_expired_rollups_are_deleted(store):
+    store.rollup_retention_days = 30
+    store.set_context(4)
+    for index in range(4):
+        store.append(10, 10, timestamp=bucket_aligned(40 * DAY) + index)
+    for index in range(4):
+        store.append(20, 20, timestamp=bucket_aligned(10 * DAY) + index)
+    store.flush()
+
+    [(bucket, session, count, _)] = rollups(store)
+    assert bucket > (time.time() - 30 * DAY) * 1000
+    assert (session, count) == (4, 4)
+
+
+def test_rollup_bucket_is_unique(store):
+    conn = sqlite3.connect(store.db_path)
+    conn.execute("INSERT INTO monitor_rollups (bucket_start_ms, bucket_seconds, session_id, sample_count, stats) "
+                 "VALUES (0, 300, 1, 1, '{}')")
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute("INSERT INTO monitor_rollups (bucket_start_ms, bucket_seconds, session_id, sample_count, stats) "
+                     "VALUES (0, 300, 1, 1, '{}')")
+    conn.close()
@@ -0,0 +1,150 @@
+"""
+UpdateJobQueue için kuyruk testleri
+Birleştirme, sıralı çalışma, iptal ve kesilmiş işlerin kurtarılması geçici bir veritabanıyla denenir
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from SistemGuncelleyici.update_jobs import UpdateJobQueue
+
+
+# ---------- Yardımcılar ----------
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class RecordingRunner:
+    """Çalıştırılan işleri sırayla kaydeder; block verilirse iptal edilene kadar bekler"""
+
+    def __init__(self, block=False):
+        self.block = block
+        self.started = []
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+        self.entered = threading.Event()
+
+    def __call__(self, job, cancel):
+        with self.lock:
+            self.started.append(job['id'])
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        self.entered.set()
+        try:
+            if self.block:
+                cancel.wait(5)
+                return {'status': 'completed', 'cancel_seen': cancel.is_set()}
+            time.sleep(0.02)
+            return {'managers': job['managers'], 'dry_run': job['dry_run']}
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "jobs.db")
+
+
+# ---------- Testler ----------
+
+def test_submit_collapses_identical_queued_requests(db_path):
+    queue = UpdateJobQueue(db_path, RecordingRunner())
+
+    first, collapsed_first = queue.submit(['APT', 'snap'], source='gui')
+    second, collapsed_second = queue.submit(['snap', 'apt', 'apt'], source='api')
+    dry, collapsed_dry = queue.submit(['apt', 'snap'], dry_run=True)
+    everything, _ = queue.submit()
+
+    assert not collapsed_first and collapsed_second and not collapsed_dry
+    assert second['id'] == first['id']
+    assert first['managers'] == ['apt', 'snap']
+    assert len({first['id'], dry['id'], everything['id']}) == 3
+    assert [job['position'] for job in queue.list_jobs()] == [0, 1, 2]
+
+
+def test_jobs_run_one_at_a_time_and_store_results(db_path):
+    runner = RecordingRunner()
+    queue = UpdateJobQueue(db_path, runner)
+    ids = [queue.submit([name])[0]['id'] for name in ('apt', 'dnf', 'brew')]
+    queue.start()
+    try:
+        assert wait_for(lambda: all(queue.get_job(job_id)['status'] == 'completed' for job_id in ids))
+    finally:
+        queue.stop()
+
+    assert runner.started == ids
+    assert runner.max_running == 1
+    job = queue.get_job(ids[1])
+    assert job['result'] == {'managers': ['dnf'], 'dry_run': False}
+    assert job['started'] and job['finished']
+
+
+def test_submit_after_finish_creates_a_new_job(db_path):
+    queue = UpdateJobQueue(db_path, RecordingRunner())
+    queue.start()
+    try:
+        first, _ = queue.submit(['apt'])
+        assert wait_for(lambda: queue.get_job(first['id'])['status'] == 'completed')
+        second, collapsed = queue.submit(['apt'])
+    finally:
+        queue.stop()
+    assert not collapsed
+    assert second['id'] != first['id']
+
+
+def test_cancel_queued_job(db_path):
+    queue = UpdateJobQueue(db_path, RecordingRunner())
+    job, _ = queue.submit(['apt'])
+
+    assert queue.cancel(job['id']) == 'cancelled'
+    assert queue.get_job(job['id'])['status'] == 'cancelled'
+    assert queue.cancel(job['id']) == 'cancelled'
+    assert queue.cancel(job['id'] + 100) is None
+
+    # İptal edilmiş iş birleştirmeye katılmaz
+    again, collapsed = queue.submit(['apt'])
+    assert not collapsed and again['id'] != job['id']
+
+
+def test_cancel_running_job_sets_its_event(db_path):
+    runner = RecordingRunner(block=True)
+    queue = UpdateJobQueue(db_path, runner)
+    job, _ = queue.submit(['apt'])
+    queue.start()
+    try:
+        assert runner.entered.wait(5)
+        assert queue.cancel(job['id']) == 'cancelling'
+        assert wait_for(lambda: queue.get_job(job['id'])['status'] == 'cancelled')
+    finally:
+        queue.stop()
+    assert queue.get_job(job['id'])['result'] == {'cancel_seen': True}
+
+
+def test_running_jobs_of_dead_owners_are_interrupted(db_path):
+    UpdateJobQueue(db_path, RecordingRunner())
+    conn = sqlite3.connect(db_path)
+    for owner_pid in (os.getpid(), None):
+        conn.execute('''
+            INSERT INTO update_jobs (created, source, dedupe_key, status, owner_pid)
+            VALUES ('2026-01-01T00:00:00', 'gui', '[null, false]', 'running', ?)
+        ''', (owner_pid,))
+    conn.commit()
+    conn.close()
+
+    queue = UpdateJobQueue(db_path, RecordingRunner())
+    assert [job['status'] for job in queue.list_jobs()] == ['interrupted', 'interrupted']